@@ -1,33 +1,79 @@
+import os
 from pathlib import Path
 
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, jsonify
 from flask_cors import CORS
 
 from backend.database import db, init_db
 from backend.routes.clients import clients_bp
 from backend.routes.dashboard import dashboard_bp
 from backend.routes.invoices import invoices_bp
+from backend.routes.pdf_jobs import pdf_jobs_bp
+from backend.routes.reports import reports_bp
 from backend.routes.settings import settings_bp
+from backend.services.assets import init_assets, send_page
+from backend.services.http_cache import init_http_cache
+from backend.services.ledger import init_ledger
+from backend.services.overdue import DEFAULT_INTERVAL, init_overdue_sweeper
+from backend.services.pdf_cache import DEFAULT_MAX_BYTES, init_pdf_cache
+from backend.services.pdf_jobs import init_pdf_jobs
+from backend.services.search import init_search
+from backend.utils.json_provider import ApiJSONProvider
 
 
-def create_app() -> Flask:
+def create_app(config: dict | None = None) -> Flask:
     app = Flask(__name__, static_folder="../frontend", static_url_path="/")
+    app.json = ApiJSONProvider(app)
 
     db_path = Path(__file__).resolve().parent.parent / "database" / "invoices.db"
-    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    # Any SQLAlchemy URL, e.g. DATABASE_URL=postgresql+psycopg://user@localhost/invoices.
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL") or f"sqlite:///{db_path}"
+    # Connection pool settings; None keeps SQLAlchemy's default (pre-ping: on except for SQLite).
+    app.config["DATABASE_POOL_SIZE"] = None
+    app.config["DATABASE_MAX_OVERFLOW"] = None
+    app.config["DATABASE_POOL_PRE_PING"] = None
+    # Milliseconds a statement may run before it is cancelled; 0 disables the limit.
+    app.config["DATABASE_STATEMENT_TIMEOUT"] = 0
+    # Database of @read_only views (e.g. a replica). None opens the SQLite file read-only;
+    # an empty string keeps every query on the primary.
+    app.config["DATABASE_READ_URL"] = None
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # Changes to DEFAULT_SQLITE_PRAGMAS, e.g. FLASK_SQLITE_PRAGMAS='{"synchronous": "FULL"}'.
+    app.config["SQLITE_PRAGMAS"] = {}
+    # Seconds between overdue sweeps; a sweep also runs whenever the date has changed.
+    app.config["OVERDUE_SWEEP_INTERVAL"] = DEFAULT_INTERVAL
+    app.config["OVERDUE_SWEEPER_ENABLED"] = True
+    # Rendered PDFs are cached on disk; a cap of 0 disables the cache.
+    app.config["PDF_CACHE_DIR"] = str(db_path.parent / "pdf_cache")
+    app.config["PDF_CACHE_MAX_BYTES"] = DEFAULT_MAX_BYTES
+    # `flask assets build` output; served instead of frontend/ while it matches the sources.
+    app.config["ASSETS_BUILD_DIR"] = str(db_path.parent.parent / "build" / "frontend")
+
+    # FLASK_* environment variables (e.g. FLASK_OVERDUE_SWEEP_INTERVAL=3600) override defaults.
+    app.config.from_prefixed_env()
+    if config:
+        app.config.update(config)
 
     init_db(app)
+    init_ledger(app)
+    init_search(app)
+    init_http_cache(app)
     CORS(app)
+    init_overdue_sweeper(app)
+    init_pdf_cache(app)
+    init_pdf_jobs(app)
+    init_assets(app)
 
     app.register_blueprint(clients_bp)
     app.register_blueprint(invoices_bp)
+    app.register_blueprint(pdf_jobs_bp)
     app.register_blueprint(dashboard_bp)
+    app.register_blueprint(reports_bp)
     app.register_blueprint(settings_bp)
 
     @app.route("/")
     def serve_frontend():
-        return send_from_directory(app.static_folder, "index.html")
+        return send_page("index.html")
 
     @app.route("/health")
     def health():
@@ -40,5 +86,3 @@ app = create_app()
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
-
-
@@ -0,0 +1 @@
+"""Benchmarks, run as modules from the project root (e.g. ``python -m backend.bench.numbering``)."""
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+
+from backend.database import DEFAULT_SQLITE_PRAGMAS
+
+# The configurations compared: SQLite's own defaults, the app's pragmas with every query on
+# the primary, and the app as configured, where read-only views use a read-only connection.
+PROFILES = {
+    "sqlite defaults": {"SQLITE_PRAGMAS": {name: None for name in DEFAULT_SQLITE_PRAGMAS}, "DATABASE_READ_URL": ""},
+    "app pragmas": {"DATABASE_READ_URL": ""},
+    "read bind": {},
+}
+# What the reader processes cycle through: the dashboard, the two list views and an export.
+READ_PATHS = (
+    "/api/dashboard/statistics?year=2025&month=1",
+    "/api/dashboard/monthly-data?year=2025",
+    "/api/dashboard/recent-activity",
+    "/api/invoices/?limit=50",
+    "/api/clients/",
+    "/api/invoices/export?format=csv",
+)
+STARTUP_ATTEMPTS = 20
+
+
+def _database_uri(db: str) -> str:
+    # A URL such as postgresql+psycopg://localhost/bench, or else the path of a SQLite file.
+    return db if "://" in db else f"sqlite:///{Path(db).resolve()}"
+
+
+def _make_app(db_uri: str, profile: dict):
+    from backend.app import create_app
+
+    config = {"SQLALCHEMY_DATABASE_URI": db_uri, "TESTING": True, "OVERDUE_SWEEPER_ENABLED": False, **profile}
+    for attempt in range(STARTUP_ATTEMPTS):
+        try:
+            return create_app(config)
+        except OperationalError:
+            time.sleep(0.05 * (attempt + 1))
+    return create_app(config)
+
+
+def _is_locked(exc: OperationalError) -> bool:
+    return "database is locked" in str(exc)
+
+
+def _setup(db_uri: str, profile: dict, invoices: int) -> tuple[int, list[int]]:
+    from backend.bench.isaf import seed_period
+    from backend.database import db
+    from backend.models import Client, InvoiceSeries
+    from backend.services.ledger import rebuild_client_stats, rebuild_monthly_revenue
+
+    app = _make_app(db_uri, profile)
+    seed_period(app, invoices)
+    with app.app_context():
+        # The seed bulk-inserts past the ledger's session hooks; bring the rollups up to date.
+        with db.engine.begin() as connection:
+            rebuild_monthly_revenue(connection)
+            rebuild_client_stats(connection)
+        # New invoices get their own series; the seeded one has no numbers allocated.
+        series = InvoiceSeries.query.filter_by(series_code="BENCH").first()
+        if series is None:
+            series = InvoiceSeries(series_code="BENCH")
+            db.session.add(series)
+            db.session.commit()
+        series_id = series.id
+        client_ids = db.session.scalars(select(Client.id).order_by(Client.id).limit(50)).all()
+    return series_id, client_ids
+
+
+def _worker(db_uri: str, profile: dict, role: str, index: int, series_id: int, client_ids: list[int],
+            start_at: float, stop_at: float) -> tuple[Counter, list[float]]:
+    app = _make_app(db_uri, profile)
+    client = app.test_client()
+    stats: Counter = Counter()
+    latencies: list[float] = []
+    time.sleep(max(0.0, start_at - time.time()))
+
+    request_number = 0
+    while time.time() < stop_at:
+        request_number += 1
+        started = time.perf_counter()
+        try:
+            if role == "write":
+                response = client.post(
+                    "/api/invoices/",
+                    json={
+                        "client_id": client_ids[(index + request_number) % len(client_ids)],
+                        "series_id": series_id,
+                        "invoice_date": "2025-01-15",
+                        "items": [{"description": "Benchmark line", "quantity": 2, "unit_price": 10}],
+                    },
+                )
+            else:
+                response = client.get(READ_PATHS[(index + request_number) % len(READ_PATHS)])
+        except OperationalError as exc:
+            if not _is_locked(exc):
+                raise
+            stats["locked"] += 1
+            continue
+        if response.status_code >= 400:
+            stats[f"http_{response.status_code}"] += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+        stats[role] += 1
+    return stats, latencies
+
+
+def _percentile(samples: list[float], share: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def run_profile(name: str, writers: int, readers: int, duration: float, invoices: int,
+                db: str | None = None) -> dict:
+    """Run ``writers`` and ``readers`` under one profile, on a fresh SQLite file or on ``db``.
+
+    A given database is topped up to ``invoices`` and keeps what the writers add.
+    """
+    profile = PROFILES[name]
+    with tempfile.TemporaryDirectory() if db is None else nullcontext() as directory:
+        db_uri = _database_uri(db or os.path.join(directory, "bench.db"))
+        series_id, client_ids = _setup(db_uri, profile, invoices)
+        roles = ["write"] * writers + ["read"] * readers
+        context = multiprocessing.get_context("spawn")
+        start_at = time.time() + 2.0  # let every worker finish building its app first
+        stop_at = start_at + duration
+        with ProcessPoolExecutor(max_workers=len(roles), mp_context=context) as pool:
+            futures = [
+                pool.submit(_worker, db_uri, profile, role, index, series_id, client_ids, start_at, stop_at)
+                for index, role in enumerate(roles)
+            ]
+            results = [(role, *future.result()) for role, future in zip(roles, futures)]
+
+    totals: Counter = sum((stats for _, stats, _ in results), Counter())
+    latencies = {role: [sample for kind, _, samples in results if kind == role for sample in samples]
+                 for role in ("write", "read")}
+    return {"totals": totals, "latencies": latencies, "elapsed": duration}
+
+
+def _report(name: str, result: dict) -> None:
+    totals, elapsed = result["totals"], result["elapsed"]
+    errors = " ".join(f"{key}={value}" for key, value in sorted(totals.items()) if key.startswith("http_"))
+    print(f"{name}:")
+    for role in ("write", "read"):
+        samples = result["latencies"][role]
+        median = statistics.median(samples) if samples else 0.0
+        print(
+            f"  {role + 's':<6} {totals[role] / elapsed:8.1f}/s   "
+            f"median {median * 1000:7.2f} ms   p95 {_percentile(samples, 0.95) * 1000:7.2f} ms"
+        )
+    print(f"  locked={totals['locked']} {errors}".rstrip())
+
+
+def run(writers: int, readers: int, duration: float, invoices: int, rounds: int, db: str | None = None) -> None:
+    """Compare mixed read/write throughput across the database configurations."""
+    profiles = list(PROFILES)
+    if db is not None and make_url(_database_uri(db)).get_backend_name() != "sqlite":
+        # Pragmas are SQLite's; elsewhere only the choice of read bind differs.
+        profiles = [name for name in profiles if "SQLITE_PRAGMAS" not in PROFILES[name]]
+    print(f"writers={writers} readers={readers} duration={duration:.0f}s invoices={invoices} rounds={rounds}")
+    for round_number in range(rounds):
+        # Profiles alternate between rounds so drift in machine load hits all of them alike.
+        names = profiles if round_number % 2 == 0 else list(reversed(profiles))
+        for name in names:
+            _report(name, run_profile(name, writers, readers, duration, invoices, db))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Mixed read/write throughput under the database configurations.")
+    parser.add_argument("--writers", type=int, default=2, help="Processes creating invoices.")
+    parser.add_argument("--readers", type=int, default=max((os.cpu_count() or 4) - 2, 2),
+                        help="Processes reading the dashboard and lists.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds each profile runs.")
+    parser.add_argument("--invoices", type=int, default=5000, help="Invoices seeded before the run.")
+    parser.add_argument("--rounds", type=int, default=1, help="Times each profile runs.")
+    parser.add_argument(
+        "--db", help="SQLite file or database URL to run against instead of a fresh SQLite file per profile."
+    )
+    args = parser.parse_args(argv)
+    run(args.writers, args.readers, args.duration, args.invoices, args.rounds, args.db)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
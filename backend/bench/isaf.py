@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+
+PERIOD_START = date(2025, 1, 1)
+PERIOD_END = date(2025, 1, 31)
+INSERT_BATCH_SIZE = 5000
+CLIENTS = 500
+
+
+def _database_uri(db: str) -> str:
+    # A URL such as postgresql+psycopg://localhost/bench, or else the path of a SQLite file.
+    return db if "://" in db else f"sqlite:///{Path(db).resolve()}"
+
+
+def _make_app(db_uri: str):
+    from backend.app import create_app
+
+    return create_app({"SQLALCHEMY_DATABASE_URI": db_uri, "TESTING": True, "OVERDUE_SWEEPER_ENABLED": False})
+
+
+def seed_period(app, invoices: int) -> int:
+    """Top the database up to ``invoices`` issued invoices dated inside the benchmark period.
+
+    Rows go in with bulk INSERTs rather than through the API; the fixture only needs
+    what the register reads. Returns the number of invoices in the period.
+    """
+    from backend.database import db
+    from backend.models import Client, CompanyInfo, Invoice, InvoiceSeries, InvoiceStatus
+
+    with app.app_context():
+        if CompanyInfo.get_singleton() is None:
+            db.session.add(
+                CompanyInfo(
+                    company_name="UAB Pardavėjas", registration_code="100000000", tax_id="LT100000000",
+                    address="Vilnius", email="info@example.lt",
+                )
+            )
+            db.session.add(InvoiceSeries(series_code="SF"))
+            db.session.execute(
+                insert(Client),
+                [
+                    {
+                        "company_name": f"UAB Pirkėjas {index} & Ko",
+                        "registration_code": f"{300000000 + index}",
+                        "vat_code": f"LT{300000000 + index}" if index % 4 else None,
+                        "address": "Kaunas",
+                    }
+                    for index in range(CLIENTS)
+                ],
+            )
+            db.session.commit()
+        series_id = db.session.scalar(select(InvoiceSeries.id).where(InvoiceSeries.series_code == "SF"))
+        client_ids = db.session.scalars(select(Client.id).order_by(Client.id)).all()
+        existing = db.session.scalar(select(func.count(Invoice.id))) or 0
+        days = (PERIOD_END - PERIOD_START).days + 1
+        statuses = (InvoiceStatus.SENT, InvoiceStatus.PAID, InvoiceStatus.OVERDUE)
+
+        for start in range(existing, invoices, INSERT_BATCH_SIZE):
+            rows = []
+            for number in range(start + 1, min(start + INSERT_BATCH_SIZE, invoices) + 1):
+                subtotal = Decimal(100 + number % 900)
+                exclude_vat = number % 10 == 0
+                vat_amount = Decimal(0) if exclude_vat else (subtotal * Decimal("0.21")).quantize(Decimal("0.01"))
+                invoice_date = PERIOD_START + timedelta(days=number % days)
+                rows.append(
+                    {
+                        "series_id": series_id,
+                        "invoice_number": number,
+                        "full_invoice_number": f"SF{number:06d}",
+                        "client_id": client_ids[number % len(client_ids)],
+                        "invoice_date": invoice_date,
+                        "due_date": invoice_date + timedelta(days=14),
+                        "status": statuses[number % len(statuses)],
+                        "exclude_vat": exclude_vat,
+                        "subtotal": subtotal,
+                        "vat_amount": vat_amount,
+                        "total": subtotal + vat_amount,
+                    }
+                )
+            db.session.execute(insert(Invoice), rows)
+            db.session.commit()
+        return max(existing, invoices)
+
+
+def _export(client) -> tuple[int, int]:
+    response = client.get(
+        f"/api/reports/isaf?from={PERIOD_START.isoformat()}&to={PERIOD_END.isoformat()}", buffered=False
+    )
+    size = chunks = 0
+    for chunk in response.response:
+        size += len(chunk)
+        chunks += 1
+    response.close()
+    return size, chunks
+
+
+def run(sizes: list[int], db_path: str | None = None) -> None:
+    """Export one period at growing invoice counts; time and peak memory per export."""
+    directory = None
+    if db_path is None:
+        directory = tempfile.TemporaryDirectory()
+        db_path = os.path.join(directory.name, "bench.db")
+    app = _make_app(_database_uri(db_path))
+    client = app.test_client()
+
+    for size in sorted(sizes):
+        started = time.perf_counter()
+        count = seed_period(app, size)
+        seeded = time.perf_counter() - started
+
+        started = time.perf_counter()
+        output_bytes, chunks = _export(client)
+        elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        _export(client)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"invoices={count:<7} seeded in {seeded:6.2f}s   export {elapsed:6.2f}s "
+            f"({count / elapsed:8.0f} invoices/s)   {output_bytes / 1024 / 1024:7.1f} MiB in {chunks} chunks   "
+            f"peak {peak / 1024 / 1024:6.2f} MiB"
+        )
+
+    if directory is not None:
+        directory.cleanup()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="i.SAF register export benchmark.")
+    parser.add_argument(
+        "--invoices",
+        type=int,
+        nargs="+",
+        default=[10000, 100000],
+        help="Invoice counts in the period to export at; peak memory should not grow with them.",
+    )
+    parser.add_argument(
+        "--db", help="SQLite file or database URL to use (default: a temporary SQLite database)."
+    )
+    args = parser.parse_args(argv)
+    run(args.invoices, args.db)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from flask.json.provider import DefaultJSONProvider
+
+from backend.database import db
+from backend.models import InvoiceStatus
+from backend.routes.invoices import _is_overdue, _serialize_invoice_summaries
+from backend.utils.json_provider import ApiJSONProvider
+
+
+def _make_app(db_uri: str):
+    from backend.app import create_app
+
+    return create_app({"SQLALCHEMY_DATABASE_URI": db_uri, "TESTING": True, "OVERDUE_SWEEPER_ENABLED": False})
+
+
+def list_rows(app, count: int) -> list:
+    """``count`` rows of the invoice list query, as the list and export views read them."""
+    from backend.models import Invoice
+    from backend.queries import invoice_list_select
+
+    with app.app_context():
+        return db.session.execute(invoice_list_select().order_by(Invoice.id).limit(count)).all()
+
+
+def _float(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _before(row) -> dict:
+    # The list serializer as it was: every value converted by hand before encoding.
+    return {
+        "id": row.id,
+        "number": row.number,
+        "invoice_number": row.invoice_number,
+        "full_invoice_number": row.number,
+        "series_id": row.series_id,
+        "series_code": row.series_code,
+        "client_id": row.client_id,
+        "client_name": row.client_name,
+        "invoice_date": row.invoice_date.isoformat() if row.invoice_date else None,
+        "due_date": row.due_date.isoformat() if row.due_date else None,
+        "status": row.status.value if isinstance(row.status, InvoiceStatus) else row.status,
+        "is_overdue": _is_overdue(row),
+        "total": _float(row.total),
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+    }
+
+
+def _timings(variants: dict, rows: list, rounds: int) -> dict[str, list[float]]:
+    # Variants are interleaved so drift in machine load hits all of them alike.
+    samples: dict[str, list[float]] = {name: [] for name in variants}
+    for _ in range(rounds):
+        for name, encode in variants.items():
+            started = time.perf_counter()
+            encode(rows)
+            samples[name].append(time.perf_counter() - started)
+    return samples
+
+
+def run(rounds: int, count: int) -> None:
+    """Time serializing and encoding one invoice list response of ``count`` rows.
+
+    The rows come from the list view's query on a seeded temporary database and go
+    through the list view's own serializer.
+    """
+    from backend.bench.seed import seed_dataset
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = _make_app(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        seed_dataset(app, clients=max(count // 20, 1), invoices=count)
+        rows = list_rows(app, count)
+        with app.app_context():
+            db.engine.dispose()
+
+    stdlib = DefaultJSONProvider(app)
+    provider = ApiJSONProvider(app)
+    fallback = ApiJSONProvider(app)
+    fallback.use_orjson = False
+
+    compact = {"separators": (",", ":")}
+    variants = {
+        "before": lambda data: stdlib.dumps({"invoices": [_before(row) for row in data]}, **compact).encode(),
+        "after (stdlib)": lambda data: fallback.dumps_bytes(
+            {"invoices": _serialize_invoice_summaries(data)}, **compact
+        ),
+    }
+    if provider.use_orjson:
+        variants["after (orjson)"] = lambda data: provider.dumps_bytes(
+            {"invoices": _serialize_invoice_summaries(data)}, **compact
+        )
+    else:
+        print("orjson is not installed; timing the stdlib encoder only.")
+
+    samples = _timings(variants, rows, rounds)
+    print(f"rounds={rounds} invoices/response={len(rows)}")
+    baseline = statistics.median(samples["before"])
+    for name, timings in samples.items():
+        median = statistics.median(timings)
+        print(f"{name:<16} median {median * 1000:8.2f} ms   {baseline / median:5.1f}x")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="API response JSON encoding benchmark.")
+    parser.add_argument("--rounds", type=int, default=50, help="Responses encoded per variant.")
+    parser.add_argument("--invoices", type=int, default=1000, help="Invoice summaries per response.")
+    args = parser.parse_args(argv)
+    run(args.rounds, args.invoices)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
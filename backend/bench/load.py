@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+# What one simulated user does next, with relative weights, modelled on the frontend:
+# dashboard.js loads three widgets with Promise.all, invoices.js loads its reference data
+# and then a page of the list, pages and filters it, opens invoices, creates some and
+# downloads PDFs.
+SCENARIO = {
+    "open dashboard": 25,
+    "open invoices": 15,
+    "page invoices": 20,
+    "filter invoices": 12,
+    "open invoice": 12,
+    "create invoice": 8,
+    "download pdf": 5,
+    "open clients": 3,
+}
+PAGE_SIZE = 10
+SEARCH_TERMS = ("UAB", "Baltijos", "statyba", "SF 1", "Vilnius")
+STATUSES = ("draft", "sent", "paid", "overdue")
+# Raised by the server when SQLite could not get a lock within its busy timeout.
+BUSY_MARKER = "database is locked"
+SERVER_START_TIMEOUT = 60
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _database_uri(db: str) -> str:
+    # A URL such as postgresql+psycopg://localhost/bench, or else the path of a SQLite file.
+    return db if "://" in db else f"sqlite:///{Path(db).resolve()}"
+
+
+def start_server(db_uri: str, log_path: str, port: int) -> subprocess.Popen:
+    """Start the app under ``flask run`` (threaded) on ``db_uri``, logging to ``log_path``."""
+    root = Path(__file__).resolve().parents[2]
+    env = dict(
+        os.environ,
+        DATABASE_URL=db_uri,
+        FLASK_PDF_CACHE_DIR=str(Path(log_path).parent / "pdf_cache"),
+    )
+    with open(log_path, "w", encoding="utf-8") as log:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "flask", "--app", "backend.app", "run", "--port", str(port), "--with-threads"],
+            cwd=root, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+    deadline = time.time() + SERVER_START_TIMEOUT
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"The server exited during startup; see {log_path}.")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("The server did not answer /health in time.")
+
+
+class Stats:
+    """Latencies and outcomes per endpoint, shared by the worker threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.actions: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint: str, status: int, elapsed: float) -> None:
+        with self._lock:
+            self.latencies[endpoint].append(elapsed)
+            self.statuses[endpoint][status] += 1
+
+    def record_action(self, action: str, elapsed: float) -> None:
+        with self._lock:
+            self.actions[action].append(elapsed)
+
+
+class User:
+    """One simulated browser tab: runs scenario actions, revalidating with ETags like a browser."""
+
+    def __init__(self, base_url: str, stats: Stats, ids: dict, rng: random.Random, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.stats = stats
+        self.ids = ids
+        self.rng = rng
+        self.timeout = timeout
+        self.etags: dict[str, str] = {}
+        self._etag_lock = threading.Lock()
+        # Promise.all fan-out: a browser runs up to six requests per host at once.
+        self.parallel = ThreadPoolExecutor(max_workers=6)
+
+    def request(self, endpoint: str, path: str, method: str = "GET", body: dict | None = None) -> dict | None:
+        """Send one request; ``endpoint`` is the label its latency is reported under."""
+        url = self.base_url + path
+        headers = {"Accept": "application/json"}
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        with self._etag_lock:
+            etag = self.etags.get(url) if method == "GET" else None
+        if etag:
+            headers["If-None-Match"] = etag
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(
+                urllib.request.Request(url, data=data, headers=headers, method=method), timeout=self.timeout
+            ) as response:
+                payload = response.read()
+                status = response.status
+                if method == "GET" and response.headers.get("ETag"):
+                    with self._etag_lock:
+                        self.etags[url] = response.headers["ETag"]
+        except urllib.error.HTTPError as exc:
+            exc.read()
+            status, payload = exc.code, b""
+        except OSError:
+            status, payload = 0, b""  # connection refused, reset or timed out
+        self.stats.record(endpoint, status, time.perf_counter() - started)
+        if status == 200 and payload[:1] in (b"{", b"["):
+            return json.loads(payload)
+        return None
+
+    def all(self, *calls: tuple) -> list:
+        futures = [self.parallel.submit(self.request, *call) for call in calls]
+        return [future.result() for future in futures]
+
+    def _invoice_list(self, **params) -> None:
+        query = {"limit": PAGE_SIZE, "offset": 0, "sort_by": "-date", **params}
+        path = "/api/invoices/?" + "&".join(f"{key}={value}" for key, value in query.items())
+        self.request("GET /api/invoices/", path)
+
+    def run(self, action: str) -> None:
+        rng, ids = self.rng, self.ids
+        started = time.perf_counter()
+        if action == "open dashboard":
+            year = ids["year"]
+            self.all(
+                ("GET /api/dashboard/statistics", f"/api/dashboard/statistics?year={year}"),
+                ("GET /api/dashboard/monthly-data", f"/api/dashboard/monthly-data?year={year}"),
+                ("GET /api/dashboard/recent-activity", "/api/dashboard/recent-activity"),
+            )
+        elif action == "open invoices":
+            self.all(
+                ("GET /api/clients/", "/api/clients/?limit=100"),
+                ("GET /api/settings/series", "/api/settings/series"),
+                ("GET /api/settings/bank-accounts", "/api/settings/bank-accounts"),
+                ("GET /api/settings/company", "/api/settings/company"),
+            )
+            self._invoice_list()
+        elif action == "page invoices":
+            self._invoice_list(offset=PAGE_SIZE * rng.randrange(50))
+        elif action == "filter invoices":
+            filters = rng.choice(
+                (
+                    {"status": rng.choice(STATUSES)},
+                    {"date_from": f"{ids['year']}-{rng.randint(1, 12):02d}-01", "date_to": f"{ids['year']}-12-31"},
+                    {"search": rng.choice(SEARCH_TERMS).replace(" ", "+")},
+                    {"series_id": rng.choice(ids["series"])},
+                )
+            )
+            self._invoice_list(**filters)
+        elif action == "open invoice":
+            self.request("GET /api/invoices/<id>", f"/api/invoices/{rng.choice(ids['invoices'])}")
+        elif action == "create invoice":
+            series_id = rng.choice(ids["series"])
+            self.request("GET /api/invoices/next-number/<id>", f"/api/invoices/next-number/{series_id}")
+            body = {
+                "client_id": rng.choice(ids["clients"]),
+                "series_id": series_id,
+                "vat_rate": 0.21,
+                "items": [
+                    {"description": "Konsultacinės paslaugos", "quantity": rng.randint(1, 8), "unit_price": 60}
+                    for _ in range(rng.randint(1, 4))
+                ],
+            }
+            self.request("POST /api/invoices/", "/api/invoices/", method="POST", body=body)
+        elif action == "download pdf":
+            self.request("GET /api/invoices/<id>/pdf", f"/api/invoices/{rng.choice(ids['invoices'])}/pdf")
+        elif action == "open clients":
+            self.request("GET /api/clients/", "/api/clients/?limit=50")
+        self.stats.record_action(action, time.perf_counter() - started)
+
+
+def _discover_ids(base_url: str, timeout: float) -> dict:
+    """Ids the scenario picks from, read through the API like the frontend does."""
+
+    def get(path: str):
+        with urllib.request.urlopen(base_url.rstrip("/") + path, timeout=timeout) as response:
+            return json.loads(response.read())
+
+    invoices = get("/api/invoices/?limit=100")["invoices"]
+    clients = get("/api/clients/?limit=100")["clients"]
+    series = get("/api/settings/series")
+    if not (invoices and clients and series):
+        raise RuntimeError("The database needs clients, series and invoices; seed it first.")
+    return {
+        "invoices": [invoice["id"] for invoice in invoices],
+        "clients": [client["id"] for client in clients],
+        "series": [entry["id"] for entry in series],
+        "year": max(date.fromisoformat(invoice["invoice_date"]).year for invoice in invoices),
+    }
+
+
+def _percentile(samples: list[float], share: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))] if ordered else 0.0
+
+
+def _is_error(status: int) -> bool:
+    # 304 answers a revalidation; anything else below 400 is fine too.
+    return status == 0 or status >= 400
+
+
+def report(stats: Stats, elapsed: float, busy: int | None) -> dict:
+    """Print throughput, latency percentiles and errors; returns the totals."""
+    requests = sum(len(samples) for samples in stats.latencies.values())
+    errors = sum(
+        count for statuses in stats.statuses.values() for status, count in statuses.items() if _is_error(status)
+    )
+    not_modified = sum(statuses.get(304, 0) for statuses in stats.statuses.values())
+    actions = sum(len(samples) for samples in stats.actions.values())
+
+    print(f"{'endpoint':<38} {'count':>7} {'errors':>7} {'304s':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for endpoint in sorted(stats.latencies):
+        samples, statuses = stats.latencies[endpoint], stats.statuses[endpoint]
+        failed = sum(count for status, count in statuses.items() if _is_error(status))
+        print(
+            f"{endpoint:<38} {len(samples):7d} {failed:7d} {statuses.get(304, 0):6d} "
+            f"{_percentile(samples, 0.5) * 1000:8.1f} {_percentile(samples, 0.95) * 1000:8.1f} "
+            f"{_percentile(samples, 0.99) * 1000:8.1f}"
+        )
+    print(f"\n{'action':<38} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for action in sorted(stats.actions):
+        samples = stats.actions[action]
+        print(
+            f"{action:<38} {len(samples):7d} {_percentile(samples, 0.5) * 1000:8.1f} "
+            f"{_percentile(samples, 0.95) * 1000:8.1f} {_percentile(samples, 0.99) * 1000:8.1f}"
+        )
+    print(
+        f"\n{requests / elapsed:.1f} requests/s, {actions / elapsed:.1f} actions/s over {elapsed:.0f}s; "
+        f"errors {errors} ({errors / max(requests, 1):.2%}), {not_modified} not modified, "
+        f"SQLite busy {busy if busy is not None else 'n/a (external server)'}"
+    )
+    failures = defaultdict(int)
+    for statuses in stats.statuses.values():
+        for status, count in statuses.items():
+            if _is_error(status):
+                failures[status] += count
+    if failures:
+        by_status = " ".join(f"{status or 'connection'}={count}" for status, count in sorted(failures.items()))
+        print(f"errors by status: {by_status}")
+    return {"requests": requests, "errors": errors, "actions": actions, "busy": busy}
+
+
+def drive(base_url: str, workers: int, duration: float, think: float, seed: int,
+          timeout: float) -> tuple[Stats, float]:
+    """Run ``workers`` users through the scenario for ``duration`` seconds."""
+    ids = _discover_ids(base_url, timeout)
+    stats = Stats()
+    names, weights = list(SCENARIO), list(SCENARIO.values())
+    stop_at = time.time() + duration
+
+    def user_loop(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        user = User(base_url, stats, ids, rng, timeout)
+        try:
+            while time.time() < stop_at:
+                user.run(rng.choices(names, weights)[0])
+                if think:
+                    time.sleep(rng.expovariate(1 / think))
+        finally:
+            user.parallel.shutdown()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user_loop, args=(index,), daemon=True) for index in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return stats, time.perf_counter() - started
+
+
+def run(url: str | None, workers: int, duration: float, think: float, seed: int, timeout: float,
+        clients: int, invoices: int, db: str | None) -> dict:
+    """Drive ``url``, or a local server started on a seeded SQLite database or on ``db``."""
+    if url is not None:
+        stats, elapsed = drive(url, workers, duration, think, seed, timeout)
+        return report(stats, elapsed, None)
+
+    with tempfile.TemporaryDirectory() as directory:
+        if db is None:
+            from backend.app import create_app
+            from backend.bench.seed import seed_dataset
+
+            db = os.path.join(directory, "load.db")
+            app = create_app({"SQLALCHEMY_DATABASE_URI": _database_uri(db), "OVERDUE_SWEEPER_ENABLED": False})
+            seed_dataset(app, clients=clients, invoices=invoices, seed=seed)
+        log_path = os.path.join(directory, "server.log")
+        port = _free_port()
+        server = start_server(_database_uri(db), log_path, port)
+        try:
+            stats, elapsed = drive(f"http://127.0.0.1:{port}", workers, duration, think, seed, timeout)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+        # Each request that failed on a SQLite lock logs one traceback ending in the driver's message.
+        busy = sum(
+            1 for line in Path(log_path).read_text(encoding="utf-8", errors="replace").splitlines()
+            if line.startswith("sqlalchemy.exc.OperationalError") and BUSY_MARKER in line
+        )
+        return report(stats, elapsed, busy)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent load replaying the frontend's traffic mix.")
+    parser.add_argument("--url", help="Base URL of a running server (default: start one on a seeded database).")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent simulated users.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load.")
+    parser.add_argument("--think", type=float, default=0.0, help="Mean pause between a user's actions, in seconds.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the dataset and of the users' choices.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds before a request counts as failed.")
+    parser.add_argument("--clients", type=int, default=500, help="Clients in the seeded database.")
+    parser.add_argument("--invoices", type=int, default=20000, help="Invoices in the seeded database.")
+    parser.add_argument(
+        "--db", help="SQLite file or database URL to serve instead of a freshly seeded SQLite database."
+    )
+    parser.add_argument(
+        "--max-error-rate", type=float, default=None, help="Fail when the error share exceeds this (e.g. 0.01)."
+    )
+    args = parser.parse_args(argv)
+    totals = run(
+        args.url, args.workers, args.duration, args.think, args.seed, args.timeout,
+        args.clients, args.invoices, args.db,
+    )
+    if args.max_error_rate is not None and totals["errors"] > args.max_error_rate * max(totals["requests"], 1):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
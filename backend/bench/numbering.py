@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+# Creating an app touches the schema; let concurrently starting workers retry.
+STARTUP_ATTEMPTS = 20
+# Transactions that lose SQLite's write lock are retried like a client would retry.
+REQUEST_ATTEMPTS = 50
+
+
+def _database_uri(db: str) -> str:
+    # A URL such as postgresql+psycopg://localhost/bench, or else the path of a SQLite file.
+    return db if "://" in db else f"sqlite:///{Path(db).resolve()}"
+
+
+def _make_app(db_uri: str):
+    from backend.app import create_app
+
+    config = {"SQLALCHEMY_DATABASE_URI": db_uri, "TESTING": True, "OVERDUE_SWEEPER_ENABLED": False}
+    for attempt in range(STARTUP_ATTEMPTS):
+        try:
+            return create_app(config)
+        except OperationalError:
+            time.sleep(0.05 * (attempt + 1))
+    return create_app(config)
+
+
+def _is_locked(exc: OperationalError) -> bool:
+    return "database is locked" in str(exc)
+
+
+def _worker(db_uri: str, series_id: int, client_id: int, count: int, delete_every: int, start_at: float) -> Counter:
+    app = _make_app(db_uri)
+    client = app.test_client()
+    stats: Counter = Counter()
+    payload = {
+        "client_id": client_id,
+        "series_id": series_id,
+        "items": [{"description": "Benchmark line", "quantity": 1, "unit_price": 10}],
+    }
+    time.sleep(max(0.0, start_at - time.time()))
+
+    for index in range(count):
+        for _attempt in range(REQUEST_ATTEMPTS):
+            try:
+                response = client.post("/api/invoices/", json=payload)
+            except IntegrityError:
+                # The only unique key a new invoice can hit is its series number.
+                stats["collisions"] += 1
+                break
+            except OperationalError as exc:
+                if not _is_locked(exc):
+                    raise
+                stats["lock_retries"] += 1
+                continue
+            if response.status_code != 201:
+                stats[f"http_{response.status_code}"] += 1
+                break
+            stats["created"] += 1
+            if delete_every and index % delete_every == 0:
+                _delete(client, response.get_json()["id"], stats)
+            break
+        else:
+            stats["gave_up"] += 1
+    return stats
+
+
+def _delete(client, invoice_id: int, stats: Counter):
+    for _attempt in range(REQUEST_ATTEMPTS):
+        try:
+            client.delete(f"/api/invoices/{invoice_id}")
+        except OperationalError as exc:
+            if not _is_locked(exc):
+                raise
+            stats["lock_retries"] += 1
+            continue
+        stats["deleted"] += 1
+        return
+    stats["gave_up"] += 1
+
+
+def _setup(db_uri: str) -> tuple[int, int]:
+    from backend.database import db
+    from backend.models import Client, InvoiceSeries
+
+    app = _make_app(db_uri)
+    with app.app_context():
+        series = InvoiceSeries(series_code="BENCH")
+        client = Client(company_name="Benchmark UAB", registration_code="300000000", address="Vilnius")
+        db.session.add_all([series, client])
+        db.session.commit()
+        return series.id, client.id
+
+
+def _audit(db_uri: str, series_id: int) -> dict:
+    from backend.database import db
+    from backend.models import Invoice, InvoiceSeries, ReleasedInvoiceNumber
+
+    app = _make_app(db_uri)
+    with app.app_context():
+        held = db.session.scalars(select(Invoice.invoice_number).where(Invoice.series_id == series_id)).all()
+        released = db.session.scalars(
+            select(ReleasedInvoiceNumber.invoice_number).where(ReleasedInvoiceNumber.series_id == series_id)
+        ).all()
+        current = db.session.get(InvoiceSeries, series_id).current_number
+    accounted = Counter(held) + Counter(released)
+    return {
+        "current_number": current,
+        "held": len(held),
+        "released": len(released),
+        "duplicates": sorted(number for number, seen in accounted.items() if seen > 1),
+        "lost": sorted(set(range(1, current + 1)) - set(accounted)),
+        "out_of_range": sorted(number for number in accounted if not 1 <= number <= current),
+    }
+
+
+def run(workers: int, invoices: int, delete_every: int, db_path: str | None = None) -> bool:
+    """Hammer create_invoice from ``workers`` processes; returns True when numbering held up."""
+    directory = None
+    if db_path is None:
+        directory = tempfile.TemporaryDirectory()
+        db_path = os.path.join(directory.name, "bench.db")
+    db_uri = _database_uri(db_path)
+    series_id, client_id = _setup(db_uri)
+
+    context = multiprocessing.get_context("spawn")
+    start_at = time.time() + 2.0  # let every worker finish building its app first
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(_worker, db_uri, series_id, client_id, invoices, delete_every, start_at)
+            for _ in range(workers)
+        ]
+        totals = sum((future.result() for future in futures), Counter())
+    elapsed = time.time() - start_at
+    audit = _audit(db_uri, series_id)
+    if directory is not None:
+        directory.cleanup()
+
+    print(f"workers={workers} invoices/worker={invoices} delete_every={delete_every}")
+    print(f"created={totals['created']} deleted={totals['deleted']} in {elapsed:.2f}s "
+          f"({totals['created'] / elapsed:.0f} invoices/s)")
+    print(f"collisions={totals['collisions']} lock_retries={totals['lock_retries']} gave_up={totals['gave_up']}")
+    for key, value in sorted(totals.items()):
+        if key.startswith("http_"):
+            print(f"{key}={value}")
+    print(
+        f"current_number={audit['current_number']} held={audit['held']} released={audit['released']} "
+        f"lost={audit['lost'][:20]} duplicates={audit['duplicates'][:20]}"
+    )
+    return not (totals["collisions"] or totals["gave_up"] or audit["lost"] or audit["duplicates"] or audit["out_of_range"])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent invoice number allocation benchmark.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--invoices", type=int, default=100, help="Invoices created per worker.")
+    parser.add_argument(
+        "--delete-every", type=int, default=5, help="Delete every Nth created draft (0 disables)."
+    )
+    parser.add_argument(
+        "--db", help="SQLite file or database URL to use (default: a temporary SQLite database)."
+    )
+    args = parser.parse_args(argv)
+    ok = run(args.workers, args.invoices, args.delete_every, args.db)
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+
+from backend.utils.pdf_generator import InvoiceRenderer
+
+
+def sample_invoice(items: int) -> dict:
+    return {
+        "series_code": "SF",
+        "invoice_number": 1024,
+        "invoice_date": date(2025, 1, 15),
+        "due_date": date(2025, 1, 29),
+        "seller": {
+            "name": "UAB Pardavėjas",
+            "tax_id": "LT100000000001",
+            "address": "Gedimino pr. 1, Vilnius",
+            "phone": "+370 600 00000",
+            "email": "info@pardavejas.lt",
+            "bank_account": "LT12 3456 7890 1234 5678",
+        },
+        "buyer": {
+            "company_name": "UAB Pirkėjas",
+            "code": "300000000",
+            "vat_code": "LT300000000",
+            "address": "Laisvės al. 10, Kaunas",
+            "phone": "",
+            "email": "buhalterija@pirkejas.lt",
+        },
+        "items": [
+            {
+                "description": f"Konsultacinės paslaugos, etapas {index + 1}",
+                "quantity": Decimal("2.500"),
+                "unit": "val.",
+                "unit_price": Decimal("45.00"),
+                "line_total": Decimal("112.50"),
+            }
+            for index in range(items)
+        ],
+        "total": Decimal("112.50") * items,
+        "total_in_words": "šimtas dvylika eurų 50 ct",
+        "issued_by": "Vardenis Pavardenis",
+        "received_by": None,
+    }
+
+
+def _timings(variants: dict, payload: dict, rounds: int) -> dict[str, list[float]]:
+    # Variants are interleaved so drift in machine load hits all of them alike.
+    samples: dict[str, list[float]] = {name: [] for name in variants}
+    for _ in range(rounds):
+        for name, render in variants.items():
+            started = time.perf_counter()
+            render(payload)
+            samples[name].append(time.perf_counter() - started)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> float:
+    median = statistics.median(samples) * 1000
+    print(f"{label:<28} median {median:7.2f} ms   p95 {sorted(samples)[int(len(samples) * 0.95)] * 1000:7.2f} ms")
+    return median
+
+
+def run(rounds: int, items: int) -> None:
+    """Time renders with per-call setup (the old ``generate_invoice_pdf``) against a shared renderer."""
+    payload = sample_invoice(items)
+
+    started = time.perf_counter()
+    renderer = InvoiceRenderer()
+    print(f"first renderer (font probe)  {(time.perf_counter() - started) * 1000:7.2f} ms")
+    renderer.render(payload)
+
+    samples = _timings(
+        {
+            "setup": lambda _payload: InvoiceRenderer(),
+            "before": lambda data: InvoiceRenderer().render(data),
+            "after": renderer.render,
+        },
+        payload,
+        rounds,
+    )
+
+    print(f"rounds={rounds} items/invoice={items}")
+    _report("setup only", samples["setup"])
+    cold = _report("setup per invoice (before)", samples["before"])
+    warm = _report("shared renderer (after)", samples["after"])
+    print(f"saved {cold - warm:.2f} ms per invoice ({(cold - warm) / cold:.0%})")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Invoice PDF render benchmark.")
+    parser.add_argument("--rounds", type=int, default=200, help="Renders timed per variant.")
+    parser.add_argument("--items", type=int, default=5, help="Line items per invoice.")
+    args = parser.parse_args(argv)
+    run(args.rounds, args.items)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import itertools
+import time
+from datetime import date
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from sqlalchemy import func, select
+
+# Data the suite runs against; a fixed end date keeps the dataset, and so the baselines, stable.
+SEED = 0
+SEED_END = date(2025, 12, 31)
+CLIENTS = 500
+INVOICES = 20000
+# Timed requests per route, after a few untimed ones.
+ROUNDS = 50
+WARMUP_ROUNDS = 3
+# A p95 this much above the baseline's counts as a regression; query counts must not grow.
+DEFAULT_TOLERANCE = 0.25
+# ...provided it is also this many milliseconds slower: sub-millisecond routes jitter by more.
+MIN_SLOWDOWN_MS = 1.0
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "routes.json"
+# Lines of the invoice whose PDF goes through the worker pool (over INLINE_PDF_MAX_ITEMS).
+LARGE_INVOICE_ITEMS = 150
+
+
+class Case(NamedTuple):
+    """One benchmarked request of a view: ``prepare(client)`` returns (method, path, JSON body).
+
+    ``prepare`` runs untimed before every round, so write routes can create what they
+    update or delete.
+    """
+
+    endpoint: str
+    prepare: Callable
+
+
+def fixture_ids(app) -> dict:
+    """Ids of the seeded rows the cases read: the busiest client, the newest invoices, a series."""
+    from backend.database import db
+    from backend.models import Client, Invoice, InvoiceSeries
+
+    with app.app_context():
+        busiest = db.session.execute(
+            select(Invoice.client_id).group_by(Invoice.client_id).order_by(func.count().desc()).limit(1)
+        ).scalar()
+        newest = db.session.scalars(select(Invoice.id).order_by(Invoice.id.desc()).limit(10)).all()
+        return {
+            "client": busiest or db.session.scalar(select(func.min(Client.id))),
+            "invoice": newest[0] if newest else None,
+            "invoices": newest,
+            "series": db.session.scalar(select(func.min(InvoiceSeries.id))),
+        }
+
+
+def _fixed(method: str, path: str, body=None) -> Callable:
+    return lambda client: (method, path, body)
+
+
+def _created(client, path: str, body: dict) -> dict:
+    response = client.post(path, json=body)
+    if response.status_code != 201:
+        raise RuntimeError(f"POST {path} answered {response.status_code}")
+    return response.get_json()
+
+
+def cases(ids: dict) -> dict[str, Case]:
+    """Named requests covering every view of the app, keyed like the baseline."""
+    month = f"date_from={SEED_END.replace(day=1).isoformat()}&date_to={SEED_END.isoformat()}"
+    unique = itertools.count(1)
+    once: dict[str, object] = {}
+
+    def invoice_body(items: int = 1) -> dict:
+        lines = [{"description": f"Benchmark line {n}", "quantity": 2, "unit_price": 10} for n in range(items)]
+        return {"client_id": ids["client"], "series_id": ids["series"], "items": lines}
+
+    def draft(client) -> int:
+        return _created(client, "/api/invoices/", invoice_body())["id"]
+
+    def new_client(client) -> int:
+        code = f"BENCH{next(unique):06d}"
+        body = {"company_name": f"UAB Bench {code}", "registration_code": code, "address": "Vilnius"}
+        return _created(client, "/api/clients/", body)["id"]
+
+    def bank_account(client) -> int:
+        body = {"bank_name": "Bench bank", "account_number": f"LT00BENCH{next(unique):010d}"}
+        return _created(client, "/api/settings/bank-accounts", body)["id"]
+
+    def large_invoice(client) -> int:
+        if "large" not in once:
+            once["large"] = _created(client, "/api/invoices/", invoice_body(LARGE_INVOICE_ITEMS))["id"]
+        return once["large"]
+
+    def finished_job(client) -> str:
+        if "job" not in once:
+            job = client.post(f"/api/invoices/{ids['invoice']}/pdf/jobs").get_json()
+            while job["status"] not in ("done", "failed", "cancelled"):
+                time.sleep(0.05)
+                job = client.get(f"/api/pdf-jobs/{job['id']}").get_json()
+            once["job"] = job["id"]
+        return once["job"]
+
+    def clear_pdf_cache(client) -> None:
+        from backend.services.pdf_cache import get_pdf_cache
+
+        cache = get_pdf_cache(client.application)
+        if cache is not None:
+            cache.clear()
+
+    def uncached_pdf(invoice: Callable) -> Callable:
+        def prepare(client):
+            invoice_id = invoice(client)
+            clear_pdf_cache(client)
+            return "GET", f"/api/invoices/{invoice_id}/pdf", None
+
+        return prepare
+
+    company = {
+        "company_name": "UAB „Sąskaitininkas“",
+        "registration_code": "100000000",
+        "tax_id": "LT100000000",
+        "address": "Vilnius",
+        "email": "info@example.lt",
+    }
+    invoice = f"/api/invoices/{ids['invoice']}"
+    client_path = f"/api/clients/{ids['client']}"
+    return {
+        "health": Case("health", _fixed("GET", "/health")),
+        "frontend.index": Case("serve_frontend", _fixed("GET", "/")),
+        "frontend.static": Case("static", _fixed("GET", "/js/api.js")),
+        "invoices.list": Case("invoices.list_invoices", _fixed("GET", "/api/invoices/?limit=50")),
+        "invoices.list_filtered": Case(
+            "invoices.list_invoices", _fixed("GET", f"/api/invoices/?limit=50&status=paid&{month}")
+        ),
+        "invoices.search": Case("invoices.list_invoices", _fixed("GET", "/api/invoices/?limit=50&search=Baltijos")),
+        "invoices.detail": Case("invoices.get_invoice", _fixed("GET", invoice)),
+        "invoices.export_month": Case(
+            "invoices.export_invoices", _fixed("GET", f"/api/invoices/export?format=csv&{month}")
+        ),
+        "invoices.next_number": Case(
+            "invoices.next_number", _fixed("GET", f"/api/invoices/next-number/{ids['series']}")
+        ),
+        "invoices.create": Case("invoices.create_invoice", _fixed("POST", "/api/invoices/", invoice_body())),
+        "invoices.bulk_create": Case(
+            "invoices.bulk_create_invoices",
+            _fixed("POST", "/api/invoices/bulk", {"invoices": [invoice_body() for _ in range(10)]}),
+        ),
+        "invoices.update": Case(
+            "invoices.update_invoice",
+            lambda client: (
+                "PUT",
+                f"/api/invoices/{draft(client)}",
+                {"notes": "Benchmark", "items": invoice_body(2)["items"]},
+            ),
+        ),
+        "invoices.status": Case(
+            "invoices.update_invoice_status",
+            lambda client: ("PATCH", f"/api/invoices/{draft(client)}/status", {"status": "sent"}),
+        ),
+        "invoices.delete": Case(
+            "invoices.delete_invoice", lambda client: ("DELETE", f"/api/invoices/{draft(client)}", None)
+        ),
+        "invoices.duplicate": Case("invoices.duplicate_invoice", _fixed("POST", f"{invoice}/duplicate")),
+        "invoices.pdf": Case("invoices.invoice_pdf", _fixed("GET", f"{invoice}/pdf")),
+        "invoices.pdf_render": Case("invoices.invoice_pdf", uncached_pdf(lambda client: ids["invoice"])),
+        "invoices.pdf_render_large": Case("invoices.invoice_pdf", uncached_pdf(large_invoice)),
+        "invoices.pdf_job": Case("invoices.create_pdf_job", _fixed("POST", f"{invoice}/pdf/jobs")),
+        "invoices.pdf_batch": Case(
+            "invoices.batch_invoice_pdfs", _fixed("POST", "/api/invoices/pdf/batch", {"ids": ids["invoices"]})
+        ),
+        "invoices.pdf_cache_stats": Case("invoices.pdf_cache_stats", _fixed("GET", "/api/invoices/pdf/cache")),
+        "pdf_jobs.status": Case(
+            "pdf_jobs.get_job", lambda client: ("GET", f"/api/pdf-jobs/{finished_job(client)}", None)
+        ),
+        "pdf_jobs.pdf": Case(
+            "pdf_jobs.job_pdf", lambda client: ("GET", f"/api/pdf-jobs/{finished_job(client)}/pdf", None)
+        ),
+        "pdf_jobs.cancel": Case(
+            "pdf_jobs.cancel_job", lambda client: ("DELETE", f"/api/pdf-jobs/{finished_job(client)}", None)
+        ),
+        "clients.list": Case("clients.list_clients", _fixed("GET", "/api/clients/?limit=50")),
+        "clients.search": Case("clients.list_clients", _fixed("GET", "/api/clients/?limit=50&search=statyba")),
+        "clients.detail": Case("clients.get_client", _fixed("GET", client_path)),
+        "clients.invoices": Case("clients.client_invoices", _fixed("GET", f"{client_path}/invoices?limit=50")),
+        "clients.statistics": Case("clients.client_statistics", _fixed("GET", f"{client_path}/statistics")),
+        "clients.create": Case(
+            "clients.create_client",
+            lambda client: (
+                "POST",
+                "/api/clients/",
+                {"company_name": "UAB Bench", "registration_code": f"NEW{next(unique):06d}", "address": "Vilnius"},
+            ),
+        ),
+        "clients.update": Case(
+            "clients.update_client",
+            lambda client: ("PUT", f"/api/clients/{new_client(client)}", {"phone": "+37060000000"}),
+        ),
+        "clients.delete": Case(
+            "clients.delete_client", lambda client: ("DELETE", f"/api/clients/{new_client(client)}", None)
+        ),
+        "dashboard.statistics": Case(
+            "dashboard.statistics", _fixed("GET", f"/api/dashboard/statistics?year={SEED_END.year}")
+        ),
+        "dashboard.monthly_data": Case(
+            "dashboard.monthly_data", _fixed("GET", f"/api/dashboard/monthly-data?year={SEED_END.year}")
+        ),
+        "dashboard.recent_activity": Case("dashboard.recent_activity", _fixed("GET", "/api/dashboard/recent-activity")),
+        "reports.isaf_month": Case(
+            "reports.isaf_report",
+            _fixed("GET", f"/api/reports/isaf?from={SEED_END.replace(day=1).isoformat()}&to={SEED_END.isoformat()}"),
+        ),
+        "settings.company": Case("settings.get_company", _fixed("GET", "/api/settings/company")),
+        "settings.company_update": Case("settings.update_company", _fixed("PUT", "/api/settings/company", company)),
+        "settings.bank_accounts": Case("settings.list_bank_accounts", _fixed("GET", "/api/settings/bank-accounts")),
+        "settings.bank_account_create": Case(
+            "settings.create_bank_account",
+            lambda client: (
+                "POST",
+                "/api/settings/bank-accounts",
+                {"bank_name": "Bench bank", "account_number": f"LT00NEW{next(unique):010d}"},
+            ),
+        ),
+        "settings.bank_account_update": Case(
+            "settings.update_bank_account",
+            lambda client: ("PUT", f"/api/settings/bank-accounts/{bank_account(client)}", {"bank_name": "Renamed"}),
+        ),
+        "settings.bank_account_delete": Case(
+            "settings.delete_bank_account",
+            lambda client: ("DELETE", f"/api/settings/bank-accounts/{bank_account(client)}", None),
+        ),
+        "settings.series": Case("settings.list_series", _fixed("GET", "/api/settings/series")),
+        "settings.series_create": Case(
+            "settings.create_series",
+            lambda client: ("POST", "/api/settings/series", {"series_code": f"B{next(unique)}"}),
+        ),
+        "settings.series_update": Case(
+            "settings.update_series",
+            _fixed("PUT", f"/api/settings/series/{ids['series']}", {"description": "Benchmark series"}),
+        ),
+        "settings.general": Case("settings.get_general_settings", _fixed("GET", "/api/settings/general")),
+        "settings.general_update": Case(
+            "settings.update_general_settings", _fixed("PUT", "/api/settings/general", {"bench": "1"})
+        ),
+    }
+
+
+def percentile(samples: list[float], share: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def summarize(timings: list[float], queries: int) -> dict:
+    """p50/p95/p99 in milliseconds of ``timings`` (seconds), with the queries per request."""
+    return {
+        "p50": percentile(timings, 0.50) * 1000,
+        "p95": percentile(timings, 0.95) * 1000,
+        "p99": percentile(timings, 0.99) * 1000,
+        "queries": queries,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_slowdown_ms: float = MIN_SLOWDOWN_MS) -> list[str]:
+    """Regressions of ``results`` against ``baseline``: more queries, or a slower p95."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result["queries"] > before["queries"]:
+            regressions.append(f"{name}: {before['queries']} -> {result['queries']} queries")
+        if result["p95"] > max(before["p95"] * (1 + tolerance), before["p95"] + min_slowdown_ms):
+            regressions.append(f"{name}: p95 {before['p95']:.2f} -> {result['p95']:.2f} ms")
+    return regressions
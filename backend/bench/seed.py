@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+INSERT_BATCH_SIZE = 5000
+SERIES_CODES = ("SF", "PVM", "KR", "AV", "EX", "IS", "PR", "NU")
+VAT_RATE = Decimal("0.21")
+CENT = Decimal("0.01")
+# Line items per invoice and their cumulative weights: most invoices bill one or two lines.
+ITEM_COUNTS = (1, 2, 3, 4, 5, 8, 12, 20, 40)
+ITEM_COUNT_WEIGHTS = tuple(accumulate((36, 24, 14, 8, 6, 6, 3, 2, 1)))
+# (description, unit, lowest and highest unit price in euros, quantities billed)
+CATALOGUE = (
+    ("Konsultacinės paslaugos", "val.", 40, 120, (1, 2, 4, 8, 16)),
+    ("Programavimo darbai", "val.", 35, 90, (4, 8, 16, 40, 80)),
+    ("Svetainės priežiūra", "mėn.", 50, 400, (1, 3, 12)),
+    ("Serverio nuoma", "mėn.", 20, 250, (1, 3, 6, 12)),
+    ("Licencija", "vnt", 15, 900, (1, 2, 5, 10, 25)),
+    ("Transporto paslaugos", "km", 1, 3, (50, 120, 300, 800)),
+    ("Mokymai", "d.", 200, 900, (1, 2, 3)),
+    ("Biuro prekės", "vnt", 1, 60, (1, 5, 10, 50, 100)),
+    ("Remonto darbai", "val.", 25, 70, (2, 4, 8, 24)),
+    ("Dizaino paslaugos", "val.", 30, 100, (2, 6, 12, 30)),
+)
+NAME_WORDS = (
+    "Baltijos", "Vilniaus", "Nemuno", "Šiaurės", "Žalgirio", "Gintaro", "Aukštaitijos", "Neries",
+    "Pajūrio", "Dzūkijos", "Ąžuolo", "Rasos", "Vakarų", "Saulės", "Kauno", "Medžio",
+)
+NAME_TRADES = (
+    "statyba", "logistika", "technologijos", "prekyba", "sprendimai", "paslaugos", "projektai",
+    "gamyba", "konsultacijos", "transportas", "baldai", "energija",
+)
+LEGAL_FORMS = ("UAB", "UAB", "UAB", "MB", "AB", "IĮ", "VšĮ")
+CITIES = ("Vilnius", "Kaunas", "Klaipėda", "Šiauliai", "Panevėžys", "Alytus", "Marijampolė")
+
+
+def _make_app(db_uri: str | None):
+    from backend.app import create_app
+
+    config = {"OVERDUE_SWEEPER_ENABLED": False}
+    if db_uri is not None:
+        config["SQLALCHEMY_DATABASE_URI"] = db_uri
+    return create_app(config)
+
+
+def _database_uri(db: str) -> str:
+    # A URL such as postgresql+psycopg://localhost/bench, or else the path of a SQLite file.
+    return db if "://" in db else f"sqlite:///{Path(db).resolve()}"
+
+
+def _next_id(column) -> int:
+    from backend.database import db
+
+    return (db.session.scalar(select(func.max(column))) or 0) + 1
+
+
+def _client_row(rng: random.Random, client_id: int) -> dict:
+    from backend.models import ClientType
+
+    name = f"{rng.choice(LEGAL_FORMS)} „{rng.choice(NAME_WORDS)} {rng.choice(NAME_TRADES)}“"
+    code = 300000000 + client_id
+    city = rng.choice(CITIES)
+    return {
+        "id": client_id,
+        "company_name": name,
+        "registration_code": str(code),
+        "vat_code": f"LT{code}" if rng.random() < 0.7 else None,
+        "address": f"{rng.choice(NAME_WORDS)} g. {rng.randint(1, 150)}, {city}",
+        "phone": f"+3706{rng.randint(0, 9999999):07d}" if rng.random() < 0.6 else None,
+        "email": f"info{client_id}@example.lt" if rng.random() < 0.8 else None,
+        "client_type": ClientType.SUPPLIER if rng.random() < 0.1 else ClientType.CLIENT,
+    }
+
+
+def _status(rng: random.Random, invoice_date: date, due_date: date, end: date):
+    from backend.models import InvoiceStatus
+
+    if (end - invoice_date).days < 14 and rng.random() < 0.3:
+        return InvoiceStatus.DRAFT
+    if due_date < end:
+        return InvoiceStatus.PAID if rng.random() < 0.88 else InvoiceStatus.OVERDUE
+    return InvoiceStatus.PAID if rng.random() < 0.25 else InvoiceStatus.SENT
+
+
+def _items(rng: random.Random, invoice_id: int, first_id: int) -> list[dict]:
+    count = rng.choices(ITEM_COUNTS, cum_weights=ITEM_COUNT_WEIGHTS)[0]
+    items = []
+    for position in range(count):
+        description, unit, low, high, quantities = rng.choice(CATALOGUE)
+        items.append(
+            {
+                "id": first_id + position,
+                "invoice_id": invoice_id,
+                "description": description,
+                "quantity": Decimal(rng.choice(quantities)),
+                "unit": unit,
+                "unit_price": Decimal(rng.randint(low * 100, high * 100)) / 100,
+                "discount_percent": Decimal(rng.choice((5, 10, 15))) if rng.random() < 0.1 else Decimal(0),
+                "sort_order": position,
+            }
+        )
+    return items
+
+
+def _totals(items: list[dict], exclude_vat: bool) -> dict:
+    # The same arithmetic as Invoice.recalculate_totals, rounded to cents like the API stores it.
+    gross = sum((item["quantity"] * item["unit_price"] for item in items), Decimal(0))
+    subtotal = sum(
+        (item["quantity"] * item["unit_price"] * (1 - item["discount_percent"] / 100) for item in items),
+        Decimal(0),
+    ).quantize(CENT)
+    vat_amount = Decimal(0) if exclude_vat else (subtotal * VAT_RATE).quantize(CENT)
+    return {
+        "subtotal": subtotal,
+        "discount_amount": max(gross.quantize(CENT) - subtotal, Decimal(0)),
+        "vat_amount": vat_amount,
+        "total": subtotal + vat_amount,
+    }
+
+
+def _ensure_company():
+    from backend.database import db
+    from backend.models import BankAccount, CompanyInfo
+
+    if CompanyInfo.get_singleton() is not None:
+        return
+    company = CompanyInfo(
+        company_name="UAB „Sąskaitininkas“", registration_code="100000000", tax_id="LT100000000",
+        address="Gedimino pr. 1, Vilnius", email="info@example.lt",
+    )
+    company.bank_accounts.append(
+        BankAccount(bank_name="AB SEB bankas", account_number="LT127044060000000001", is_default=True)
+    )
+    db.session.add(company)
+    db.session.commit()
+
+
+def _ensure_series(codes: tuple[str, ...]) -> list:
+    from backend.database import db
+    from backend.models import InvoiceSeries
+
+    query = InvoiceSeries.query.filter(InvoiceSeries.series_code.in_(codes))
+    existing = {series.series_code: series for series in query}
+    for code in codes:
+        if code not in existing:
+            existing[code] = InvoiceSeries(series_code=code, description=f"Serija {code}")
+            db.session.add(existing[code])
+    db.session.commit()
+    return [existing[code] for code in codes]
+
+
+def seed_dataset(app, *, clients: int, invoices: int, series: int = 3, seed: int = 0,
+                 end: date | None = None, years: int = 3, progress=None) -> dict:
+    """Add ``clients`` clients and ``invoices`` invoices with their items to the database.
+
+    The same ``seed`` and ``end`` always produce the same rows. Invoices are spread over
+    the ``years`` before ``end`` and across ``series`` series, with a status mix that
+    follows their due dates. Rows go in with bulk INSERTs, then the ledger rollups are
+    rebuilt; ``progress`` is called with the number of invoices written after each batch.
+    """
+    from backend.database import db
+    from backend.models import Client, Invoice, InvoiceItem
+    from backend.services.ledger import rebuild_client_stats, rebuild_monthly_revenue
+
+    rng = random.Random(seed)
+    end = end or date.today()
+    start = end - timedelta(days=365 * years)
+    span = (end - start).days
+    written = {"clients": clients, "invoices": 0, "items": 0}
+
+    with app.app_context():
+        _ensure_company()
+        all_series = _ensure_series(SERIES_CODES[: max(1, min(series, len(SERIES_CODES)))])
+        first_client = _next_id(Client.id)
+        client_ids = list(range(first_client, first_client + clients))
+        for offset in range(0, clients, INSERT_BATCH_SIZE):
+            batch = client_ids[offset: offset + INSERT_BATCH_SIZE]
+            db.session.execute(Client.__table__.insert(), [_client_row(rng, client_id) for client_id in batch])
+        db.session.commit()
+        if not client_ids:
+            client_ids = db.session.scalars(select(Client.id)).all()
+        if not client_ids and invoices:
+            raise ValueError("Invoices need clients; pass a client count.")
+
+        # A few clients account for most invoices, like real customers do.
+        client_weights = list(accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(client_ids))))
+        next_numbers = {entry.id: entry.current_number + 1 for entry in all_series}
+        codes = {entry.id: entry.series_code for entry in all_series}
+        series_ids = list(codes)
+        series_weights = list(accumulate(2 ** -index for index in range(len(series_ids))))
+        invoice_id = _next_id(Invoice.id)
+        item_id = _next_id(InvoiceItem.id)
+
+        for offset in range(0, invoices, INSERT_BATCH_SIZE):
+            count = min(INSERT_BATCH_SIZE, invoices - offset)
+            dates = sorted(start + timedelta(days=rng.randrange(span + 1)) for _ in range(count))
+            invoice_rows, item_rows = [], []
+            for invoice_date in dates:
+                series_id = rng.choices(series_ids, cum_weights=series_weights)[0]
+                number = next_numbers[series_id]
+                next_numbers[series_id] += 1
+                due_date = invoice_date + timedelta(days=rng.choice((7, 14, 14, 30, 30, 60)))
+                exclude_vat = rng.random() < 0.05
+                items = _items(rng, invoice_id, item_id)
+                invoice_rows.append(
+                    {
+                        "id": invoice_id,
+                        "series_id": series_id,
+                        "invoice_number": number,
+                        "full_invoice_number": f"{codes[series_id]} {number}",
+                        "client_id": rng.choices(client_ids, cum_weights=client_weights)[0],
+                        "invoice_date": invoice_date,
+                        "due_date": due_date,
+                        "status": _status(rng, invoice_date, due_date, end),
+                        "exclude_vat": exclude_vat,
+                        "notes": "Apmokėti per 14 dienų." if rng.random() < 0.2 else None,
+                        **_totals(items, exclude_vat),
+                    }
+                )
+                item_rows.extend(items)
+                invoice_id += 1
+                item_id += len(items)
+            db.session.execute(Invoice.__table__.insert(), invoice_rows)
+            db.session.execute(InvoiceItem.__table__.insert(), item_rows)
+            db.session.commit()
+            written["invoices"] += len(invoice_rows)
+            written["items"] += len(item_rows)
+            if progress is not None:
+                progress(written["invoices"])
+
+        for entry in all_series:
+            entry.current_number = next_numbers[entry.id] - 1
+        db.session.commit()
+        # The bulk INSERTs bypass the ledger's session hooks; recompute its rollups once.
+        with db.engine.begin() as connection:
+            rebuild_monthly_revenue(connection)
+            rebuild_client_stats(connection)
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Fill a database with a deterministic synthetic dataset.")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--invoices", type=int, default=100000)
+    parser.add_argument(
+        "--series", type=int, default=3, help=f"Invoice series to spread over (at most {len(SERIES_CODES)})."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed and --end give the same data.")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last invoice date, YYYY-MM-DD (default: today).")
+    parser.add_argument("--years", type=int, default=3, help="Years of invoices before --end.")
+    parser.add_argument("--db", help="SQLite file or database URL to fill (default: the app's database).")
+    args = parser.parse_args(argv)
+
+    app = _make_app(_database_uri(args.db) if args.db else None)
+    started = time.perf_counter()
+
+    def progress(done: int) -> None:
+        elapsed = time.perf_counter() - started
+        print(f"\r{done}/{args.invoices} invoices ({done / elapsed:,.0f}/s)", end="", flush=True)
+
+    written = seed_dataset(
+        app, clients=args.clients, invoices=args.invoices, series=args.series, seed=args.seed,
+        end=args.end, years=args.years, progress=progress,
+    )
+    print(
+        f"\nAdded {written['clients']} clients, {written['invoices']} invoices and {written['items']} items "
+        f"in {time.perf_counter() - started:.1f}s."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
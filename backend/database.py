@@ -1,21 +1,231 @@
 from __future__ import annotations
 
+import logging
+import os
+import time
+from functools import wraps
+from urllib.parse import quote
+
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+# Bind key of the engine that views marked with @read_only query.
+READ_BIND = "read"
+_READ_ONLY_KEY = "read_only"
+
+
+class RoutingSession(Session):
+    """Session that sends a read-only view's queries to the read bind.
+
+    Flushes always go to the primary, so a stray write in such a view still lands in the
+    right database rather than failing against a read-only connection.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get(_READ_ONLY_KEY) and not self._flushing:
+            engine = self._db.engines.get(READ_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
 
 # Single shared SQLAlchemy instance for the app.
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+# Pragmas set on every new SQLite connection. WAL lets readers run alongside the writer,
+# and with it synchronous=NORMAL only fsyncs at checkpoints: a power cut may lose the last
+# commits but never corrupts the file. SQLITE_PRAGMAS overrides entries; None skips one.
+DEFAULT_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,  # milliseconds a connection waits for a lock before failing
+    "cache_size": -65536,  # negative values are KiB: 64 MiB of page cache per connection
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+# SQLite runs this many virtual machine steps between statement timeout checks.
+_TIMEOUT_CHECK_STEPS = 10000
+_DEADLINE_KEY = "statement_deadline"
+
+
+def engine_options(config, url=None) -> dict:
+    """Engine options for ``url`` (default: the primary), with the DATABASE_* settings applied.
+
+    Options set in SQLALCHEMY_ENGINE_OPTIONS itself take precedence. Pre-ping defaults to
+    on for database servers, whose connections can drop while pooled, and off for SQLite.
+    """
+    url = make_url(url or config["SQLALCHEMY_DATABASE_URI"])
+    sqlite = url.get_backend_name() == "sqlite"
+    options = dict(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    # An in-memory SQLite database lives in a single connection; it has no pool to size.
+    if not (sqlite and url.database in (None, "", ":memory:")):
+        for key, option in (("DATABASE_POOL_SIZE", "pool_size"), ("DATABASE_MAX_OVERFLOW", "max_overflow")):
+            if config.get(key) is not None:
+                options.setdefault(option, int(config[key]))
+    pre_ping = config.get("DATABASE_POOL_PRE_PING")
+    options.setdefault("pool_pre_ping", not sqlite if pre_ping is None else bool(pre_ping))
+
+    timeout = int(config.get("DATABASE_STATEMENT_TIMEOUT") or 0)
+    if timeout and url.get_backend_name() == "postgresql":
+        connect_args = dict(options.get("connect_args") or {})
+        server_options = f"{connect_args.get('options', '')} -c statement_timeout={timeout}"
+        connect_args["options"] = server_options.strip()
+        options["connect_args"] = connect_args
+    return options
+
+
+def sqlite_pragmas(overrides: dict | None = None) -> dict:
+    """The pragmas to apply: the defaults updated with ``overrides``, skipped ones removed."""
+    pragmas = {**DEFAULT_SQLITE_PRAGMAS, **(overrides or {})}
+    return {name: value for name, value in pragmas.items() if value is not None}
+
+
+def apply_sqlite_pragmas(engine, pragmas: dict) -> None:
+    """Run ``pragmas`` on each connection ``engine`` opens from now on."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def apply_sqlite_statement_timeout(engine, milliseconds: int) -> None:
+    """Interrupt SQLite statements still running ``milliseconds`` after they started.
+
+    SQLite has no server-side timeout, so a progress handler checks a per-connection
+    deadline set before each statement. The deadline covers execution up to the first
+    row; fetching the rest of a streamed result is not limited.
+    """
+    seconds = milliseconds / 1000
+
+    @event.listens_for(engine, "connect")
+    def _install_handler(dbapi_connection, connection_record):
+        info = connection_record.info
+
+        def expired() -> int:
+            deadline = info.get(_DEADLINE_KEY)
+            return int(deadline is not None and time.monotonic() > deadline)
+
+        dbapi_connection.set_progress_handler(expired, _TIMEOUT_CHECK_STEPS)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(connection, cursor, statement, parameters, context, executemany):
+        connection.info[_DEADLINE_KEY] = time.monotonic() + seconds
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(connection, cursor, statement, parameters, context, executemany):
+        connection.info.pop(_DEADLINE_KEY, None)
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(context):
+        if context.connection is not None:
+            context.connection.info.pop(_DEADLINE_KEY, None)
+
+
+def read_database_url(app: Flask):
+    """URL of the read bind: DATABASE_READ_URL, else the SQLite file opened read-only.
+
+    Returns None (reads share the primary) for an empty DATABASE_READ_URL, for in-memory
+    SQLite and for other databases without a configured replica.
+    """
+    configured = app.config.get("DATABASE_READ_URL")
+    if configured is not None:
+        return configured or None
+    url = make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:") or url.query.get("uri"):
+        return None
+    path = url.database if os.path.isabs(url.database) else os.path.join(app.instance_path, url.database)
+    return URL.create(url.drivername, database=f"file:{quote(path)}", query={"mode": "ro", "uri": "true"})
+
+
+def read_only(view):
+    """Run ``view``'s queries on the read bind; only for views that never write."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        db.session.info[_READ_ONLY_KEY] = True
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def _configure_engine(engine, app: Flask, pragmas: dict) -> None:
+    apply_sqlite_pragmas(engine, pragmas)
+    timeout = int(app.config.get("DATABASE_STATEMENT_TIMEOUT") or 0)
+    if timeout and engine.dialect.name == "sqlite":
+        apply_sqlite_statement_timeout(engine, timeout)
+    elif timeout and engine.dialect.name != "postgresql":
+        logger.warning("DATABASE_STATEMENT_TIMEOUT is not supported on %s.", engine.dialect.name)
 
 
 def init_db(app: Flask, *, create_all: bool = True) -> SQLAlchemy:
     """Initialize the SQLAlchemy extension and optionally create tables."""
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config)
+    read_url = read_database_url(app)
+    if read_url is not None:
+        binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+        binds[READ_BIND] = {**engine_options(app.config, read_url), "url": read_url}
+        app.config["SQLALCHEMY_BINDS"] = binds
     db.init_app(app)
+    with app.app_context():
+        pragmas = sqlite_pragmas(app.config.get("SQLITE_PRAGMAS"))
+        _configure_engine(db.engine, app, pragmas)
+        if READ_BIND in db.engines:
+            # A read-only connection cannot change the journal mode; the primary sets it.
+            pragmas = {name: value for name, value in pragmas.items() if name != "journal_mode"}
+            _configure_engine(db.engines[READ_BIND], app, pragmas)
     if create_all:
         with app.app_context():
-            db.create_all()
+            # The models all live on the primary; the read bind only mirrors it.
+            db.create_all(bind_key=None)
+            ensure_columns()
+            ensure_indexes()
     return db
 
 
+def ensure_columns():
+    """Add nullable model columns missing from existing tables (create_all skips existing tables)."""
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            except DBAPIError:
+                # Another worker starting up at the same time may have added it first.
+                added = {c["name"] for c in inspect(db.engine).get_columns(table.name)}
+                if column.name not in added:
+                    raise
+
+
+def ensure_indexes():
+    """Create model indexes missing from an existing database (create_all skips existing tables)."""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+
 def get_session():
     """Convenience accessor for the current scoped session."""
     return db.session
@@ -24,5 +234,5 @@ def get_session():
 def reset_database(app: Flask):
     """Drop and recreate all tables. Useful for local development/tests."""
     with app.app_context():
-        db.drop_all()
-        db.create_all()
+        db.drop_all(bind_key=None)
+        db.create_all(bind_key=None)
@@ -5,8 +5,10 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import CheckConstraint, Index, UniqueConstraint
+from sqlalchemy import CheckConstraint, Index, UniqueConstraint, event, func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm.attributes import set_committed_value
 
 from backend.database import db
 
@@ -58,6 +60,8 @@ class CompanyInfo(TimestampMixin, db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     company_name = db.Column(db.String(255), nullable=False)
+    # Company (or personal) code; tax_id holds the VAT code.
+    registration_code = db.Column(db.String(64))
     tax_id = db.Column(db.String(64), nullable=False)
     address = db.Column(db.Text, nullable=False)
     phone = db.Column(db.String(50))
@@ -135,6 +139,7 @@ class Client(TimestampMixin, db.Model):
     __table_args__ = (
         Index("ix_clients_company_name", "company_name"),
         Index("ix_clients_registration_code", "registration_code"),
+        Index("ix_clients_created_at", "created_at"),
     )
 
     @hybrid_property
@@ -178,16 +183,77 @@ class InvoiceSeries(db.Model):
     )
 
     def next_number(self, *, commit: bool = False) -> int:
-        """Increment and return the next invoice number in this series."""
-        self.current_number = (self.current_number or 0) + 1
-        if commit:
+        """Allocate the next invoice number in this series.
+
+        Numbers released by deleted drafts are handed out again first; otherwise the
+        counter is incremented in the database, so concurrent workers never receive
+        the same number. ``commit`` is accepted for backwards compatibility; the
+        allocation is always written immediately.
+        """
+        if self.id is None:
             db.session.flush()
-        return self.current_number
+        number = ReleasedInvoiceNumber.claim(self.id)
+        if number is None:
+            number = InvoiceSeries.reserve_numbers(self.id, 1)
+            set_committed_value(self, "current_number", number)
+        return number
+
+    def peek_next_number(self) -> int:
+        """The number :meth:`next_number` would hand out now, without allocating it."""
+        released = db.session.scalar(
+            select(func.min(ReleasedInvoiceNumber.invoice_number)).where(
+                ReleasedInvoiceNumber.series_id == self.id
+            )
+        )
+        return released if released is not None else (self.current_number or 0) + 1
+
+    @classmethod
+    def reserve_numbers(cls, series_id: int, count: int) -> int:
+        """Reserve ``count`` consecutive numbers in one UPDATE; returns the first of them."""
+        table = cls.__table__
+        stmt = (
+            table.update()
+            .where(table.c.id == series_id)
+            .values(current_number=table.c.current_number + count)
+            .returning(table.c.current_number)
+        )
+        # On the session's connection: allocating must not autoflush the invoice being numbered.
+        last = db.session.connection().execute(stmt).scalar_one()
+        return last - count + 1
 
     def format_full_number(self, number: int | str) -> str:
         return f"{self.series_code} {number}" if number is not None else self.series_code
 
 
+class ReleasedInvoiceNumber(db.Model):
+    """A number freed by a deleted draft, reused before the series counter advances."""
+
+    __tablename__ = "released_invoice_numbers"
+
+    series_id = db.Column(db.Integer, db.ForeignKey("invoice_series.id"), primary_key=True)
+    invoice_number = db.Column(db.Integer, primary_key=True)
+    released_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    @classmethod
+    def claim(cls, series_id: int) -> Optional[int]:
+        """Take the lowest released number of a series, or None when there is none.
+
+        A single DELETE ... RETURNING, so two workers can never claim the same number.
+        """
+        table = cls.__table__
+        lowest = (
+            select(func.min(table.c.invoice_number))
+            .where(table.c.series_id == series_id)
+            .scalar_subquery()
+        )
+        stmt = (
+            table.delete()
+            .where(table.c.series_id == series_id, table.c.invoice_number == lowest)
+            .returning(table.c.invoice_number)
+        )
+        return db.session.connection().execute(stmt).scalar_one_or_none()
+
+
 class Invoice(TimestampMixin, db.Model):
     __tablename__ = "invoices"
 
@@ -242,6 +308,12 @@ class Invoice(TimestampMixin, db.Model):
         CheckConstraint("due_date >= invoice_date", name="ck_invoice_due_after_issue"),
         Index("ix_invoices_invoice_date", "invoice_date"),
         Index("ix_invoices_due_date", "due_date"),
+        Index("ix_invoices_status_due_date", "status", "due_date"),
+        # Keyset pagination sorts by these columns (see list_invoices).
+        Index("ix_invoices_invoice_number", "invoice_number"),
+        Index("ix_invoices_total", "total"),
+        # Client invoice history pages by (invoice_date, id) within one client.
+        Index("ix_invoices_client_invoice_date", "client_id", "invoice_date"),
     )
 
     @hybrid_property
@@ -320,6 +392,27 @@ class Invoice(TimestampMixin, db.Model):
         return item
 
 
+@event.listens_for(Invoice, "after_delete")
+def _release_draft_number(mapper, connection, invoice: Invoice) -> None:
+    """Deleted drafts were never issued, so their number goes back to the series."""
+    if invoice.status != InvoiceStatus.DRAFT or invoice.invoice_number is None:
+        return
+    connection.execute(
+        ReleasedInvoiceNumber.__table__.insert().values(
+            series_id=invoice.series_id,
+            invoice_number=invoice.invoice_number,
+            released_at=datetime.utcnow(),
+        )
+    )
+
+
+@event.listens_for(Invoice.items, "append")
+@event.listens_for(Invoice.items, "remove")
+def _touch_invoice(invoice: Invoice, item, initiator) -> None:
+    """Items have no timestamp of their own; changing them counts as changing the invoice."""
+    invoice.updated_at = datetime.utcnow()
+
+
 class InvoiceItem(db.Model):
     __tablename__ = "invoice_items"
 
@@ -405,3 +498,107 @@ class Setting(db.Model):
         if description is not None:
             setting.description = description
         return setting
+
+
+class MaintenanceRun(db.Model):
+    """Bookkeeping row per background maintenance task (e.g. the overdue sweep)."""
+
+    __tablename__ = "maintenance_runs"
+
+    task = db.Column(db.String(64), primary_key=True)
+    last_run_on = db.Column(db.Date, nullable=False)
+    last_run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    rows_affected = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def record(cls, task: str, run_on: date, rows_affected: int = 0) -> "MaintenanceRun":
+        run = db.session.get(cls, task)
+        if run is None:
+            run = cls(task=task)
+            db.session.add(run)
+        run.last_run_on = run_on
+        run.last_run_at = datetime.utcnow()
+        run.rows_affected = rows_affected
+        return run
+
+    @classmethod
+    def claim(cls, task: str, run_on: date, ran_before: datetime) -> bool:
+        """Mark ``task`` as running now unless it already ran on ``run_on`` after ``ran_before``.
+
+        A single conditional UPDATE (or an INSERT for the first run), so of several
+        workers claiming at once only one gets True. Commit or roll back afterwards.
+        """
+        table = cls.__table__
+        now = datetime.utcnow()
+        connection = db.session.connection()
+        claimed = connection.execute(
+            table.update()
+            .where(table.c.task == task, or_(table.c.last_run_on < run_on, table.c.last_run_at < ran_before))
+            .values(last_run_on=run_on, last_run_at=now)
+        )
+        if claimed.rowcount:
+            return True
+        dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+        inserted = connection.execute(
+            dialect.insert(table)
+            .values(task=task, last_run_on=run_on, last_run_at=now, rows_affected=0)
+            .on_conflict_do_nothing(index_elements=["task"])
+        )
+        return inserted.rowcount == 1
+
+
+class PdfRenderJob(db.Model):
+    """Status of a background PDF render, shared by every worker process."""
+
+    __tablename__ = "pdf_jobs"
+
+    id = db.Column(db.String(32), primary_key=True)
+    # No foreign key: a job may outlive its invoice until it expires.
+    invoice_id = db.Column(db.Integer, nullable=False)
+    download_name = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default="queued")
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (Index("ix_pdf_jobs_finished_at", "finished_at"),)
+
+
+class MonthlyRevenue(db.Model):
+    """Invoice counts and totals per (year, month, status), maintained on every invoice write."""
+
+    __tablename__ = "monthly_revenue"
+
+    year = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.Enum(InvoiceStatus, name="invoice_status"), primary_key=True)
+    invoice_count = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(MONEY, nullable=False, default=0)
+
+    __table_args__ = (
+        CheckConstraint("month BETWEEN 1 AND 12", name="ck_monthly_revenue_month"),
+    )
+
+
+class ClientStats(db.Model):
+    """Per-client invoice counts and totals, maintained on every invoice write."""
+
+    __tablename__ = "client_stats"
+
+    client_id = db.Column(db.Integer, db.ForeignKey("clients.id", ondelete="CASCADE"), primary_key=True)
+    invoice_count = db.Column(db.Integer, nullable=False, default=0)
+    paid_count = db.Column(db.Integer, nullable=False, default=0)
+    overdue_count = db.Column(db.Integer, nullable=False, default=0)
+    total_invoiced = db.Column(MONEY, nullable=False, default=0)
+    total_paid = db.Column(MONEY, nullable=False, default=0)
+    total_unpaid = db.Column(MONEY, nullable=False, default=0)
+    last_invoice_date = db.Column(db.Date)
+
+    # Single-column indexes end in the client_id rowid, so each one also serves the
+    # (value, client_id) keyset order used by the client list.
+    __table_args__ = (
+        Index("ix_client_stats_invoice_count", "invoice_count"),
+        Index("ix_client_stats_total_invoiced", "total_invoiced"),
+        Index("ix_client_stats_total_paid", "total_paid"),
+        Index("ix_client_stats_total_unpaid", "total_unpaid"),
+    )
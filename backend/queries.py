@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from sqlalchemy import String, cast, func, select
+from sqlalchemy.sql import Select
+
+from backend.models import Client, ClientStats, Invoice, InvoiceSeries
+
+# Each SELECT below carries just the columns one kind of summary serializes, with related
+# tables joined in SQL. Its rows are named tuples with the models' attribute names, so the
+# serializers read them like entities while nothing enters the session's identity map.
+
+
+def invoice_number_column():
+    """``Invoice.number`` in SQL: the stored full number, else the series code and number."""
+    computed = InvoiceSeries.series_code + " " + cast(Invoice.invoice_number, String)
+    return func.coalesce(Invoice.full_invoice_number, computed).label("number")
+
+
+def invoice_list_select() -> Select:
+    """Rows of the invoice list: one per invoice with its series code and client name.
+
+    The list serializer unpacks the rows positionally; keep the two in step.
+    """
+    return (
+        select(
+            Invoice.id,
+            invoice_number_column(),
+            Invoice.invoice_number,
+            Invoice.series_id,
+            InvoiceSeries.series_code,
+            Invoice.client_id,
+            Client.company_name.label("client_name"),
+            Invoice.invoice_date,
+            Invoice.due_date,
+            Invoice.status,
+            Invoice.total,
+            Invoice.created_at,
+        )
+        .outerjoin(InvoiceSeries, InvoiceSeries.id == Invoice.series_id)
+        .outerjoin(Client, Client.id == Invoice.client_id)
+    )
+
+
+def client_invoice_select(client_id: int) -> Select:
+    """Rows of one client's invoice history."""
+    return (
+        select(
+            Invoice.id,
+            invoice_number_column(),
+            Invoice.invoice_date,
+            Invoice.due_date,
+            Invoice.status,
+            Invoice.total,
+            Invoice.client_id,
+            Invoice.series_id,
+            Invoice.created_at,
+            Invoice.updated_at,
+        )
+        .outerjoin(InvoiceSeries, InvoiceSeries.id == Invoice.series_id)
+        .where(Invoice.client_id == client_id)
+    )
+
+
+def recent_invoice_select() -> Select:
+    """Rows of the dashboard's recent activity feed."""
+    return (
+        select(
+            Invoice.id,
+            invoice_number_column(),
+            Client.company_name.label("client_name"),
+            Invoice.invoice_date,
+            Invoice.status,
+            Invoice.total,
+        )
+        .outerjoin(InvoiceSeries, InvoiceSeries.id == Invoice.series_id)
+        .outerjoin(Client, Client.id == Invoice.client_id)
+    )
+
+
+CLIENT_STAT_COLUMNS = ("invoice_count", "paid_count", "overdue_count", "total_invoiced", "total_paid", "total_unpaid")
+
+
+def client_stat(name: str):
+    """A ``client_stats`` count or total, zero for a client that has no stats row yet."""
+    return func.coalesce(getattr(ClientStats, name), 0)
+
+
+def client_list_select(*columns) -> Select:
+    """Rows of the client list: client details and their ledger statistics, plus ``columns``.
+
+    The statistics are outer-joined, so a client is listed (with zeros) even when its
+    ``client_stats`` row is missing, and the list agrees with the count of clients.
+    """
+    return select(
+        Client.id,
+        Client.company_name,
+        Client.registration_code,
+        Client.vat_code,
+        Client.address,
+        Client.phone,
+        Client.email,
+        Client.client_type,
+        Client.created_at,
+        Client.updated_at,
+        *(client_stat(name).label(name) for name in CLIENT_STAT_COLUMNS),
+        ClientStats.last_invoice_date,
+        *columns,
+    ).outerjoin(ClientStats, ClientStats.client_id == Client.id)
@@ -2,16 +2,23 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from flask import Blueprint, jsonify, request
-from sqlalchemy import and_, case, func, or_
+from flask import Blueprint, Response, abort, current_app, jsonify, request, stream_with_context
+from sqlalchemy import and_, func, select
 
-from backend.database import db
-from backend.models import Client, ClientType, Invoice, InvoiceStatus
+from backend.database import db, read_only
+from backend.models import Client, ClientStats, ClientType, Invoice, InvoiceStatus
+from backend.queries import client_invoice_select, client_list_select, client_stat
+from backend.services.http_cache import make_etag, not_modified, table_versions, versions_etag, with_validators
+from backend.services.search import client_search
+from backend.utils.pagination import decode_cursor, encode_cursor, keyset_condition, keyset_order
 
 clients_bp = Blueprint("clients", __name__, url_prefix="/api/clients")
 
 DEFAULT_LIMIT = 20
 MAX_LIMIT = 100
+# Invoice history is always newest first; cursors into it carry this sort tag.
+HISTORY_SORT = "-invoice_date"
+STREAM_BATCH_SIZE = 500
 
 
 def _parse_bool(value) -> bool:
@@ -73,76 +80,87 @@ def _error(message: str, status_code: int = 400):
     return jsonify({"error": message}), status_code
 
 
-def _decimal_to_float(value) -> float:
-    try:
-        return float(value or 0)
-    except (TypeError, ValueError):
-        return 0.0
-
-
-def _serialize_invoice(invoice: Invoice) -> dict:
-    status_value = getattr(invoice.status, "value", invoice.status)
+def _serialize_invoice(invoice) -> dict:
+    """An invoice row of :func:`backend.queries.client_invoice_select`."""
     return {
         "id": invoice.id,
         "number": invoice.number,
-        "invoice_date": invoice.invoice_date.isoformat() if invoice.invoice_date else None,
-        "due_date": invoice.due_date.isoformat() if invoice.due_date else None,
-        "status": status_value,
-        "total": _decimal_to_float(invoice.total),
+        "invoice_date": invoice.invoice_date,
+        "due_date": invoice.due_date,
+        "status": invoice.status,
+        "total": invoice.total,
         "client_id": invoice.client_id,
         "series_id": invoice.series_id,
-        "created_at": invoice.created_at.isoformat() if invoice.created_at else None,
-        "updated_at": invoice.updated_at.isoformat() if invoice.updated_at else None,
+        "created_at": invoice.created_at,
+        "updated_at": invoice.updated_at,
     }
 
 
-def _build_client_payload(client: Client, stats: dict) -> dict:
-    data = client.as_dict()
-    data["name"] = client.company_name  # legacy convenience
-    data["created_at"] = client.created_at.isoformat() if client.created_at else None
-    data["updated_at"] = client.updated_at.isoformat() if client.updated_at else None
-    data.update(stats)
-    return data
-
-
-def _client_statistics(client_id: int) -> dict:
-    totals = (
-        db.session.query(
-            func.coalesce(func.sum(Invoice.total), 0),
-            func.coalesce(
-                func.sum(case((Invoice.status == InvoiceStatus.PAID, Invoice.total), else_=0)),
-                0,
-            ),
-            func.count(Invoice.id),
-            func.coalesce(
-                func.sum(case((Invoice.status == InvoiceStatus.PAID, 1), else_=0)),
-                0,
-            ),
-            func.coalesce(
-                func.sum(case((Invoice.status == InvoiceStatus.OVERDUE, 1), else_=0)),
-                0,
-            ),
-        )
-        .filter(Invoice.client_id == client_id)
-        .one()
-    )
+def _build_client_payload(client, stats: dict) -> dict:
+    # ``client`` is a Client or a row of backend.queries.client_list_select.
+    return {
+        "id": client.id,
+        "company_name": client.company_name,
+        "name": client.company_name,  # legacy convenience
+        "registration_code": client.registration_code,
+        "vat_code": client.vat_code,
+        "address": client.address,
+        "phone": client.phone,
+        "email": client.email,
+        "client_type": client.client_type,
+        "created_at": client.created_at,
+        "updated_at": client.updated_at,
+        **stats,
+    }
 
-    total_invoiced, total_paid, invoice_count, paid_invoice_count, overdue_count = totals
-    total_invoiced_f = _decimal_to_float(total_invoiced)
-    total_paid_f = _decimal_to_float(total_paid)
-    total_unpaid_f = max(total_invoiced_f - total_paid_f, 0.0)
 
+def _stats_payload(stats) -> dict:
+    if stats is None:
+        return {
+            "invoice_count": 0,
+            "paid_invoice_count": 0,
+            "overdue_count": 0,
+            "total_invoiced": 0.0,
+            "total_paid": 0.0,
+            "total_unpaid": 0.0,
+            "last_invoice_date": None,
+        }
     return {
-        "invoice_count": int(invoice_count or 0),
-        "paid_invoice_count": int(paid_invoice_count or 0),
-        "overdue_count": int(overdue_count or 0),
-        "total_invoiced": total_invoiced_f,
-        "total_paid": total_paid_f,
-        "total_unpaid": total_unpaid_f,
+        "invoice_count": stats.invoice_count,
+        "paid_invoice_count": stats.paid_count,
+        "overdue_count": stats.overdue_count,
+        "total_invoiced": stats.total_invoiced,
+        "total_paid": stats.total_paid,
+        "total_unpaid": stats.total_unpaid,
+        "last_invoice_date": stats.last_invoice_date,
     }
 
 
+def _client_statistics(client_id: int) -> dict:
+    # Read the row fresh: the ledger updates client_stats behind the ORM's back.
+    stats = db.session.execute(
+        select(ClientStats).where(ClientStats.client_id == client_id).execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+    return _stats_payload(stats)
+
+
+def _client_etag(client_id: int) -> str | None:
+    """Strong ETag of a client's detail; 404s for a missing client.
+
+    The detail embeds statistics and a page of invoices, which are versioned by their
+    tables' change counters. Without counters the detail carries no ETag.
+    """
+    updated_at = db.session.scalar(select(Client.updated_at).where(Client.id == client_id))
+    if updated_at is None:
+        abort(404)
+    versions = table_versions("invoices", "invoice_series", "client_stats")
+    if versions is None:
+        return None
+    return make_etag("client", client_id, updated_at, *versions)
+
+
 @clients_bp.get("/")
+@read_only
 def list_clients():
     args = request.args
     limit = _parse_int(args.get("limit"), DEFAULT_LIMIT, minimum=1, maximum=MAX_LIMIT)
@@ -155,105 +173,119 @@ def list_clients():
     if client_type_param and client_type is None:
         return _error("Invalid client_type. Allowed values: client, supplier.")
 
-    filters = []
-    if search:
-        search_term = f"%{search.lower()}%"
-        filters.append(
-            or_(
-                func.lower(Client.company_name).like(search_term),
-                func.lower(Client.registration_code).like(search_term),
-                func.lower(Client.vat_code).like(search_term),
-                func.lower(Client.email).like(search_term),
-                func.lower(Client.phone).like(search_term),
-            )
-        )
+    search_result = client_search(search)
+    matches = search_result.matches
+    filters = list(search_result.filters)
     if client_type:
         filters.append(Client.client_type == client_type)
 
-    base_query = Client.query.filter(and_(*filters)) if filters else Client.query
-    total_clients = base_query.count()
-
-    stats_subquery = (
-        db.session.query(
-            Invoice.client_id.label("client_id"),
-            func.count(Invoice.id).label("invoice_count"),
-            func.coalesce(func.sum(Invoice.total), 0).label("total_invoiced"),
-            func.coalesce(
-                func.sum(case((Invoice.status == InvoiceStatus.PAID, Invoice.total), else_=0)),
-                0,
-            ).label("total_paid"),
-        )
-        .group_by(Invoice.client_id)
-        .subquery()
-    )
-
-    query = (
-        db.session.query(
-            Client,
-            func.coalesce(stats_subquery.c.invoice_count, 0).label("invoice_count"),
-            func.coalesce(stats_subquery.c.total_invoiced, 0).label("total_invoiced"),
-            func.coalesce(stats_subquery.c.total_paid, 0).label("total_paid"),
-        )
-        .outerjoin(stats_subquery, Client.id == stats_subquery.c.client_id)
-    )
-    if filters:
-        query = query.filter(and_(*filters))
-
-    sort_param = args.get("sort_by", "-created_at")
+    etag = versions_etag("clients", "client_stats")
+    cached = not_modified(etag, weak=True)
+    if cached is not None:
+        return cached
+
+    with_total = _parse_bool(args.get("with_total", "true"))
+    total_clients = None
+    if with_total:
+        base_query = Client.query
+        if matches is not None:
+            base_query = base_query.join(matches, matches.c.client_id == Client.id)
+        if filters:
+            base_query = base_query.filter(and_(*filters))
+        total_clients = base_query.count()
+
+    # Searches default to relevance order (name order when the index cannot rank).
+    sort_param = args.get("sort_by") or ("relevance" if search else "-created_at")
     descending = sort_param.startswith("-")
     sort_key = sort_param[1:] if descending else sort_param
     sort_map = {
         "name": Client.company_name,
         "company_name": Client.company_name,
         "created_at": Client.created_at,
-        "invoice_count": func.coalesce(stats_subquery.c.invoice_count, 0),
-        "total_invoiced": func.coalesce(stats_subquery.c.total_invoiced, 0),
-        "total_paid": func.coalesce(stats_subquery.c.total_paid, 0),
-        "total_unpaid": func.coalesce(stats_subquery.c.total_invoiced, 0)
-        - func.coalesce(stats_subquery.c.total_paid, 0),
+        "invoice_count": client_stat("invoice_count"),
+        "total_invoiced": client_stat("total_invoiced"),
+        "total_paid": client_stat("total_paid"),
+        "total_unpaid": client_stat("total_unpaid"),
+        "relevance": Client.company_name,
     }
-    sort_column = sort_map.get(sort_key)
-    if sort_column is None:
+    sort_expr = sort_map.get(sort_key)
+    if sort_expr is None:
         return _error(
-            "Invalid sort_by. Allowed: name, created_at, invoice_count, total_invoiced, total_paid, total_unpaid."
+            "Invalid sort_by. Allowed: name, created_at, invoice_count, total_invoiced, total_paid, total_unpaid, relevance."
+        )
+    unique_sort = False
+    # Cursors record the order they were issued under; relevance pages switch between
+    # bm25 rank and client id as the match count crosses CLIENT_RANK_LIMIT.
+    cursor_sort = sort_param
+    if sort_key == "relevance" and matches is not None:
+        if search_result.ranked:
+            sort_expr = matches.c.rank
+            cursor_sort = f"{sort_param}:rank"
+        else:
+            # Too many matches to rank: newest first, streamed straight from the index.
+            sort_expr, descending, unique_sort = matches.c.client_id, True, True
+            cursor_sort = f"{sort_param}:id"
+
+    cursor_param = args.get("cursor")
+    cursor = None
+    if cursor_param:
+        try:
+            cursor = decode_cursor(cursor_param, cursor_sort)
+        except ValueError as exc:
+            return _error(str(exc))
+
+    query = client_list_select(sort_expr.label("sort_value"))
+    if matches is not None:
+        query = query.join(matches, matches.c.client_id == Client.id)
+    if filters:
+        query = query.filter(and_(*filters))
+
+    query = query.order_by(*keyset_order(sort_expr, Client.id, descending=descending, unique=unique_sort))
+    if cursor is not None:
+        cursor_value, cursor_id = cursor
+        query = query.filter(
+            keyset_condition(sort_expr, cursor_value, Client.id, cursor_id, descending=descending, unique=unique_sort)
         )
-    sort_column = sort_column.desc() if descending else sort_column.asc()
-    query = query.order_by(sort_column, Client.id.desc())
+        page = None
+    else:
+        query = query.offset(offset)
 
-    rows = query.offset(offset).limit(limit).all()
+    # Fetch one extra row to learn whether another page follows.
+    rows = db.session.execute(query.limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(cursor_sort, last.sort_value, last.id)
 
-    clients = []
-    for client, invoice_count, total_invoiced, total_paid in rows:
-        stats = {
-            "invoice_count": int(invoice_count or 0),
-            "total_invoiced": _decimal_to_float(total_invoiced),
-            "total_paid": _decimal_to_float(total_paid),
-        }
-        stats["total_unpaid"] = max(stats["total_invoiced"] - stats["total_paid"], 0.0)
-        clients.append(_build_client_payload(client, stats))
+    clients = [_build_client_payload(row, _stats_payload(row)) for row in rows]
 
-    return jsonify({"clients": clients, "total": total_clients, "page": page})
+    response = jsonify({"clients": clients, "total": total_clients, "page": page, "next_cursor": next_cursor})
+    return with_validators(response, etag, weak=True)
 
 
 @clients_bp.get("/<int:client_id>")
 def get_client(client_id: int):
+    etag = _client_etag(client_id)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
     client = Client.query.get_or_404(client_id)
     summary = _client_statistics(client.id)
 
-    invoices = (
-        Invoice.query.filter_by(client_id=client.id)
-        .order_by(Invoice.invoice_date.desc(), Invoice.id.desc())
-        .all()
-    )
-    invoice_history = [_serialize_invoice(inv) for inv in invoices]
+    # Only the first page of history; the rest is fetched from /<id>/invoices with the cursor.
+    limit = _parse_int(request.args.get("invoice_limit"), DEFAULT_LIMIT, minimum=1, maximum=MAX_LIMIT)
+    invoices, next_cursor = _invoice_history_page(client_invoice_select(client.id), limit)
 
-    return jsonify(
+    response = jsonify(
         {
             "client": _build_client_payload(client, summary),
-            "invoices": invoice_history,
+            "invoices": [_serialize_invoice(inv) for inv in invoices],
+            "invoices_next_cursor": next_cursor,
             "financial_summary": summary,
         }
     )
+    return with_validators(response, etag)
 
 
 @clients_bp.post("/")
@@ -347,7 +379,37 @@ def delete_client(client_id: int):
     return jsonify(response)
 
 
+def _invoice_history_page(
+    query, limit: int, cursor: tuple | None = None, offset: int = 0
+) -> tuple[list, str | None]:
+    """One page of a client's invoice rows, newest first, plus the cursor for the next page."""
+    query = query.order_by(*keyset_order(Invoice.invoice_date, Invoice.id, descending=True))
+    if cursor is not None:
+        cursor_value, cursor_id = cursor
+        query = query.filter(
+            keyset_condition(Invoice.invoice_date, cursor_value, Invoice.id, cursor_id, descending=True)
+        )
+    elif offset:
+        query = query.offset(offset)
+    invoices = db.session.execute(query.limit(limit + 1)).all()
+    next_cursor = None
+    if len(invoices) > limit:
+        invoices = invoices[:limit]
+        next_cursor = encode_cursor(HISTORY_SORT, invoices[-1].invoice_date, invoices[-1].id)
+    return invoices, next_cursor
+
+
+def _stream_invoice_history(query):
+    # yield_per keeps memory flat however long the client's history is.
+    statement = query.order_by(*keyset_order(Invoice.invoice_date, Invoice.id, descending=True))
+    result = db.session.execute(statement.execution_options(yield_per=STREAM_BATCH_SIZE))
+    dumps = current_app.json.dumps
+    for row in result:
+        yield dumps(_serialize_invoice(row)) + "\n"
+
+
 @clients_bp.get("/<int:client_id>/invoices")
+@read_only
 def client_invoices(client_id: int):
     client = Client.query.get_or_404(client_id)
     args = request.args
@@ -356,6 +418,10 @@ def client_invoices(client_id: int):
     offset = _parse_int(args.get("offset"), 0, minimum=0)
     page = offset // limit + 1 if limit else 1
 
+    response_format = (args.get("format") or "json").lower()
+    if response_format not in {"json", "ndjson"}:
+        return _error("Invalid format. Allowed: json, ndjson.")
+
     status_param = args.get("status")
     status = _parse_invoice_status(status_param) if status_param else None
     if status_param and status is None:
@@ -370,26 +436,56 @@ def client_invoices(client_id: int):
     if end_date_raw and end_date is None:
         return _error("Invalid end_date. Use ISO format (YYYY-MM-DD).")
 
-    query = Invoice.query.filter_by(client_id=client.id)
+    cursor_param = args.get("cursor")
+    cursor = None
+    if cursor_param:
+        try:
+            cursor = decode_cursor(cursor_param, HISTORY_SORT)
+        except ValueError as exc:
+            return _error(str(exc))
+
+    conditions = []
     if status:
-        query = query.filter(Invoice.status == status)
+        conditions.append(Invoice.status == status)
     if start_date:
-        query = query.filter(Invoice.invoice_date >= start_date)
+        conditions.append(Invoice.invoice_date >= start_date)
     if end_date:
-        query = query.filter(Invoice.invoice_date <= end_date)
-
-    total = query.count()
-    invoices = (
-        query.order_by(Invoice.invoice_date.desc(), Invoice.id.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
+        conditions.append(Invoice.invoice_date <= end_date)
+    query = client_invoice_select(client.id).where(*conditions)
+
+    etag = versions_etag("invoices", "invoice_series")
+    cached = not_modified(etag, weak=True)
+    if cached is not None:
+        return cached
+
+    if response_format == "ndjson":
+        response = Response(stream_with_context(_stream_invoice_history(query)), mimetype="application/x-ndjson")
+        return with_validators(response, etag, weak=True)
+
+    with_total = _parse_bool(args.get("with_total", "true"))
+    total = None
+    if with_total:
+        # Counted without the series join the rows need for their numbers.
+        total = db.session.scalar(
+            select(func.count(Invoice.id)).where(Invoice.client_id == client.id, *conditions)
+        )
+    if cursor is not None:
+        page = None
+    invoices, next_cursor = _invoice_history_page(query, limit, cursor, offset)
 
-    return jsonify({"invoices": [_serialize_invoice(inv) for inv in invoices], "total": total, "page": page})
+    response = jsonify(
+        {
+            "invoices": [_serialize_invoice(inv) for inv in invoices],
+            "total": total,
+            "page": page,
+            "next_cursor": next_cursor,
+        }
+    )
+    return with_validators(response, etag, weak=True)
 
 
 @clients_bp.get("/<int:client_id>/statistics")
+@read_only
 def client_statistics(client_id: int):
     client = Client.query.get_or_404(client_id)
     summary = _client_statistics(client.id)
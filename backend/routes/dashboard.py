@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import calendar
 from datetime import date
+from decimal import Decimal
 
 from flask import Blueprint, jsonify, request
-from sqlalchemy import case, func
-from sqlalchemy.orm import joinedload
 
-from backend.database import db
-from backend.models import Invoice, InvoiceStatus
+from backend.database import db, read_only
+from backend.models import Invoice, InvoiceStatus, MonthlyRevenue
+from backend.queries import recent_invoice_select
+from backend.services.http_cache import not_modified, versions_etag, with_validators
 
 dashboard_bp = Blueprint("dashboard", __name__, url_prefix="/api/dashboard")
 
@@ -25,13 +26,6 @@ def _parse_int(value, default: int, *, minimum: int | None = None, maximum: int
     return parsed
 
 
-def _decimal_to_float(value) -> float:
-    try:
-        return float(value or 0)
-    except (TypeError, ValueError):
-        return 0.0
-
-
 def _year_month(args):
     today = date.today()
     year = _parse_int(args.get("year"), today.year, minimum=1900)
@@ -41,164 +35,123 @@ def _year_month(args):
     return year, month
 
 
+def _empty_totals() -> dict:
+    return {
+        "total_issued": Decimal("0"),
+        "total_received": Decimal("0"),
+        "total_unpaid": Decimal("0"),
+        "invoice_count": 0,
+        "paid_count": 0,
+        "unpaid_count": 0,
+        "overdue_count": 0,
+    }
+
+
+def _accumulate(totals: dict, status: InvoiceStatus, invoice_count: int, total) -> None:
+    total = total or Decimal("0")
+    totals["total_issued"] += total
+    totals["invoice_count"] += invoice_count
+    if status == InvoiceStatus.PAID:
+        totals["total_received"] += total
+        totals["paid_count"] += invoice_count
+    else:
+        totals["total_unpaid"] += total
+    if status == InvoiceStatus.OVERDUE:
+        totals["overdue_count"] += invoice_count
+    if status in (InvoiceStatus.DRAFT, InvoiceStatus.SENT):
+        totals["unpaid_count"] += invoice_count
+
+
 @dashboard_bp.get("/statistics")
+@read_only
 def statistics():
     args = request.args
     year, month = _year_month(args)
-
-    filters = [func.strftime("%Y", Invoice.invoice_date) == str(year)]
+    # The resolved year stands in for today's date, which picks the default.
+    etag = versions_etag("monthly_revenue", extra=(year, month))
+    cached = not_modified(etag, weak=True)
+    if cached is not None:
+        return cached
+
+    # Reads the incrementally maintained rollup: at most 12 x 4 rows per year.
+    query = MonthlyRevenue.query.filter(MonthlyRevenue.year == year)
     if month:
-        filters.append(func.strftime("%m", Invoice.invoice_date) == f"{month:02d}")
-
-    totals = (
-        db.session.query(
-            func.coalesce(func.sum(Invoice.total), 0).label("total_issued"),
-            func.coalesce(
-                func.sum(
-                    case((Invoice.status == InvoiceStatus.PAID, Invoice.total), else_=0)
-                ),
-                0,
-            ).label("total_received"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Invoice.status.in_([InvoiceStatus.PAID]), 0),
-                        else_=Invoice.total,
-                    )
-                ),
-                0,
-            ).label("total_unpaid"),
-            func.count(Invoice.id).label("invoice_count"),
-            func.coalesce(
-                func.sum(case((Invoice.status == InvoiceStatus.PAID, 1), else_=0)), 0
-            ).label("paid_count"),
-            func.coalesce(
-                func.sum(
-                    case((Invoice.status == InvoiceStatus.OVERDUE, 1), else_=0)
-                ),
-                0,
-            ).label("overdue_count"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Invoice.status.in_([InvoiceStatus.DRAFT, InvoiceStatus.SENT]), 1),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("unpaid_count"),
-        )
-        .filter(*filters)
-        .one()
-    )
+        query = query.filter(MonthlyRevenue.month == month)
+
+    totals = _empty_totals()
+    for row in query.all():
+        _accumulate(totals, row.status, row.invoice_count, row.total)
 
-    (
-        total_issued,
-        total_received,
-        total_unpaid,
-        invoice_count,
-        paid_count,
-        overdue_count,
-        unpaid_count,
-    ) = totals
-
-    return jsonify(
+    response = jsonify(
         {
             "year": year,
             "month": month,
-            "total_issued": _decimal_to_float(total_issued),
-            "total_received": _decimal_to_float(total_received),
-            "total_unpaid": _decimal_to_float(total_unpaid),
-            "net_profit": _decimal_to_float(total_received),
-            "invoice_count": int(invoice_count or 0),
-            "paid_count": int(paid_count or 0),
-            "unpaid_count": int(unpaid_count or 0),
-            "overdue_count": int(overdue_count or 0),
+            "total_issued": totals["total_issued"],
+            "total_received": totals["total_received"],
+            "total_unpaid": totals["total_unpaid"],
+            "net_profit": totals["total_received"],
+            "invoice_count": totals["invoice_count"],
+            "paid_count": totals["paid_count"],
+            "unpaid_count": totals["unpaid_count"],
+            "overdue_count": totals["overdue_count"],
         }
     )
+    return with_validators(response, etag, weak=True)
 
 
 @dashboard_bp.get("/monthly-data")
+@read_only
 def monthly_data():
     args = request.args
     today = date.today()
     year = _parse_int(args.get("year"), today.year, minimum=1900)
+    etag = versions_etag("monthly_revenue", extra=(year,))
+    cached = not_modified(etag, weak=True)
+    if cached is not None:
+        return cached
 
-    month_label = func.strftime("%m", Invoice.invoice_date).label("month")
-    rows = (
-        db.session.query(
-            month_label,
-            func.coalesce(func.sum(Invoice.total), 0).label("total_issued"),
-            func.coalesce(
-                func.sum(case((Invoice.status == InvoiceStatus.PAID, Invoice.total), else_=0)), 0
-            ).label("total_received"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (Invoice.status.in_([InvoiceStatus.PAID]), 0),
-                        else_=Invoice.total,
-                    )
-                ),
-                0,
-            ).label("total_unpaid"),
-            func.count(Invoice.id).label("invoice_count"),
-        )
-        .filter(func.strftime("%Y", Invoice.invoice_date) == str(year))
-        .group_by(month_label)
-        .all()
-    )
+    by_month = {m: _empty_totals() for m in range(1, 13)}
+    for row in MonthlyRevenue.query.filter(MonthlyRevenue.year == year).all():
+        _accumulate(by_month[row.month], row.status, row.invoice_count, row.total)
 
-    monthly = {
-        int(r.month): {
-            "month": int(r.month),
-            "month_name": calendar.month_name[int(r.month)],
-            "total_issued": _decimal_to_float(r.total_issued),
-            "total_received": _decimal_to_float(r.total_received),
-            "total_unpaid": _decimal_to_float(r.total_unpaid),
-            "invoice_count": int(r.invoice_count or 0),
+    data = [
+        {
+            "month": m,
+            "month_name": calendar.month_name[m],
+            "total_issued": totals["total_issued"],
+            "total_received": totals["total_received"],
+            "total_unpaid": totals["total_unpaid"],
+            "invoice_count": totals["invoice_count"],
         }
-        for r in rows
-    }
+        for m, totals in by_month.items()
+    ]
 
-    data = []
-    for m in range(1, 13):
-        data.append(
-            monthly.get(
-                m,
-                {
-                    "month": m,
-                    "month_name": calendar.month_name[m],
-                    "total_issued": 0.0,
-                    "total_received": 0.0,
-                    "total_unpaid": 0.0,
-                    "invoice_count": 0,
-                },
-            )
-        )
-
-    return jsonify({"year": year, "months": data})
+    return with_validators(jsonify({"year": year, "months": data}), etag, weak=True)
 
 
 @dashboard_bp.get("/recent-activity")
+@read_only
 def recent_activity():
-    invoices = (
-        Invoice.query.options(joinedload(Invoice.client))
-        .order_by(Invoice.invoice_date.desc(), Invoice.id.desc())
-        .limit(10)
-        .all()
-    )
+    etag = versions_etag("invoices", "clients", "invoice_series")
+    cached = not_modified(etag, weak=True)
+    if cached is not None:
+        return cached
 
-    return jsonify(
+    invoices = db.session.execute(
+        recent_invoice_select().order_by(Invoice.invoice_date.desc(), Invoice.id.desc()).limit(10)
+    ).all()
+
+    response = jsonify(
         [
             {
                 "id": inv.id,
                 "number": inv.number,
-                "client_name": inv.client.company_name if inv.client else None,
-                "invoice_date": inv.invoice_date.isoformat() if inv.invoice_date else None,
-                "status": inv.status.value if isinstance(inv.status, InvoiceStatus) else inv.status,
-                "amount": _decimal_to_float(inv.total),
+                "client_name": inv.client_name,
+                "invoice_date": inv.invoice_date,
+                "status": inv.status,
+                "amount": inv.total,
             }
             for inv in invoices
         ]
     )
-
+    return with_validators(response, etag, weak=True)
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import csv
+import os
+from collections import Counter
 from datetime import date, datetime, timedelta
 from decimal import Decimal, InvalidOperation
-from io import BytesIO
-from typing import Iterable
+from io import StringIO
+from typing import Iterable, Iterator
 
-from flask import Blueprint, jsonify, request, send_file
-from sqlalchemy import and_, case, func
-from sqlalchemy.orm import joinedload
+from flask import Blueprint, Response, abort, current_app, jsonify, request, send_file, stream_with_context
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 
-from backend.database import db
+from backend.database import db, read_only
 from backend.models import (
     Client,
     CompanyInfo,
@@ -18,13 +22,46 @@ from backend.models import (
     InvoiceSeries,
     InvoiceStatus,
 )
+from backend.queries import invoice_list_select
+from backend.services.http_cache import make_etag, not_modified, versions_etag, with_validators
+from backend.services.ledger import InvoiceFact, apply_invoice_changes
+from backend.services.pdf_batch import archive_name, get_pool, pool_size, render_pdf, stream_pdf_archive
+from backend.services.pdf_cache import get_pdf_cache, open_cached_pdf, payload_key
+from backend.services.pdf_jobs import get_pdf_jobs
+from backend.services.search import deferred_invoice_indexing, invoice_search_condition
 from backend.utils.number_to_words import amount_to_lithuanian_words, number_to_words_lt
-from backend.utils.pdf_generator import generate_invoice_pdf
+from backend.utils.pagination import decode_cursor, encode_cursor, keyset_condition, keyset_order
 
 invoices_bp = Blueprint("invoices", __name__, url_prefix="/api/invoices")
 
 DEFAULT_LIMIT = 20
 MAX_LIMIT = 100
+MAX_BULK_INVOICES = 10000
+MAX_BATCH_PDF_IDS = 10000
+BATCH_PDF_FETCH_SIZE = 200
+# Invoices with more lines than this are rendered in the PDF worker pool, not the request thread.
+INLINE_PDF_MAX_ITEMS = 100
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+# Rows fetched from the cursor, and CSV lines written, per chunk of an export.
+EXPORT_BATCH_SIZE = 1000
+EXPORT_INVOICE_COLUMNS = (
+    "id",
+    "number",
+    "series_code",
+    "invoice_number",
+    "invoice_date",
+    "due_date",
+    "status",
+    "client_id",
+    "client_name",
+    "client_code",
+    "client_vat_code",
+    "subtotal",
+    "discount_amount",
+    "vat_amount",
+    "total",
+)
+EXPORT_ITEM_COLUMNS = ("description", "quantity", "unit", "unit_price", "discount_percent", "line_total")
 
 
 # ------------ helpers ------------
@@ -82,29 +119,17 @@ def _normalize_status(value) -> InvoiceStatus | None:
 
 
 def _is_overdue(invoice: Invoice) -> bool:
+    # Derived from due_date at read time; the stored OVERDUE status is kept up to date
+    # by the background sweeper in backend.services.overdue, so reads never write.
     due_date = invoice.due_date
     if not due_date:
         return False
     normalized = _normalize_status(invoice.status)
-    if normalized == InvoiceStatus.PAID:
+    if normalized in (InvoiceStatus.DRAFT, InvoiceStatus.PAID):
         return False
     return due_date < date.today()
 
 
-def _refresh_overdue_statuses():
-    """Persist overdue status for invoices whose due date has passed and are not paid."""
-    today = date.today()
-    updated = (
-        Invoice.query.filter(
-            Invoice.due_date < today,
-            Invoice.status != InvoiceStatus.PAID,
-            Invoice.status != InvoiceStatus.OVERDUE,
-        ).update({Invoice.status: InvoiceStatus.OVERDUE}, synchronize_session=False)
-    )
-    if updated:
-        db.session.commit()
-
-
 def _decimal_to_float(value) -> float:
     try:
         return float(value or 0)
@@ -125,37 +150,58 @@ def _serialize_item(item: InvoiceItem) -> dict:
     return {
         "id": item.id,
         "description": item.description,
-        "quantity": _decimal_to_float(item.quantity),
+        "quantity": item.quantity,
         "unit": item.unit,
-        "unit_price": _decimal_to_float(item.unit_price),
-        "discount_percent": _decimal_to_float(item.discount_percent),
-        "line_total": _decimal_to_float(item.line_total),
+        "unit_price": item.unit_price,
+        "discount_percent": item.discount_percent,
+        "line_total": item.line_total,
         "sort_order": item.sort_order,
     }
 
 
-def _serialize_invoice_summary(invoice: Invoice) -> dict:
-    status_value = invoice.status.value if isinstance(invoice.status, InvoiceStatus) else invoice.status
-    return {
-        "id": invoice.id,
-        "number": invoice.number,
-        "invoice_number": invoice.invoice_number,
-        "full_invoice_number": invoice.number,
-        "series_id": invoice.series_id,
-        "series_code": invoice.series.series_code if invoice.series else None,
-        "client_id": invoice.client_id,
-        "client_name": invoice.client.company_name if invoice.client else None,
-        "invoice_date": invoice.invoice_date.isoformat() if invoice.invoice_date else None,
-        "due_date": invoice.due_date.isoformat() if invoice.due_date else None,
-        "status": status_value,
-        "is_overdue": _is_overdue(invoice),
-        "total": _decimal_to_float(invoice.total),
-        "created_at": invoice.created_at.isoformat() if invoice.created_at else None,
-    }
+def _serialize_invoice_summaries(rows) -> list[dict]:
+    """Rows of :func:`backend.queries.invoice_list_select` as the list endpoint returns them.
+
+    Each row is unpacked once, in the select's column order, straight into its payload.
+    """
+    today = date.today()
+    settled = (InvoiceStatus.DRAFT, InvoiceStatus.PAID)
+    return [
+        {
+            "id": invoice_id,
+            "number": number,
+            "invoice_number": invoice_number,
+            "full_invoice_number": number,
+            "series_id": series_id,
+            "series_code": series_code,
+            "client_id": client_id,
+            "client_name": client_name,
+            "invoice_date": invoice_date,
+            "due_date": due_date,
+            "status": status,
+            # _is_overdue, with today read once per page.
+            "is_overdue": due_date is not None and due_date < today and status not in settled,
+            "total": total,
+            "created_at": created_at,
+        }
+        for (
+            invoice_id,
+            number,
+            invoice_number,
+            series_id,
+            series_code,
+            client_id,
+            client_name,
+            invoice_date,
+            due_date,
+            status,
+            total,
+            created_at,
+        ) in rows
+    ]
 
 
 def _serialize_invoice_full(invoice: Invoice) -> dict:
-    status_value = invoice.status.value if isinstance(invoice.status, InvoiceStatus) else invoice.status
     client_payload = invoice.client.as_dict() if invoice.client else None
     if client_payload and "name" not in client_payload:
         client_payload["name"] = invoice.client.company_name
@@ -182,25 +228,48 @@ def _serialize_invoice_full(invoice: Invoice) -> dict:
         "client_id": invoice.client_id,
         "client": client_payload,
         "series": series_payload,
-        "invoice_date": invoice.invoice_date.isoformat() if invoice.invoice_date else None,
-        "due_date": invoice.due_date.isoformat() if invoice.due_date else None,
-        "status": status_value,
+        "invoice_date": invoice.invoice_date,
+        "due_date": invoice.due_date,
+        "status": invoice.status,
         "is_overdue": _is_overdue(invoice),
         "exclude_vat": invoice.exclude_vat,
-        "subtotal": _decimal_to_float(invoice.subtotal),
-        "vat_amount": _decimal_to_float(invoice.vat_amount),
-        "discount_amount": _decimal_to_float(invoice.discount_amount),
-        "total": _decimal_to_float(invoice.total),
+        "subtotal": invoice.subtotal,
+        "vat_amount": invoice.vat_amount,
+        "discount_amount": invoice.discount_amount,
+        "total": invoice.total,
         "total_in_words": invoice.total_in_words,
         "notes": invoice.notes,
         "issued_by": invoice.issued_by,
         "received_by": invoice.received_by,
         "items": [_serialize_item(item) for item in sorted(invoice.items, key=lambda i: i.sort_order or 0)],
-        "created_at": invoice.created_at.isoformat() if invoice.created_at else None,
-        "updated_at": invoice.updated_at.isoformat() if invoice.updated_at else None,
+        "created_at": invoice.created_at,
+        "updated_at": invoice.updated_at,
     }
 
 
+def _invoice_etag(invoice_id: int) -> str | None:
+    """Strong ETag of an invoice's detail, or None if there is no such invoice.
+
+    Covers everything the detail shows: the invoice (items bump its ``updated_at``), its
+    client and series, and today's date, which decides ``is_overdue``.
+    """
+    row = db.session.execute(
+        select(
+            Invoice.updated_at,
+            Client.updated_at,
+            InvoiceSeries.current_number,
+            InvoiceSeries.description,
+            InvoiceSeries.is_active,
+        )
+        .outerjoin(Client, Client.id == Invoice.client_id)
+        .outerjoin(InvoiceSeries, InvoiceSeries.id == Invoice.series_id)
+        .where(Invoice.id == invoice_id)
+    ).first()
+    if row is None:
+        return None
+    return make_etag("invoice", invoice_id, *row, date.today())
+
+
 def _validate_required(payload: dict, keys: Iterable[str]) -> list[str]:
     return [key for key in keys if not payload.get(key)]
 
@@ -220,14 +289,16 @@ def _assign_series_and_number(invoice: Invoice, series: InvoiceSeries):
     db.session.flush()
 
 
-def _set_total_in_words(invoice: Invoice):
+def _amount_in_words(amount) -> str:
     # Use full amount (euros + cents) in words; fall back to integer-only helper on error.
     try:
-        amount = invoice.total if invoice.total is not None else Decimal("0")
-        invoice.total_in_words = amount_to_lithuanian_words(amount)
+        return amount_to_lithuanian_words(amount if amount is not None else Decimal("0"))
     except Exception:
-        integer_total = int(_decimal_to_float(invoice.total))
-        invoice.total_in_words = number_to_words_lt(integer_total)
+        return number_to_words_lt(int(_decimal_to_float(amount)))
+
+
+def _set_total_in_words(invoice: Invoice):
+    invoice.total_in_words = _amount_in_words(invoice.total)
 
 
 def _select_default_bank_account(company: CompanyInfo | None):
@@ -237,12 +308,11 @@ def _select_default_bank_account(company: CompanyInfo | None):
     return default or company.bank_accounts[0]
 
 
-def _invoice_to_pdf_payload(invoice: Invoice) -> dict:
-    company = CompanyInfo.get_singleton()
+def _seller_payload(company: CompanyInfo | None) -> dict:
     bank_account = _select_default_bank_account(company)
-
-    seller = {
+    return {
         "name": company.company_name if company else "",
+        "code": company.registration_code if company else "",
         "tax_id": company.tax_id if company else "",
         "address": company.address if company else "",
         "phone": company.phone if company else "",
@@ -250,6 +320,12 @@ def _invoice_to_pdf_payload(invoice: Invoice) -> dict:
         "bank_account": bank_account.account_number if bank_account else "",
     }
 
+
+def _invoice_to_pdf_payload(invoice: Invoice, seller: dict | None = None) -> dict:
+    # Batch callers pass the seller in so the company is loaded once, not per invoice.
+    if seller is None:
+        seller = _seller_payload(CompanyInfo.get_singleton())
+
     client = invoice.client
     buyer = {
         "company_name": client.company_name if client else "",
@@ -293,37 +369,63 @@ def _invoice_to_pdf_payload(invoice: Invoice) -> dict:
     }
 
 
-def _hydrate_items(invoice: Invoice, items_payload: list[dict]):
+def _parse_item(item: dict, idx: int) -> dict:
+    """Validate one item payload into InvoiceItem column values; raises ValueError."""
+    description = item.get("description")
+    if not description:
+        raise ValueError("Item description is required.")
+    quantity = _safe_decimal(item.get("quantity"), Decimal("1"))
+    unit_price = _safe_decimal(item.get("unit_price"), Decimal("0"))
+    discount_percent = _safe_decimal(item.get("discount_percent"), Decimal("0"))
+    if quantity < 0 or unit_price < 0:
+        raise ValueError("Quantity and unit_price must be non-negative.")
+    if discount_percent < 0 or discount_percent > Decimal("100"):
+        raise ValueError("discount_percent must be between 0 and 100.")
+    sort_order = item.get("sort_order")
+    try:
+        sort_order = int(sort_order) if sort_order is not None else idx
+    except (TypeError, ValueError):
+        sort_order = idx
+    return {
+        "description": description,
+        "quantity": quantity,
+        "unit": item.get("unit") or "vnt",
+        "unit_price": unit_price,
+        "discount_percent": discount_percent,
+        "sort_order": sort_order,
+    }
+
+
+def _parse_items(items_payload) -> list[dict]:
     if not isinstance(items_payload, list):
         raise ValueError("Items must be a list.")
+    return [_parse_item(item, idx) for idx, item in enumerate(items_payload)]
+
+
+def _hydrate_items(invoice: Invoice, items_payload: list[dict]):
+    items = _parse_items(items_payload)
     invoice.items.clear()
-    for idx, item in enumerate(items_payload):
-        description = item.get("description")
-        if not description:
-            raise ValueError("Item description is required.")
-        quantity = _safe_decimal(item.get("quantity"), Decimal("1"))
-        unit_price = _safe_decimal(item.get("unit_price"), Decimal("0"))
-        discount_percent = _safe_decimal(item.get("discount_percent"), Decimal("0"))
-        if quantity < 0 or unit_price < 0:
-            raise ValueError("Quantity and unit_price must be non-negative.")
-        if discount_percent < 0 or discount_percent > Decimal("100"):
-            raise ValueError("discount_percent must be between 0 and 100.")
-        sort_order = item.get("sort_order")
-        try:
-            sort_order = int(sort_order) if sort_order is not None else idx
-        except (TypeError, ValueError):
-            sort_order = idx
-
-        invoice.items.append(
-            InvoiceItem(
-                description=description,
-                quantity=quantity,
-                unit=item.get("unit") or "vnt",
-                unit_price=unit_price,
-                discount_percent=discount_percent,
-                sort_order=sort_order,
-            )
-        )
+    for values in items:
+        invoice.items.append(InvoiceItem(**values))
+
+
+def _compute_totals(items: list[dict], *, vat_rate=None, exclude_vat: bool = False) -> dict:
+    """Invoice money columns for parsed items, matching Invoice.recalculate_totals."""
+    subtotal = gross_total = Decimal("0")
+    for item in items:
+        gross = item["quantity"] * item["unit_price"]
+        gross_total += gross
+        subtotal += gross - gross * (item["discount_percent"] / Decimal("100"))
+    vat_amount = Decimal("0") if exclude_vat else subtotal * _safe_decimal(vat_rate, Decimal("0"))
+    vat_amount = max(vat_amount, Decimal("0"))
+    total = subtotal + vat_amount
+    return {
+        "subtotal": subtotal,
+        "discount_amount": max(gross_total - subtotal, Decimal("0")),
+        "vat_amount": vat_amount,
+        "total": total,
+        "total_in_words": _amount_in_words(total),
+    }
 
 
 def _recalculate_totals(invoice: Invoice, *, vat_rate=None):
@@ -332,8 +434,42 @@ def _recalculate_totals(invoice: Invoice, *, vat_rate=None):
     _set_total_in_words(invoice)
 
 
-def _apply_filters(query, *, status, client_id, series_id, date_from, date_to):
+def _parse_filter_args(args) -> dict:
+    """Keyword arguments for :func:`_apply_filters` from request args; raises ValueError."""
+    status_param = args.get("status")
+    status = _parse_status(status_param) if status_param else None
+    if status_param and status is None:
+        raise ValueError("Invalid status. Allowed: draft, sent, paid, overdue.")
+
+    client_id = args.get("client_id")
+    series_id = args.get("series_id")
+    client_id = int(client_id) if client_id is not None and str(client_id).isdigit() else None
+    series_id = int(series_id) if series_id is not None and str(series_id).isdigit() else None
+
+    date_from_raw = args.get("date_from")
+    date_to_raw = args.get("date_to")
+    date_from = _parse_date(date_from_raw) if date_from_raw else None
+    date_to = _parse_date(date_to_raw) if date_to_raw else None
+    if date_from_raw and date_from is None:
+        raise ValueError("Invalid date_from. Use ISO format (YYYY-MM-DD).")
+    if date_to_raw and date_to is None:
+        raise ValueError("Invalid date_to. Use ISO format (YYYY-MM-DD).")
+
+    return {
+        "status": status,
+        "client_id": client_id,
+        "series_id": series_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "search": args.get("search"),
+    }
+
+
+def _apply_filters(query, *, status, client_id, series_id, date_from, date_to, search=None):
     filters = []
+    search_condition = invoice_search_condition(search)
+    if search_condition is not None:
+        filters.append(search_condition)
     if status:
         filters.append(Invoice.status == status)
     if client_id is not None:
@@ -349,59 +485,146 @@ def _apply_filters(query, *, status, client_id, series_id, date_from, date_to):
     return query, filters
 
 
+def _export_statement(criteria: dict, include_items: bool):
+    """One SELECT over just the exported columns, invoice rows in id order.
+
+    Item rows are joined into the same statement rather than fetched per invoice, so the
+    whole export reads a single snapshot of the database.
+    """
+    columns = [
+        Invoice.id,
+        Invoice.full_invoice_number,
+        InvoiceSeries.series_code,
+        Invoice.invoice_number,
+        Invoice.invoice_date,
+        Invoice.due_date,
+        Invoice.status,
+        Invoice.client_id,
+        Client.company_name,
+        Client.registration_code,
+        Client.vat_code,
+        Invoice.subtotal,
+        Invoice.discount_amount,
+        Invoice.vat_amount,
+        Invoice.total,
+    ]
+    order = [Invoice.id]
+    if include_items:
+        columns += [
+            InvoiceItem.description,
+            InvoiceItem.quantity,
+            InvoiceItem.unit,
+            InvoiceItem.unit_price,
+            InvoiceItem.discount_percent,
+        ]
+        order += [InvoiceItem.sort_order, InvoiceItem.id]
+    statement = (
+        select(*columns)
+        .join(InvoiceSeries, InvoiceSeries.id == Invoice.series_id)
+        .join(Client, Client.id == Invoice.client_id)
+    )
+    if include_items:
+        statement = statement.outerjoin(InvoiceItem, InvoiceItem.invoice_id == Invoice.id)
+    statement, _ = _apply_filters(statement, **criteria)
+    return statement.order_by(*order)
+
+
+def _export_invoice_values(row) -> list:
+    status = row.status.value if isinstance(row.status, InvoiceStatus) else row.status
+    number = row.full_invoice_number or f"{row.series_code} {row.invoice_number}"
+    return [
+        row.id,
+        number,
+        row.series_code,
+        row.invoice_number,
+        row.invoice_date,
+        row.due_date,
+        status,
+        row.client_id,
+        row.company_name,
+        row.registration_code,
+        row.vat_code,
+        row.subtotal,
+        row.discount_amount,
+        row.vat_amount,
+        row.total,
+    ]
+
+
+def _export_item_values(row) -> list:
+    if row.description is None:
+        return [None] * len(EXPORT_ITEM_COLUMNS)
+    gross = (row.quantity or Decimal("0")) * (row.unit_price or Decimal("0"))
+    line_total = gross - gross * (row.discount_percent or Decimal("0")) / 100
+    return [
+        row.description,
+        row.quantity,
+        row.unit,
+        row.unit_price,
+        row.discount_percent,
+        line_total.quantize(Decimal("0.01")),
+    ]
+
+
+def _export_csv(rows, include_items: bool) -> Iterator[str]:
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    header = list(EXPORT_INVOICE_COLUMNS)
+    if include_items:
+        header += [f"item_{column}" for column in EXPORT_ITEM_COLUMNS]
+    writer.writerow(header)
+    for count, row in enumerate(rows, start=1):
+        values = _export_invoice_values(row)
+        if include_items:
+            values += _export_item_values(row)
+        writer.writerow(values)
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _export_ndjson(rows, include_items: bool) -> Iterator[str]:
+    dumps = current_app.json.dumps
+
+    def line(values: list, items: list | None) -> str:
+        record = dict(zip(EXPORT_INVOICE_COLUMNS, values))
+        if items is not None:
+            record["items"] = items
+        # Column order, not sorted keys, so every line reads like the CSV header.
+        return dumps(record, sort_keys=False) + "\n"
+
+    # With items, rows of one invoice are adjacent; only the current invoice is held.
+    current_id, values, items = None, None, None
+    for row in rows:
+        if not include_items:
+            yield line(_export_invoice_values(row), None)
+            continue
+        if row.id != current_id:
+            if values is not None:
+                yield line(values, items)
+            current_id, values, items = row.id, _export_invoice_values(row), []
+        if row.description is not None:
+            items.append(dict(zip(EXPORT_ITEM_COLUMNS, _export_item_values(row))))
+    if values is not None:
+        yield line(values, items)
+
+
 # ------------ routes ------------
 @invoices_bp.get("/")
+@read_only
 def list_invoices():
     args = request.args
 
-    _refresh_overdue_statuses()
-
     limit = _parse_int(args.get("limit"), DEFAULT_LIMIT, minimum=1, maximum=MAX_LIMIT)
     offset = _parse_int(args.get("offset"), 0, minimum=0)
     page = offset // limit + 1 if limit else 1
 
-    status_param = args.get("status")
-    status = _parse_status(status_param) if status_param else None
-    if status_param and status is None:
-        return _error("Invalid status. Allowed: draft, sent, paid, overdue.")
-
-    client_id = args.get("client_id")
-    series_id = args.get("series_id")
-    client_id = int(client_id) if client_id is not None and str(client_id).isdigit() else None
-    series_id = int(series_id) if series_id is not None and str(series_id).isdigit() else None
-
-    date_from_raw = args.get("date_from")
-    date_to_raw = args.get("date_to")
-    date_from = _parse_date(date_from_raw) if date_from_raw else None
-    date_to = _parse_date(date_to_raw) if date_to_raw else None
-    if date_from_raw and date_from is None:
-        return _error("Invalid date_from. Use ISO format (YYYY-MM-DD).")
-    if date_to_raw and date_to is None:
-        return _error("Invalid date_to. Use ISO format (YYYY-MM-DD).")
-
-    base_query = Invoice.query.options(joinedload(Invoice.client), joinedload(Invoice.series))
-    base_query, filters = _apply_filters(
-        base_query, status=status, client_id=client_id, series_id=series_id, date_from=date_from, date_to=date_to
-    )
-
-    total = base_query.count()
-
-    summary_query = db.session.query(
-        func.count(Invoice.id),
-        func.coalesce(func.sum(Invoice.total), 0),
-        func.coalesce(func.sum(case((Invoice.status == InvoiceStatus.PAID, Invoice.total), else_=0)), 0),
-    )
-    if filters:
-        summary_query = summary_query.filter(and_(*filters))
-    invoice_count, total_invoiced, total_paid = summary_query.one()
-    total_invoiced_f = _decimal_to_float(total_invoiced)
-    total_paid_f = _decimal_to_float(total_paid)
-    summary = {
-        "invoice_count": int(invoice_count or 0),
-        "total_invoiced": total_invoiced_f,
-        "total_paid": total_paid_f,
-        "total_unpaid": max(total_invoiced_f - total_paid_f, 0.0),
-    }
+    try:
+        criteria = _parse_filter_args(args)
+    except ValueError as exc:
+        return _error(str(exc))
 
     sort_param = args.get("sort_by", "-date")
     descending = sort_param.startswith("-")
@@ -415,70 +638,142 @@ def list_invoices():
     sort_column = sort_map.get(sort_key)
     if sort_column is None:
         return _error("Invalid sort_by. Allowed: date, number, total, status.")
-    sort_column = sort_column.desc() if descending else sort_column.asc()
 
-    invoices = (
-        base_query.order_by(sort_column, Invoice.id.desc()).offset(offset).limit(limit).all()
-    )
+    cursor_param = args.get("cursor")
+    cursor = None
+    if cursor_param:
+        try:
+            cursor = decode_cursor(cursor_param, sort_param)
+        except ValueError as exc:
+            return _error(str(exc))
+    with_total = _parse_bool(args.get("with_total", "true"))
+
+    # Items and clients are searched too; today's date decides is_overdue.
+    etag = versions_etag("invoices", "invoice_items", "clients", "invoice_series", extra=(date.today(),))
+    cached = not_modified(etag, weak=True)
+    if cached is not None:
+        return cached
+
+    base_query, filters = _apply_filters(invoice_list_select(), **criteria)
+
+    total = None
+    summary = None
+    if with_total:
+        summary_query = db.session.query(
+            func.count(Invoice.id),
+            func.coalesce(func.sum(Invoice.total), 0),
+            func.coalesce(func.sum(case((Invoice.status == InvoiceStatus.PAID, Invoice.total), else_=0)), 0),
+        )
+        if filters:
+            summary_query = summary_query.filter(and_(*filters))
+        invoice_count, total_invoiced, total_paid = summary_query.one()
+        total = int(invoice_count or 0)
+        total_invoiced_f = _decimal_to_float(total_invoiced)
+        total_paid_f = _decimal_to_float(total_paid)
+        summary = {
+            "invoice_count": total,
+            "total_invoiced": total_invoiced_f,
+            "total_paid": total_paid_f,
+            "total_unpaid": max(total_invoiced_f - total_paid_f, 0.0),
+        }
 
-    return jsonify({"invoices": [_serialize_invoice_summary(inv) for inv in invoices], "total": total, "page": page, "summary": summary})
+    page_query = base_query.order_by(*keyset_order(sort_column, Invoice.id, descending=descending))
+    if cursor is not None:
+        cursor_value, cursor_id = cursor
+        page_query = page_query.filter(
+            keyset_condition(sort_column, cursor_value, Invoice.id, cursor_id, descending=descending)
+        )
+        page = None
+    else:
+        page_query = page_query.offset(offset)
+
+    # Fetch one extra row to learn whether another page follows.
+    invoices = db.session.execute(page_query.limit(limit + 1)).all()
+    next_cursor = None
+    if len(invoices) > limit:
+        invoices = invoices[:limit]
+        last = invoices[-1]
+        next_cursor = encode_cursor(sort_param, getattr(last, sort_column.key), last.id)
+
+    response = jsonify(
+        {
+            "invoices": _serialize_invoice_summaries(invoices),
+            "total": total,
+            "page": page,
+            "next_cursor": next_cursor,
+            "summary": summary,
+        }
+    )
+    return with_validators(response, etag, weak=True)
 
 
 @invoices_bp.get("/<int:invoice_id>")
 def get_invoice(invoice_id: int):
-    _refresh_overdue_statuses()
-
+    etag = _invoice_etag(invoice_id)
+    if etag is None:
+        abort(404)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
     invoice = Invoice.query.options(
         joinedload(Invoice.items), joinedload(Invoice.client), joinedload(Invoice.series)
     ).get_or_404(invoice_id)
-    return jsonify(_serialize_invoice_full(invoice))
-
-
-@invoices_bp.post("/")
-def create_invoice():
-    payload = request.get_json(force=True) or {}
-    missing = _validate_required(payload, ["client_id", "series_id"])
-    if missing:
-        return _error(f"Missing required fields: {', '.join(missing)}.")
-
-    client = Client.query.get(payload.get("client_id"))
-    if client is None:
-        return _error("Client not found.", 404)
+    return with_validators(jsonify(_serialize_invoice_full(invoice)), etag)
 
-    series = InvoiceSeries.query.get(payload.get("series_id"))
-    if series is None:
-        return _error("Series not found.", 404)
 
+def _parse_new_invoice_fields(payload: dict) -> dict:
+    """Dates, status and flags of a new invoice payload; raises ValueError."""
     invoice_date_raw = payload.get("invoice_date")
     invoice_date = _parse_date(invoice_date_raw)
     if invoice_date_raw and invoice_date is None:
-        return _error("Invalid invoice_date. Use ISO format (YYYY-MM-DD).")
+        raise ValueError("Invalid invoice_date. Use ISO format (YYYY-MM-DD).")
     if invoice_date is None:
         invoice_date = date.today()
 
     due_date_raw = payload.get("due_date")
     due_date = _parse_date(due_date_raw)
     if due_date_raw and due_date is None:
-        return _error("Invalid due_date. Use ISO format (YYYY-MM-DD).")
+        raise ValueError("Invalid due_date. Use ISO format (YYYY-MM-DD).")
     if due_date is None:
         due_date = invoice_date
     if due_date < invoice_date:
-        return _error("Due date cannot be earlier than invoice date.")
+        raise ValueError("Due date cannot be earlier than invoice date.")
 
     status_param = payload.get("status")
     status = _parse_status(status_param) if status_param else InvoiceStatus.DRAFT
     if status_param and status is None:
-        return _error("Invalid status. Allowed: draft, sent, paid, overdue.")
+        raise ValueError("Invalid status. Allowed: draft, sent, paid, overdue.")
 
-    invoice = Invoice(
-        client=client,
-        series=series,
-        invoice_date=invoice_date,
-        due_date=due_date,
-        status=status,
-        notes=payload.get("notes"),
-        exclude_vat=_parse_bool(payload.get("exclude_vat")),
-    )
+    return {
+        "invoice_date": invoice_date,
+        "due_date": due_date,
+        "status": status,
+        "notes": payload.get("notes"),
+        "exclude_vat": _parse_bool(payload.get("exclude_vat")),
+    }
+
+
+@invoices_bp.post("/")
+def create_invoice():
+    payload = request.get_json(force=True) or {}
+    missing = _validate_required(payload, ["client_id", "series_id"])
+    if missing:
+        return _error(f"Missing required fields: {', '.join(missing)}.")
+
+    client = Client.query.get(payload.get("client_id"))
+    if client is None:
+        return _error("Client not found.", 404)
+
+    series = InvoiceSeries.query.get(payload.get("series_id"))
+    if series is None:
+        return _error("Series not found.", 404)
+
+    try:
+        fields = _parse_new_invoice_fields(payload)
+    except ValueError as exc:
+        return _error(str(exc))
+
+    invoice = Invoice(client=client, series=series, **fields)
 
     try:
         _assign_series_and_number(invoice, series)
@@ -496,6 +791,128 @@ def create_invoice():
     return jsonify(_serialize_invoice_full(invoice)), 201
 
 
+def _parse_id(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _prepare_bulk_entry(entry, clients: set[int], series: dict[int, InvoiceSeries]) -> dict:
+    """Validate one bulk payload into invoice column values plus its items; raises ValueError."""
+    if not isinstance(entry, dict):
+        raise ValueError("Each invoice must be an object.")
+    missing = _validate_required(entry, ["client_id", "series_id"])
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}.")
+    client_id = _parse_id(entry.get("client_id"))
+    if client_id not in clients:
+        raise ValueError("Client not found.")
+    series_id = _parse_id(entry.get("series_id"))
+    if series_id not in series:
+        raise ValueError("Series not found.")
+
+    fields = _parse_new_invoice_fields(entry)
+    items = _parse_items(entry.get("items") or [])
+    totals = _compute_totals(items, vat_rate=entry.get("vat_rate"), exclude_vat=fields["exclude_vat"])
+    return {"row": {"client_id": client_id, "series_id": series_id, **fields, **totals}, "items": items}
+
+
+def _insert_bulk_rows(connection, rows: list[dict], items: list[list[dict]], first_numbers: dict[int, int]) -> list[int]:
+    """Insert numbered invoice rows and their items with executemany; returns the new ids in row order."""
+    invoices_table = Invoice.__table__
+    connection.execute(invoices_table.insert(), rows)
+    # (series_id, invoice_number) is unique, so the new ids are read back by number;
+    # RETURNING with executemany would force SQLite into one statement per row.
+    counts = Counter(row["series_id"] for row in rows)
+    id_by_number = {}
+    for series_id, first in first_numbers.items():
+        numbered = connection.execute(
+            select(invoices_table.c.id, invoices_table.c.invoice_number).where(
+                invoices_table.c.series_id == series_id,
+                invoices_table.c.invoice_number.between(first, first + counts[series_id] - 1),
+            )
+        )
+        id_by_number.update(((series_id, number), invoice_id) for invoice_id, number in numbered)
+    ids = [id_by_number[(row["series_id"], row["invoice_number"])] for row in rows]
+
+    item_rows = [
+        {"invoice_id": invoice_id, **item} for invoice_id, invoice_items in zip(ids, items) for item in invoice_items
+    ]
+    if item_rows:
+        connection.execute(InvoiceItem.__table__.insert(), item_rows)
+    return ids
+
+
+@invoices_bp.post("/bulk")
+def bulk_create_invoices():
+    """Create many invoices in one transaction; nothing is written if any entry is invalid."""
+    payload = request.get_json(force=True)
+    entries = payload.get("invoices") if isinstance(payload, dict) else payload
+    if not isinstance(entries, list) or not entries:
+        return _error("Provide a non-empty list of invoices.")
+    if len(entries) > MAX_BULK_INVOICES:
+        return _error(f"At most {MAX_BULK_INVOICES} invoices per request.")
+
+    # One query each for every referenced client and series instead of one per invoice.
+    client_ids = {_parse_id(entry.get("client_id")) for entry in entries if isinstance(entry, dict)}
+    series_ids = {_parse_id(entry.get("series_id")) for entry in entries if isinstance(entry, dict)}
+    clients = set(db.session.scalars(select(Client.id).where(Client.id.in_(client_ids - {None}))))
+    series = {s.id: s for s in InvoiceSeries.query.filter(InvoiceSeries.id.in_(series_ids - {None}))}
+
+    prepared, errors = [], []
+    for index, entry in enumerate(entries):
+        try:
+            prepared.append(_prepare_bulk_entry(entry, clients, series))
+        except ValueError as exc:
+            errors.append({"index": index, "error": str(exc)})
+    if errors:
+        return jsonify({"error": "No invoices were created; fix the listed entries.", "errors": errors}), 400
+
+    try:
+        # Each series hands out one contiguous block, assigned in request order.
+        counts = Counter(entry["row"]["series_id"] for entry in prepared)
+        first_numbers = {series_id: InvoiceSeries.reserve_numbers(series_id, n) for series_id, n in counts.items()}
+        next_numbers = dict(first_numbers)
+        rows = []
+        for entry in prepared:
+            row = entry["row"]
+            number = next_numbers[row["series_id"]]
+            next_numbers[row["series_id"]] += 1
+            row["invoice_number"] = number
+            row["full_invoice_number"] = series[row["series_id"]].format_full_number(number)
+            rows.append(row)
+
+        connection = db.session.connection()
+        with deferred_invoice_indexing(connection) as indexed_ids:
+            ids = _insert_bulk_rows(connection, rows, [entry["items"] for entry in prepared], first_numbers)
+            indexed_ids.extend(ids)
+        # Core inserts bypass the ORM flush hooks, so move the aggregates explicitly.
+        apply_invoice_changes(
+            connection,
+            [],
+            [InvoiceFact(row["client_id"], row["invoice_date"], row["status"], row["total"]) for row in rows],
+        )
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return _error("Invoice number already in use; check the series counters.", 409)
+    except Exception:
+        db.session.rollback()
+        raise
+
+    created = [
+        {
+            "index": index,
+            "id": invoice_id,
+            "invoice_number": row["invoice_number"],
+            "full_invoice_number": row["full_invoice_number"],
+        }
+        for index, (invoice_id, row) in enumerate(zip(ids, rows))
+    ]
+    return jsonify({"created": len(created), "invoices": created}), 201
+
+
 @invoices_bp.put("/<int:invoice_id>")
 def update_invoice(invoice_id: int):
     invoice = Invoice.query.options(joinedload(Invoice.items)).get_or_404(invoice_id)
@@ -576,7 +993,8 @@ def _allowed_transition(current: InvoiceStatus, target: InvoiceStatus) -> bool:
     if current == target:
         return False
     if target == InvoiceStatus.OVERDUE:
-        return True
+        # Only issued invoices fall due; a draft keeps its releasable number.
+        return current != InvoiceStatus.DRAFT
     if current == InvoiceStatus.DRAFT and target == InvoiceStatus.SENT:
         return True
     if current == InvoiceStatus.SENT and target == InvoiceStatus.PAID:
@@ -609,12 +1027,102 @@ def invoice_pdf(invoice_id: int):
             joinedload(Invoice.series),
         ).get_or_404(invoice_id)
     )
-    pdf_bytes = generate_invoice_pdf(_invoice_to_pdf_payload(invoice))
-    return send_file(
-        BytesIO(pdf_bytes),
-        mimetype="application/pdf",
-        download_name=f"invoice-{invoice.number}.pdf",
+    payload = _invoice_to_pdf_payload(invoice)
+    # The payload's content address identifies the PDF: a match skips rendering entirely.
+    etag = payload_key(payload)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    if len(payload["items"]) > INLINE_PDF_MAX_ITEMS:
+        pdf = render_pdf(payload, get_pool(), get_pdf_cache())
+    else:
+        pdf = open_cached_pdf(payload)
+    response = send_file(pdf, mimetype="application/pdf", download_name=f"invoice-{invoice.number}.pdf")
+    response.content_length = os.fstat(pdf.fileno()).st_size
+    return with_validators(response, etag)
+
+
+@invoices_bp.post("/<int:invoice_id>/pdf/jobs")
+def create_pdf_job(invoice_id: int):
+    """Render the invoice PDF in the background; poll ``/api/pdf-jobs/<id>`` for the result."""
+    invoice = (
+        Invoice.query.options(
+            joinedload(Invoice.items),
+            joinedload(Invoice.client),
+            joinedload(Invoice.series),
+        ).get_or_404(invoice_id)
     )
+    job = get_pdf_jobs().submit(invoice.id, _invoice_to_pdf_payload(invoice), f"invoice-{invoice.number}.pdf")
+    if job is None:
+        response = jsonify({"error": "Too many PDFs are being rendered. Try again shortly."})
+        response.headers["Retry-After"] = "5"
+        return response, 503
+    response = jsonify(job.to_dict())
+    response.headers["Location"] = f"/api/pdf-jobs/{job.id}"
+    return response, 202
+
+
+@invoices_bp.post("/pdf/batch")
+def batch_invoice_pdfs():
+    """Stream a ZIP with the PDFs of the given ids or of every invoice matching the filters."""
+    payload = request.get_json(silent=True) or {}
+    if not isinstance(payload, dict):
+        return _error("Expected a JSON object with ids or filters.")
+
+    query = Invoice.query
+    ids = payload.get("ids")
+    if ids is not None:
+        if not isinstance(ids, list) or not ids:
+            return _error("ids must be a non-empty list of invoice ids.")
+        if len(ids) > MAX_BATCH_PDF_IDS:
+            return _error(f"At most {MAX_BATCH_PDF_IDS} ids per request; use filters for larger exports.")
+        parsed_ids = {_parse_id(value) for value in ids}
+        if None in parsed_ids:
+            return _error("ids must be a non-empty list of invoice ids.")
+        query = query.filter(Invoice.id.in_(parsed_ids))
+    else:
+        try:
+            criteria = _parse_filter_args(payload)
+        except ValueError as exc:
+            return _error(str(exc))
+        query, filters = _apply_filters(query, **criteria)
+        if not filters:
+            return _error("Provide ids or at least one filter (status, client_id, series_id, date_from, date_to, search).")
+
+    if not query.count():
+        return _error("No invoices match.", 404)
+
+    seller = _seller_payload(CompanyInfo.get_singleton())
+    pool = get_pool()
+
+    def documents():
+        # The view's session is closed once it returns, before the archive streams; reading
+        # through it would reopen it where nothing closes it again. The streaming context's
+        # own session is removed when the archive ends.
+        invoices = (
+            query.with_session(db.session())
+            .options(selectinload(Invoice.items), joinedload(Invoice.client), joinedload(Invoice.series))
+            .order_by(Invoice.id)
+            .yield_per(BATCH_PDF_FETCH_SIZE)
+        )
+        for invoice in invoices:
+            yield archive_name(invoice.number, invoice.id), _invoice_to_pdf_payload(invoice, seller)
+
+    archive = stream_pdf_archive(documents(), pool, window=2 * pool_size(), cache=get_pdf_cache())
+    return Response(
+        stream_with_context(archive),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=invoices-{date.today().isoformat()}.zip"},
+    )
+
+
+@invoices_bp.get("/pdf/cache")
+def pdf_cache_stats():
+    """Hit and miss counters of this worker's PDF cache, plus its size on disk."""
+    cache = get_pdf_cache()
+    if cache is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **cache.stats()})
 
 
 @invoices_bp.post("/<int:invoice_id>/duplicate")
@@ -666,10 +1174,41 @@ def duplicate_invoice(invoice_id: int):
     return jsonify(_serialize_invoice_full(duplicate)), 201
 
 
+@invoices_bp.get("/export")
+@read_only
+def export_invoices():
+    """Stream every invoice matching the list filters as CSV or NDJSON.
+
+    Accepts the filters of the invoice list plus ``format`` (csv, ndjson) and
+    ``include_items``: one CSV row per item, or an ``items`` array per NDJSON line.
+    """
+    args = request.args
+    export_format = (args.get("format") or "csv").lower()
+    if export_format not in EXPORT_FORMATS:
+        return _error("Invalid format. Allowed: csv, ndjson.")
+    try:
+        criteria = _parse_filter_args(args)
+    except ValueError as exc:
+        return _error(str(exc))
+    include_items = _parse_bool(args.get("include_items"))
+
+    statement = _export_statement(criteria, include_items)
+    # yield_per streams rows off the cursor in batches; nothing is loaded into the session.
+    rows = db.session.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    body = _export_csv(rows, include_items) if export_format == "csv" else _export_ndjson(rows, include_items)
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename=invoices-{date.today().isoformat()}.{export_format}"
+        },
+    )
+
+
 @invoices_bp.get("/next-number/<int:series_id>")
 def next_number(series_id: int):
     series = InvoiceSeries.query.get_or_404(series_id)
-    next_no = (series.current_number or 0) + 1
+    next_no = series.peek_next_number()
     return jsonify(
         {
             "series_code": series.series_code,
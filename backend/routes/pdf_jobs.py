@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import os
+
+from flask import Blueprint, jsonify, send_file
+
+from backend.services.pdf_jobs import DONE, get_pdf_jobs
+
+pdf_jobs_bp = Blueprint("pdf_jobs", __name__, url_prefix="/api/pdf-jobs")
+
+
+# ------------- helpers -------------
+def _error(message: str, status_code: int = 400):
+    return jsonify({"error": message}), status_code
+
+
+# ------------- routes -------------
+@pdf_jobs_bp.get("/<job_id>")
+def get_job(job_id: str):
+    job = get_pdf_jobs().get(job_id)
+    if job is None:
+        return _error("PDF job not found or expired.", 404)
+    return jsonify(job.to_dict())
+
+
+@pdf_jobs_bp.get("/<job_id>/pdf")
+def job_pdf(job_id: str):
+    jobs = get_pdf_jobs()
+    job = jobs.get(job_id)
+    if job is None:
+        return _error("PDF job not found or expired.", 404)
+    if job.status != DONE:
+        return _error(f"PDF job is {job.state}.", 409)
+    try:
+        handle = open(jobs.result_path(job.id), "rb")
+    except FileNotFoundError:
+        return _error("PDF job not found or expired.", 404)
+    response = send_file(handle, mimetype="application/pdf", download_name=job.download_name)
+    response.content_length = os.fstat(handle.fileno()).st_size
+    return response
+
+
+@pdf_jobs_bp.delete("/<job_id>")
+def cancel_job(job_id: str):
+    job = get_pdf_jobs().cancel(job_id)
+    if job is None:
+        return _error("PDF job not found or expired.", 404)
+    return jsonify(job.to_dict())
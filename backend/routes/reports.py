@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from sqlalchemy import select
+
+from backend.database import db, read_only
+from backend.models import Client, CompanyInfo, Invoice, InvoiceSeries, InvoiceStatus, Setting
+from backend.services.isaf import ISAF_FLUSH_EVERY, ZERO_RATE_SETTING, stream_isaf
+
+reports_bp = Blueprint("reports", __name__, url_prefix="/api/reports")
+
+
+def _error(message: str, status_code: int = 400):
+    return jsonify({"error": message}), status_code
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)).date()
+    except ValueError:
+        return None
+
+
+def _isaf_statement(start: date, end: date):
+    """Issued invoices of the period, just the columns the register needs, in date order."""
+    return (
+        select(
+            Invoice.full_invoice_number,
+            InvoiceSeries.series_code,
+            Invoice.invoice_number,
+            Invoice.invoice_date,
+            Invoice.exclude_vat,
+            Invoice.subtotal,
+            Invoice.vat_amount,
+            Invoice.client_id,
+            Client.company_name,
+            Client.registration_code,
+            Client.vat_code,
+        )
+        .join(InvoiceSeries, InvoiceSeries.id == Invoice.series_id)
+        .join(Client, Client.id == Invoice.client_id)
+        .where(
+            Invoice.status != InvoiceStatus.DRAFT,
+            Invoice.invoice_date >= start,
+            Invoice.invoice_date <= end,
+        )
+        .order_by(Invoice.invoice_date, Invoice.id)
+    )
+
+
+def _has_zero_rated(start: date, end: date) -> bool:
+    """Whether the period's register holds an invoice charged VAT at 0%."""
+    zero_rated = (
+        _isaf_statement(start, end)
+        .with_only_columns(Invoice.id)
+        .where(Invoice.exclude_vat.is_(False), Invoice.subtotal != 0, Invoice.vat_amount == 0)
+        .order_by(None)
+        .limit(1)
+    )
+    return db.session.execute(zero_rated).first() is not None
+
+
+@reports_bp.get("/isaf")
+@read_only
+def isaf_report():
+    """Stream the i.SAF register of invoices issued between ``from`` and ``to`` (inclusive)."""
+    start = _parse_date(request.args.get("from"))
+    end = _parse_date(request.args.get("to"))
+    if start is None or end is None:
+        return _error("Both from and to are required (YYYY-MM-DD).")
+    if start > end:
+        return _error("from must not be after to.")
+
+    company = CompanyInfo.get_singleton()
+    if company is None:
+        return _error("Company details are not set.", 409)
+    if not company.registration_code:
+        return _error("Set the company registration code in the settings first.", 409)
+    # Checked up front: a streamed register cannot turn into an error halfway through.
+    zero_rate_code = Setting.get_value(ZERO_RATE_SETTING)
+    if not zero_rate_code and _has_zero_rated(start, end):
+        return _error(
+            f"The period has zero-rated invoices; set their i.SAF tax code (e.g. PVM5 or PVM12) "
+            f"as the '{ZERO_RATE_SETTING}' general setting first.",
+            409,
+        )
+
+    # yield_per streams rows off the cursor in batches; nothing is loaded into the session.
+    rows = db.session.execute(_isaf_statement(start, end).execution_options(yield_per=ISAF_FLUSH_EVERY))
+    body = stream_isaf(
+        rows, registration_number=company.registration_code, start=start, end=end, zero_rate_code=zero_rate_code
+    )
+    return Response(
+        stream_with_context(body),
+        mimetype="application/xml",
+        headers={"Content-Disposition": f"attachment; filename=isaf-{start.isoformat()}-{end.isoformat()}.xml"},
+    )
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from flask import Blueprint, jsonify, request
+from sqlalchemy import select
 
 from backend.database import db
 from backend.models import BankAccount, CompanyInfo, InvoiceSeries, Setting
+from backend.services.http_cache import make_etag, not_modified, versions_etag, with_validators
 
 settings_bp = Blueprint("settings", __name__, url_prefix="/api/settings")
 
@@ -30,12 +32,13 @@ def _company_to_dict(company: CompanyInfo) -> dict:
     return {
         "id": company.id,
         "company_name": company.company_name,
+        "registration_code": company.registration_code,
         "tax_id": company.tax_id,
         "address": company.address,
         "phone": company.phone,
         "email": company.email,
-        "created_at": company.created_at.isoformat() if company.created_at else None,
-        "updated_at": company.updated_at.isoformat() if company.updated_at else None,
+        "created_at": company.created_at,
+        "updated_at": company.updated_at,
     }
 
 
@@ -46,7 +49,7 @@ def _bank_to_dict(account: BankAccount) -> dict:
         "account_number": account.account_number,
         "is_default": account.is_default,
         "company_id": account.company_id,
-        "created_at": account.created_at.isoformat() if account.created_at else None,
+        "created_at": account.created_at,
     }
 
 
@@ -63,10 +66,16 @@ def _series_to_dict(series: InvoiceSeries) -> dict:
 # ------------- company info -------------
 @settings_bp.get("/company")
 def get_company():
+    version = db.session.execute(select(CompanyInfo.id, CompanyInfo.updated_at).limit(1)).first()
+    etag = make_etag("company", *(version or ()))
+    last_modified = version.updated_at if version else None
+    cached = not_modified(etag, last_modified=last_modified)
+    if cached is not None:
+        return cached
+
     company = CompanyInfo.get_singleton()
-    if not company:
-        return jsonify({})
-    return jsonify(_company_to_dict(company))
+    payload = _company_to_dict(company) if company else {}
+    return with_validators(jsonify(payload), etag, last_modified=last_modified)
 
 
 @settings_bp.put("/company")
@@ -83,6 +92,7 @@ def update_company():
         db.session.add(company)
 
     company.company_name = payload.get("company_name")
+    company.registration_code = (payload.get("registration_code") or "").strip() or None
     company.tax_id = payload.get("tax_id")
     company.address = payload.get("address")
     company.phone = payload.get("phone")
@@ -95,10 +105,14 @@ def update_company():
 # ------------- bank accounts -------------
 @settings_bp.get("/bank-accounts")
 def list_bank_accounts():
+    etag = versions_etag("bank_accounts")
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
     accounts = (
         BankAccount.query.order_by(BankAccount.is_default.desc(), BankAccount.id.asc()).all()
     )
-    return jsonify([_bank_to_dict(acc) for acc in accounts])
+    return with_validators(jsonify([_bank_to_dict(acc) for acc in accounts]), etag)
 
 
 @settings_bp.post("/bank-accounts")
@@ -180,8 +194,12 @@ def delete_bank_account(account_id: int):
 # ------------- invoice series -------------
 @settings_bp.get("/series")
 def list_series():
+    etag = versions_etag("invoice_series")
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
     series_list = InvoiceSeries.query.order_by(InvoiceSeries.series_code.asc()).all()
-    return jsonify([_series_to_dict(series) for series in series_list])
+    return with_validators(jsonify([_series_to_dict(series) for series in series_list]), etag)
 
 
 @settings_bp.post("/series")
@@ -228,8 +246,12 @@ def update_series(series_id: int):
 # ------------- general settings -------------
 @settings_bp.get("/general")
 def get_general_settings():
+    etag = versions_etag("settings")
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
     settings = Setting.query.all()
-    return jsonify({setting.key: setting.value for setting in settings})
+    return with_validators(jsonify({setting.key: setting.value for setting in settings}), etag)
 
 
 @settings_bp.put("/general")
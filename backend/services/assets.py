@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import shutil
+from pathlib import Path
+
+import click
+from flask import Flask, current_app, request, send_file, send_from_directory
+from flask.cli import AppGroup
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # optional: without it the build writes gzip variants only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+_EXTENSION_KEY = "assets"
+MANIFEST = "manifest.json"
+# Source directories whose files get content-hashed names; pages stay at their own URL.
+ASSET_DIRS = ("css", "js", "assets")
+ASSET_SUFFIXES = {".css", ".js", ".png", ".svg", ".ico", ".webp", ".woff2"}
+# Only text compresses; images are already compressed.
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".svg", ".html"}
+SKIPPED_FILES = {"css/input.css"}
+# Hashed names never change content, so browsers may keep them for a year unasked.
+IMMUTABLE = "public, max-age=31536000, immutable"
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+_REFERENCE = re.compile(r'(\b(?:href|src)=")([^"?#]+)(")')
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _source_files(source: Path) -> list[str]:
+    files = [path.relative_to(source).as_posix() for path in source.glob("*.html")]
+    for directory in ASSET_DIRS:
+        for path in (source / directory).rglob("*"):
+            name = path.relative_to(source).as_posix()
+            if path.is_file() and path.suffix in ASSET_SUFFIXES and name not in SKIPPED_FILES:
+                files.append(name)
+    return sorted(files)
+
+
+def _write_variants(path: Path, data: bytes) -> list[str]:
+    """Write ``path`` plus the precompressed copies that come out smaller than it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    if path.suffix not in COMPRESSIBLE_SUFFIXES:
+        return []
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=11)
+    written = []
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(data):
+            path.with_name(path.name + suffix).write_bytes(compressed)
+            written.append(suffix)
+    return written
+
+
+def build_assets(source: str | os.PathLike, output: str | os.PathLike) -> dict:
+    """Fingerprint, precompress and link the frontend in ``source`` into ``output``.
+
+    Assets are copied to names carrying a hash of their content and the HTML pages are
+    rewritten to reference those names. ``output`` is replaced as a whole, and the
+    manifest is written last, so a half-finished build is never served.
+    """
+    source, output = Path(source), Path(output)
+    if output.exists():
+        shutil.rmtree(output)
+    sources = {}
+    files = {}
+    encodings = {}
+    pages = []
+    for name in _source_files(source):
+        data = (source / name).read_bytes()
+        sources[name] = _digest(data)
+        if name.endswith(".html"):
+            pages.append((name, data))
+            continue
+        path = Path(name)
+        hashed = path.with_name(f"{path.stem}.{sources[name][:10]}{path.suffix}").as_posix()
+        files[name] = hashed
+        encodings[hashed] = _write_variants(output / hashed, data)
+
+    def link(match: re.Match) -> str:
+        return match.group(1) + files.get(match.group(2), match.group(2)) + match.group(3)
+
+    for name, data in pages:
+        html = _REFERENCE.sub(link, data.decode("utf-8"))
+        encodings[name] = _write_variants(output / name, html.encode("utf-8"))
+
+    manifest = {"sources": sources, "files": files, "encodings": encodings}
+    (output / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return manifest
+
+
+def load_manifest(source: str | os.PathLike, output: str | os.PathLike) -> dict | None:
+    """The build's manifest, or None when there is no build or its sources have changed."""
+    source, output = Path(source), Path(output)
+    try:
+        manifest = json.loads((output / MANIFEST).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    current = {name: _digest((source / name).read_bytes()) for name in _source_files(source)}
+    if current != manifest.get("sources"):
+        logger.warning("The frontend build in %s is out of date; serving the sources instead.", output)
+        return None
+    return manifest
+
+
+def _accepted_variant(manifest: dict, filename: str) -> tuple[str | None, str]:
+    accepted = request.accept_encodings
+    for encoding, suffix in _ENCODINGS:
+        if suffix in manifest["encodings"].get(filename, ()) and accepted[encoding]:
+            return encoding, filename + suffix
+    return None, filename
+
+
+def send_built_file(filename: str):
+    """Serve ``filename`` from the build, precompressed when the client accepts it."""
+    manifest = current_app.extensions[_EXTENSION_KEY]
+    directory = current_app.static_folder
+    if filename not in manifest["encodings"] or safe_join(directory, filename) is None:
+        raise NotFound()
+    encoding, variant = _accepted_variant(manifest, filename)
+    response = send_file(
+        os.path.join(directory, variant),
+        mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        conditional=True,
+    )
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    if manifest["encodings"][filename]:
+        response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = IMMUTABLE if filename in manifest["hashed"] else "no-cache"
+    return response
+
+
+def init_assets(app: Flask) -> dict | None:
+    """Register the CLI and serve the built frontend when an up-to-date build exists.
+
+    Without a build (or with a stale one) the sources are served as they are, which keeps
+    editing the frontend during development free of build steps.
+    """
+    app.cli.add_command(assets_cli)
+    source = Path(app.static_folder)
+    output = Path(app.config.get("ASSETS_BUILD_DIR") or source.parent / "build" / "frontend")
+    app.config["ASSETS_SOURCE_DIR"] = str(source)
+    app.config["ASSETS_BUILD_DIR"] = str(output)
+    manifest = load_manifest(source, output)
+    if manifest is None:
+        return None
+    manifest["hashed"] = set(manifest["files"].values())
+    app.extensions[_EXTENSION_KEY] = manifest
+    app.static_folder = str(output)
+    app.view_functions["static"] = send_built_file
+    return manifest
+
+
+def send_page(filename: str):
+    """Serve an HTML page, from the build when the app serves one."""
+    if _EXTENSION_KEY in current_app.extensions:
+        return send_built_file(filename)
+    return send_from_directory(current_app.static_folder, filename)
+
+
+assets_cli = AppGroup("assets", help="Production frontend build.")
+
+
+@assets_cli.command("build")
+def build_command():
+    """Fingerprint and precompress the frontend into the build directory."""
+    manifest = build_assets(current_app.config["ASSETS_SOURCE_DIR"], current_app.config["ASSETS_BUILD_DIR"])
+    compressed = sum(1 for suffixes in manifest["encodings"].values() if suffixes)
+    click.echo(
+        f"Built {len(manifest['encodings'])} file(s) into {current_app.config['ASSETS_BUILD_DIR']}, "
+        f"{compressed} precompressed" + ("" if brotli is not None else " (gzip only; brotli is not installed)") + "."
+    )
+
+
+@assets_cli.command("clean")
+def clean_command():
+    """Delete the build so the frontend sources are served again."""
+    shutil.rmtree(current_app.config["ASSETS_BUILD_DIR"], ignore_errors=True)
+    click.echo("Removed the frontend build.")
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import secrets
+from datetime import datetime
+
+from flask import Flask, current_app, request
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from werkzeug.http import is_resource_modified
+
+from backend.database import db
+
+logger = logging.getLogger(__name__)
+
+_EXTENSION_KEY = "change_counters"
+CHANGE_COUNTERS = "change_counters"
+# Tables whose every INSERT, UPDATE and DELETE bumps their counter.
+TRACKED_TABLES = (
+    "bank_accounts",
+    "client_stats",
+    "clients",
+    "company_info",
+    "invoice_items",
+    "invoice_series",
+    "invoices",
+    "monthly_revenue",
+    "settings",
+)
+
+_COUNTERS_TABLE = f"""
+CREATE TABLE IF NOT EXISTS {CHANGE_COUNTERS} (
+    table_name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL
+)
+"""
+
+_COUNTERS_SEED = f"""
+INSERT INTO {CHANGE_COUNTERS} (table_name, version) VALUES (:table, :version)
+ON CONFLICT (table_name) DO NOTHING
+"""
+
+_COUNTER_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} AFTER {operation} ON {table} BEGIN
+    UPDATE {counters} SET version = version + 1 WHERE table_name = '{table}';
+END
+"""
+
+_OPERATIONS = {"ai": "INSERT", "au": "UPDATE", "ad": "DELETE"}
+
+# PostgreSQL: one statement-level trigger per table calling a shared function.
+_PG_COUNTER_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION bump_change_counter() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE {CHANGE_COUNTERS} SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+    RETURN NULL;
+END
+$$
+"""
+
+_PG_COUNTER_TRIGGER = """
+CREATE OR REPLACE TRIGGER {table}_version AFTER INSERT OR UPDATE OR DELETE ON {table}
+FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter()
+"""
+
+
+def _counter_triggers(dialect: str) -> list[str]:
+    if dialect == "postgresql":
+        return [_PG_COUNTER_FUNCTION, *(_PG_COUNTER_TRIGGER.format(table=table) for table in TRACKED_TABLES)]
+    return [
+        _COUNTER_TRIGGER.format(table=table, suffix=suffix, operation=operation, counters=CHANGE_COUNTERS)
+        for table in TRACKED_TABLES
+        for suffix, operation in _OPERATIONS.items()
+    ]
+
+
+def install_change_counters(engine) -> bool:
+    """Create the per-table change counters and the triggers that bump them.
+
+    Counters start at a random value, so a recreated database does not hand out versions
+    a browser has already cached. SQLite and PostgreSQL (14 or later) are supported;
+    on PostgreSQL a statement that changes no rows still bumps the counter, which only
+    costs clients a full response. Other databases go without; their collection
+    responses simply carry no ETag.
+    """
+    if engine.dialect.name not in ("sqlite", "postgresql"):
+        return False
+    try:
+        with engine.begin() as connection:
+            connection.execute(text(_COUNTERS_TABLE))
+            connection.execute(
+                text(_COUNTERS_SEED),
+                [{"table": table, "version": secrets.randbits(31)} for table in TRACKED_TABLES],
+            )
+            for ddl in _counter_triggers(engine.dialect.name):
+                connection.execute(text(ddl))
+    except (OperationalError, ProgrammingError):
+        logger.warning("Could not create the table change counters; collection ETags are off.", exc_info=True)
+        return False
+    return True
+
+
+def init_http_cache(app: Flask) -> bool:
+    """Install the change counters behind the collection ETags of the app's database."""
+    with app.app_context():
+        available = install_change_counters(db.engine)
+    app.extensions[_EXTENSION_KEY] = available
+    return available
+
+
+def table_versions(*tables: str) -> tuple | None:
+    """Current change counters of ``tables``, or None when the database has none."""
+    if not current_app.extensions.get(_EXTENSION_KEY):
+        return None
+    statement = text(
+        f"SELECT table_name, version FROM {CHANGE_COUNTERS} WHERE table_name IN :tables"
+    ).bindparams(bindparam("tables", expanding=True))
+    versions = dict(db.session.execute(statement, {"tables": list(tables)}).all())
+    return tuple(versions.get(table) for table in tables)
+
+
+def make_etag(*parts) -> str:
+    """An opaque validator for a response determined entirely by ``parts``."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def versions_etag(*tables: str, extra: tuple = ()) -> str | None:
+    """ETag of a response built only from ``tables`` (and ``extra``); None without counters."""
+    versions = table_versions(*tables)
+    if versions is None:
+        return None
+    return make_etag(*tables, *versions, *extra)
+
+
+def not_modified(etag: str | None, *, weak: bool = False, last_modified: datetime | None = None):
+    """A 304 response when the request's validators still match, otherwise None.
+
+    Compute the ETag before reading the data it describes: a write landing in between
+    then only costs the client one more full response, never a stale one.
+    """
+    if etag is None or is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+    return with_validators(current_app.response_class(status=304), etag, weak=weak, last_modified=last_modified)
+
+
+def with_validators(response, etag: str | None, *, weak: bool = False, last_modified: datetime | None = None):
+    """Attach the ETag (and Last-Modified) and make clients revalidate before reusing it."""
+    if etag is None:
+        return response
+    response.set_etag(etag, weak=weak)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers["Cache-Control"] = "no-cache"
+    return response
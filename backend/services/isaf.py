@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal
+from io import StringIO
+from typing import Iterable, Iterator
+from xml.sax.saxutils import XMLGenerator
+
+ISAF_NAMESPACE = "http://www.vmi.lt/cms/imas/isaf"
+XSI_NAMESPACE = "http://www.w3.org/2001/XMLSchema-instance"
+FILE_VERSION = "iSAF1.2"
+SOFTWARE_NAME = "Sąskaitininkas"
+SOFTWARE_VERSION = "1.0"
+# Invoices written between two chunks handed to the response.
+ISAF_FLUSH_EVERY = 500
+# "ND" (nėra duomenų) stands in for a buyer code the register does not have.
+NOT_PROVIDED = "ND"
+DEFAULT_COUNTRY = "LT"
+# VMI tax codes of the Lithuanian VAT rates; other rates are reported without a code.
+TAX_CODES = {Decimal("21"): "PVM1", Decimal("9"): "PVM2", Decimal("5"): "PVM3"}
+# A 0% rate has several codes depending on why the supply is zero-rated (PVM5 for
+# domestic exemptions, PVM12 for exports, ...); the seller picks theirs in the settings.
+ZERO_RATE_SETTING = "isaf_zero_rate_tax_code"
+
+_CENT = Decimal("0.01")
+
+
+def _money(value) -> str:
+    return str(Decimal(value or 0).quantize(_CENT, rounding=ROUND_HALF_UP))
+
+
+def vat_percentage(subtotal, vat_amount) -> Decimal | None:
+    """The whole VAT rate an invoice was charged at, derived from its stored totals."""
+    subtotal = Decimal(subtotal or 0)
+    if not subtotal:
+        return None
+    return (Decimal(vat_amount or 0) * 100 / subtotal).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
+
+
+def _country(vat_code: str | None) -> str:
+    # EU VAT codes start with the country; anything else is a domestic buyer.
+    prefix = (vat_code or "")[:2].upper()
+    return prefix if prefix.isalpha() and len(prefix) == 2 else DEFAULT_COUNTRY
+
+
+def stream_isaf(
+    rows: Iterable,
+    *,
+    registration_number: str,
+    start: date,
+    end: date,
+    created_at: datetime | None = None,
+    zero_rate_code: str | None = None,
+) -> Iterator[str]:
+    """Write the i.SAF register of issued invoices incrementally, one chunk at a time.
+
+    ``rows`` carry ``full_invoice_number`` (or ``series_code``/``invoice_number``),
+    ``invoice_date``, ``exclude_vat``, ``subtotal``, ``vat_amount``, ``client_id``,
+    ``company_name``, ``registration_code`` and ``vat_code``. Zero-rated invoices are
+    reported under ``zero_rate_code``. Only the current chunk is held in memory,
+    whatever the number of rows.
+    """
+    buffer = StringIO()
+    xml = XMLGenerator(buffer, encoding="UTF-8", short_empty_elements=True)
+
+    def element(name: str, value=None, *, nil: bool = False) -> None:
+        xml.startElement(name, {"xsi:nil": "true"} if nil else {})
+        if value is not None:
+            xml.characters(str(value))
+        xml.endElement(name)
+
+    def drain() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    created_at = created_at or datetime.now()
+    xml.startDocument()
+    xml.startElement("iSAFFile", {"xmlns": ISAF_NAMESPACE, "xmlns:xsi": XSI_NAMESPACE})
+    xml.startElement("Header", {})
+    xml.startElement("FileDescription", {})
+    element("FileVersion", FILE_VERSION)
+    element("FileDateCreated", created_at.replace(microsecond=0).isoformat())
+    element("DataType", "S")
+    element("SoftwareCompanyName", SOFTWARE_NAME)
+    element("SoftwareName", SOFTWARE_NAME)
+    element("SoftwareVersion", SOFTWARE_VERSION)
+    element("RegistrationNumber", registration_number)
+    element("NumberOfParts", 1)
+    element("PartNumber", 1)
+    xml.startElement("SelectionCriteria", {})
+    element("SelectionStartDate", start.isoformat())
+    element("SelectionEndDate", end.isoformat())
+    xml.endElement("SelectionCriteria")
+    xml.endElement("FileDescription")
+    xml.endElement("Header")
+    xml.startElement("SourceDocuments", {})
+    xml.startElement("SalesInvoices", {})
+
+    for count, row in enumerate(rows, start=1):
+        xml.startElement("Invoice", {})
+        element("InvoiceNo", row.full_invoice_number or f"{row.series_code} {row.invoice_number}")
+        xml.startElement("CustomerInfo", {})
+        element("CustomerID", row.client_id)
+        element("VATRegistrationNumber", row.vat_code or NOT_PROVIDED)
+        element("RegistrationNumber", row.registration_code or NOT_PROVIDED)
+        element("Country", _country(row.vat_code))
+        element("Name", row.company_name)
+        xml.endElement("CustomerInfo")
+        element("InvoiceDate", row.invoice_date.isoformat())
+        element("InvoiceType", "SF")
+        element("SpecialTaxation")
+        element("References")
+        element("VATPointDate", row.invoice_date.isoformat())
+        xml.startElement("DocumentTotals", {})
+        xml.startElement("DocumentTotal", {})
+        element("TaxableValue", _money(row.subtotal))
+        rate = None if row.exclude_vat else vat_percentage(row.subtotal, row.vat_amount)
+        code = zero_rate_code if rate == 0 else TAX_CODES.get(rate)
+        element("TaxCode", code, nil=code is None)
+        element("TaxPercentage", rate, nil=rate is None)
+        element("Amount", None if rate is None else _money(row.vat_amount), nil=rate is None)
+        xml.endElement("DocumentTotal")
+        xml.endElement("DocumentTotals")
+        xml.endElement("Invoice")
+        if count % ISAF_FLUSH_EVERY == 0:
+            yield drain()
+
+    xml.endElement("SalesInvoices")
+    xml.endElement("SourceDocuments")
+    xml.endElement("iSAFFile")
+    xml.endDocument()
+    yield drain()
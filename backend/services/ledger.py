@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, NamedTuple
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from backend.database import db
+from backend.models import Client, ClientStats, Invoice, InvoiceStatus, MonthlyRevenue
+
+# Aggregates derived from invoices are maintained incrementally: ORM flushes are captured
+# by session listeners, and bulk statements that bypass the ORM (the overdue sweep, bulk
+# imports) call apply_invoice_changes themselves. Either way the aggregate rows change in
+# the same transaction as the invoices.
+
+# Invoice attributes the aggregates depend on.
+FACT_ATTRIBUTES = ("invoice_date", "status", "total", "client_id", "client")
+
+# session.info key holding what before_flush captured for after_flush.
+_PENDING_KEY = "ledger_pending"
+
+
+class InvoiceFact(NamedTuple):
+    """The part of an invoice row that feeds the aggregates."""
+
+    client_id: int
+    invoice_date: date
+    status: InvoiceStatus
+    total: Decimal
+
+
+def _fact_from_instance(invoice: Invoice) -> InvoiceFact:
+    return InvoiceFact(
+        client_id=invoice.client_id,
+        invoice_date=invoice.invoice_date or date.today(),
+        status=invoice.status or InvoiceStatus.DRAFT,
+        total=Decimal(str(invoice.total or 0)),
+    )
+
+
+def _fact_from_row(row) -> InvoiceFact:
+    return InvoiceFact(
+        client_id=row.client_id,
+        invoice_date=row.invoice_date,
+        status=row.status,
+        total=Decimal(str(row.total or 0)),
+    )
+
+
+def fact_columns():
+    """Columns to select when loading :class:`InvoiceFact` rows with :func:`load_facts`."""
+    return [Invoice.client_id, Invoice.invoice_date, Invoice.status, Invoice.total]
+
+
+def facts_from_rows(rows) -> list[InvoiceFact]:
+    """Facts from rows of :func:`fact_columns`, e.g. returned by an UPDATE."""
+    return [_fact_from_row(row) for row in rows]
+
+
+def load_facts(connection, *criteria) -> list[InvoiceFact]:
+    return facts_from_rows(connection.execute(select(*fact_columns()).where(*criteria)))
+
+
+def _upsert(connection, table, keys: tuple[str, ...], rows: list[dict], latest: tuple[str, ...] = ()):
+    """Insert rows, adding their non-key values to existing rows with the same key.
+
+    Columns named in ``latest`` keep the greater of the stored and the new value instead.
+    """
+    if not rows:
+        return
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(table)
+    updates = {}
+    for name in rows[0]:
+        if name in keys:
+            continue
+        current, incoming = table.c[name], stmt.excluded[name]
+        if name in latest:
+            updates[name] = case(
+                (incoming.is_(None), current),
+                (current.is_(None), incoming),
+                (incoming > current, incoming),
+                else_=current,
+            )
+        else:
+            updates[name] = current + incoming
+    connection.execute(stmt.on_conflict_do_update(index_elements=list(keys), set_=updates), rows)
+
+
+def _apply_monthly_revenue(connection, removed: Iterable[InvoiceFact], added: Iterable[InvoiceFact]):
+    deltas: dict[tuple, list] = defaultdict(lambda: [0, Decimal("0")])
+    for sign, facts in ((-1, removed), (1, added)):
+        for fact in facts:
+            delta = deltas[(fact.invoice_date.year, fact.invoice_date.month, fact.status)]
+            delta[0] += sign
+            delta[1] += sign * fact.total
+    rows = [
+        {"year": year, "month": month, "status": status, "invoice_count": count, "total": total}
+        for (year, month, status), (count, total) in deltas.items()
+        if count or total
+    ]
+    _upsert(connection, MonthlyRevenue.__table__, ("year", "month", "status"), rows)
+
+
+def _client_stats_row(client_id: int) -> dict:
+    return {
+        "client_id": client_id,
+        "invoice_count": 0,
+        "paid_count": 0,
+        "overdue_count": 0,
+        "total_invoiced": Decimal("0"),
+        "total_paid": Decimal("0"),
+        "total_unpaid": Decimal("0"),
+        "last_invoice_date": None,
+    }
+
+
+def _apply_client_stats(connection, removed: list[InvoiceFact], added: list[InvoiceFact]):
+    deltas: dict[int, dict] = {}
+    for sign, facts in ((-1, removed), (1, added)):
+        for fact in facts:
+            row = deltas.setdefault(fact.client_id, _client_stats_row(fact.client_id))
+            paid = fact.status == InvoiceStatus.PAID
+            row["invoice_count"] += sign
+            row["paid_count"] += sign if paid else 0
+            row["overdue_count"] += sign if fact.status == InvoiceStatus.OVERDUE else 0
+            row["total_invoiced"] += sign * fact.total
+            row["total_paid" if paid else "total_unpaid"] += sign * fact.total
+            if sign > 0 and (row["last_invoice_date"] is None or fact.invoice_date > row["last_invoice_date"]):
+                row["last_invoice_date"] = fact.invoice_date
+    _upsert(
+        connection,
+        ClientStats.__table__,
+        ("client_id",),
+        list(deltas.values()),
+        latest=("last_invoice_date",),
+    )
+
+    # A maximum cannot be decremented: re-read it for clients that may have lost their
+    # latest invoice without gaining one at least as recent.
+    stale = {
+        fact.client_id
+        for fact in removed
+        if (deltas[fact.client_id]["last_invoice_date"] or date.min) < fact.invoice_date
+    }
+    if stale:
+        table = ClientStats.__table__
+        latest = (
+            select(func.max(Invoice.invoice_date))
+            .where(Invoice.client_id == table.c.client_id)
+            .scalar_subquery()
+        )
+        connection.execute(
+            table.update().where(table.c.client_id.in_(stale)).values(last_invoice_date=latest)
+        )
+
+
+def apply_invoice_changes(
+    connection,
+    removed: Iterable[InvoiceFact],
+    added: Iterable[InvoiceFact],
+    *,
+    skip_clients: Iterable[int] = (),
+):
+    """Move ``removed`` facts out of and ``added`` facts into every aggregate.
+
+    An update is a removal of the old row plus an addition of the new one. Call this
+    after the invoice rows themselves have been written. ``skip_clients`` are clients
+    deleted in the same transaction: their facts still count towards the monthly
+    revenue, but they get no statistics row, which would reference a missing client.
+    """
+    removed, added = list(removed), list(added)
+    if not (removed or added):
+        return
+    _apply_monthly_revenue(connection, removed, added)
+    skip_clients = set(skip_clients)
+    if skip_clients:
+        removed = [fact for fact in removed if fact.client_id not in skip_clients]
+        added = [fact for fact in added if fact.client_id not in skip_clients]
+    _apply_client_stats(connection, removed, added)
+
+
+def ensure_client_stats(connection, client_ids: Iterable[int]):
+    """Give new clients their (empty) statistics row."""
+    rows = [_client_stats_row(client_id) for client_id in client_ids]
+    _upsert(connection, ClientStats.__table__, ("client_id",), rows, latest=("last_invoice_date",))
+
+
+def _facts_changed(invoice: Invoice) -> bool:
+    state = inspect(invoice)
+    return any(state.attrs[name].history.has_changes() for name in FACT_ATTRIBUTES)
+
+
+def _capture_invoice_changes(session, flush_context, instances):
+    """before_flush: remember the pre-flush facts of changed and deleted invoices."""
+    session.info.pop(_PENDING_KEY, None)
+    changed = [obj for obj in session.dirty if isinstance(obj, Invoice) and _facts_changed(obj)]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Invoice)]
+    written = [obj for obj in session.new if isinstance(obj, Invoice)] + changed
+    new_clients = [obj for obj in session.new if isinstance(obj, Client)]
+    deleted_clients = [obj.id for obj in session.deleted if isinstance(obj, Client)]
+    if not (written or deleted or new_clients or deleted_clients):
+        return
+
+    # The database still holds the pre-flush values of changed and deleted invoices.
+    old_ids = [obj.id for obj in changed + deleted if obj.id is not None]
+    removed = load_facts(session.connection(), Invoice.id.in_(old_ids)) if old_ids else []
+    session.info[_PENDING_KEY] = (removed, written, new_clients, deleted_clients)
+
+
+def _apply_captured_changes(session, flush_context):
+    """after_flush: apply the captured changes now that new rows have their ids."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+    removed, written, new_clients, deleted_clients = pending
+    connection = session.connection()
+    ensure_client_stats(connection, [client.id for client in new_clients])
+    if deleted_clients:
+        # Foreign keys are enforced: drop the rows of deleted clients before anything else,
+        # and keep the deltas of their cascaded invoices from inserting them again.
+        table = ClientStats.__table__
+        connection.execute(table.delete().where(table.c.client_id.in_(deleted_clients)))
+    apply_invoice_changes(
+        connection, removed, [_fact_from_instance(obj) for obj in written], skip_clients=deleted_clients
+    )
+
+
+def _expected_monthly_revenue():
+    year = func.extract("year", Invoice.invoice_date)
+    month = func.extract("month", Invoice.invoice_date)
+    return select(
+        year.label("year"),
+        month.label("month"),
+        Invoice.status,
+        func.count(Invoice.id).label("invoice_count"),
+        func.coalesce(func.sum(Invoice.total), 0).label("total"),
+    ).group_by(year, month, Invoice.status)
+
+
+def _expected_client_stats():
+    def total_where(condition):
+        return func.coalesce(func.sum(case((condition, Invoice.total), else_=0)), 0)
+
+    def count_where(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    return (
+        select(
+            Client.id.label("client_id"),
+            func.count(Invoice.id).label("invoice_count"),
+            count_where(Invoice.status == InvoiceStatus.PAID).label("paid_count"),
+            count_where(Invoice.status == InvoiceStatus.OVERDUE).label("overdue_count"),
+            func.coalesce(func.sum(Invoice.total), 0).label("total_invoiced"),
+            total_where(Invoice.status == InvoiceStatus.PAID).label("total_paid"),
+            total_where(Invoice.status != InvoiceStatus.PAID).label("total_unpaid"),
+            func.max(Invoice.invoice_date).label("last_invoice_date"),
+        )
+        .select_from(Client)
+        .outerjoin(Invoice, Invoice.client_id == Client.id)
+        .group_by(Client.id)
+    )
+
+
+def rebuild_monthly_revenue(connection) -> int:
+    """Recompute the monthly revenue rollup from the invoices table; returns rows written."""
+    table = MonthlyRevenue.__table__
+    connection.execute(table.delete())
+    rows = [
+        {
+            "year": int(row.year),
+            "month": int(row.month),
+            "status": row.status,
+            "invoice_count": row.invoice_count,
+            "total": row.total,
+        }
+        for row in connection.execute(_expected_monthly_revenue())
+    ]
+    if rows:
+        connection.execute(table.insert(), rows)
+    return len(rows)
+
+
+def rebuild_client_stats(connection) -> int:
+    """Recompute every client's statistics row; returns rows written."""
+    table = ClientStats.__table__
+    expected = _expected_client_stats()
+    connection.execute(table.delete())
+    result = connection.execute(
+        table.insert().from_select([column.name for column in expected.selected_columns], expected)
+    )
+    return result.rowcount
+
+
+def backfill_client_stats(connection) -> int:
+    """Compute the statistics row of every client that lacks one; returns rows written."""
+    table = ClientStats.__table__
+    expected = _expected_client_stats().where(Client.id.not_in(select(table.c.client_id)))
+    result = connection.execute(
+        table.insert().from_select([column.name for column in expected.selected_columns], expected)
+    )
+    return result.rowcount
+
+
+def _rounded(value):
+    if isinstance(value, (Decimal, float)):
+        return Decimal(str(value)).quantize(Decimal("0.01"))
+    return value
+
+
+def _mismatches(stored_rows, expected_rows, key_length: int, *, skip_empty: bool = False) -> list[tuple]:
+    """Keys whose stored aggregate differs from the recomputed one.
+
+    With ``skip_empty`` an all-zero row counts the same as a missing one.
+    """
+
+    def index(rows):
+        indexed = {}
+        for row in rows:
+            values = tuple(_rounded(value) for value in row)
+            if not skip_empty or any(values[key_length:]):
+                indexed[values[:key_length]] = values[key_length:]
+        return indexed
+
+    stored, expected = index(stored_rows), index(expected_rows)
+    return sorted(key for key in stored.keys() | expected.keys() if stored.get(key) != expected.get(key))
+
+
+def verify_monthly_revenue(connection) -> list[tuple]:
+    """Return the (year, month, status) keys whose rollup row is out of date."""
+    expected = [
+        (int(row.year), int(row.month), row.status.name, row.invoice_count, row.total)
+        for row in connection.execute(_expected_monthly_revenue())
+    ]
+    stored = [
+        (row.year, row.month, row.status.name, row.invoice_count, row.total)
+        for row in connection.execute(select(MonthlyRevenue.__table__))
+    ]
+    return _mismatches(stored, expected, 3, skip_empty=True)
+
+
+def verify_client_stats(connection) -> list[tuple]:
+    """Return the (client_id,) keys whose statistics row is missing or out of date."""
+    expected = [tuple(row) for row in connection.execute(_expected_client_stats())]
+    stored = [tuple(row) for row in connection.execute(select(*ClientStats.__table__.c))]
+    return _mismatches(stored, expected, 1)
+
+
+def init_ledger(app: Flask):
+    """Hook aggregate maintenance into ORM flushes and backfill freshly created aggregates."""
+    for name, listener in (("before_flush", _capture_invoice_changes), ("after_flush", _apply_captured_changes)):
+        if not event.contains(db.session, name, listener):
+            event.listen(db.session, name, listener)
+    app.cli.add_command(ledger_cli)
+    with app.app_context():
+        with db.engine.begin() as connection:
+            has_invoices = connection.execute(select(Invoice.id).limit(1)).first()
+            if has_invoices and not connection.execute(select(MonthlyRevenue.year).limit(1)).first():
+                rebuild_monthly_revenue(connection)
+            backfill_client_stats(connection)
+
+
+ledger_cli = AppGroup("ledger", help="Maintenance for aggregates derived from invoices.")
+
+
+@ledger_cli.command("rebuild")
+def rebuild_command():
+    """Recompute the monthly revenue rollup and client statistics from scratch."""
+    with db.engine.begin() as connection:
+        click.echo(f"monthly_revenue: wrote {rebuild_monthly_revenue(connection)} row(s).")
+        click.echo(f"client_stats: wrote {rebuild_client_stats(connection)} row(s).")
+
+
+@ledger_cli.command("verify")
+def verify_command():
+    """Backfill missing client statistics, then compare the aggregates with a recomputation."""
+    with db.engine.begin() as connection:
+        click.echo(f"client_stats: backfilled {backfill_client_stats(connection)} missing row(s).")
+    with db.engine.connect() as connection:
+        results = {
+            "monthly_revenue": verify_monthly_revenue(connection),
+            "client_stats": verify_client_stats(connection),
+        }
+    for name, mismatched in results.items():
+        click.echo(f"{name}: {len(mismatched)} mismatched row(s).")
+        for key in mismatched[:20]:
+            click.echo(f"  {', '.join(str(part) for part in key)}")
+    if any(results.values()):
+        raise click.ClickException("Aggregates are out of date; run 'flask ledger rebuild'.")
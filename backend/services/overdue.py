@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import date, datetime, timedelta
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+from backend.database import db
+from sqlalchemy import update
+
+from backend.models import Invoice, InvoiceStatus, MaintenanceRun
+from backend.services.ledger import InvoiceFact, apply_invoice_changes, fact_columns, facts_from_rows
+
+TASK_NAME = "overdue_sweep"
+DEFAULT_INTERVAL = 24 * 60 * 60
+# How often the sweeper thread wakes up to check whether a sweep is due.
+MAX_POLL_SECONDS = 5 * 60
+
+# Statuses that turn into OVERDUE once the due date has passed. Drafts were never issued,
+# so they stay drafts: deleting one must give its number back to the series.
+OPEN_STATUSES = (InvoiceStatus.SENT,)
+
+logger = logging.getLogger(__name__)
+
+
+def sweep_overdue(today: date | None = None) -> int:
+    """Persist the overdue status for unpaid invoices past their due date.
+
+    Served by ``ix_invoices_status_due_date``; returns the number of invoices updated.
+    """
+    today = today or date.today()
+    # Bulk UPDATEs bypass the ORM flush hooks, so move the aggregates explicitly. The
+    # facts come back from the UPDATE itself: a separate SELECT could see rows another
+    # writer changes before the UPDATE runs. One UPDATE per status, as RETURNING only
+    # sees the new status.
+    connection = db.session.connection()
+    added: list[InvoiceFact] = []
+    removed: list[InvoiceFact] = []
+    for status in OPEN_STATUSES:
+        rows = connection.execute(
+            update(Invoice)
+            .where(Invoice.status == status, Invoice.due_date < today)
+            .values(status=InvoiceStatus.OVERDUE)
+            .returning(*fact_columns())
+        )
+        swept = facts_from_rows(rows)
+        added += swept
+        removed += [fact._replace(status=status) for fact in swept]
+    apply_invoice_changes(connection, removed, added)
+    MaintenanceRun.record(TASK_NAME, today, len(added))
+    db.session.commit()
+    return len(added)
+
+
+def run_pending(interval: int = DEFAULT_INTERVAL) -> int | None:
+    """Sweep if one is due; returns the updated row count, or None when skipped.
+
+    The claim on the ``maintenance_runs`` row and the sweep share a transaction, so of
+    several workers checking at once exactly one sweeps, and a failed sweep leaves the
+    run unclaimed.
+    """
+    try:
+        today = date.today()
+        if not MaintenanceRun.claim(TASK_NAME, today, datetime.utcnow() - timedelta(seconds=interval)):
+            db.session.rollback()
+            return None
+        return sweep_overdue(today)
+    finally:
+        db.session.remove()
+
+
+class OverdueSweeper:
+    """Daemon thread that keeps stored invoice statuses in line with due dates.
+
+    Several worker processes may each run a sweeper; only the one that claims the shared
+    ``maintenance_runs`` row sweeps (see :func:`run_pending`).
+    """
+
+    def __init__(self, app: Flask, interval: int = DEFAULT_INTERVAL):
+        self.app = app
+        self.interval = max(int(interval), 1)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the thread if it is not running; cheap enough to call on every request."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="overdue-sweeper", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        poll = min(self.interval, MAX_POLL_SECONDS)
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    updated = run_pending(self.interval)
+                if updated:
+                    logger.info("Overdue sweep marked %s invoice(s) as overdue.", updated)
+            except Exception:
+                logger.exception("Overdue sweep failed.")
+            self._stop.wait(poll)
+
+
+def init_overdue_sweeper(app: Flask) -> OverdueSweeper | None:
+    """Register the CLI and arrange for the sweeper to start with the first request.
+
+    Starting lazily keeps CLI commands and scripts that import the app thread-free, and
+    gives every forked server worker its own thread.
+    """
+    app.cli.add_command(overdue_cli)
+    if not app.config.get("OVERDUE_SWEEPER_ENABLED", True) or app.testing:
+        return None
+    sweeper = OverdueSweeper(app, app.config.get("OVERDUE_SWEEP_INTERVAL", DEFAULT_INTERVAL))
+    app.extensions["overdue_sweeper"] = sweeper
+    app.before_request(sweeper.start)
+    return sweeper
+
+
+overdue_cli = AppGroup("overdue", help="Overdue status maintenance.")
+
+
+@overdue_cli.command("sweep")
+def sweep_command():
+    """Mark unpaid invoices past their due date as overdue now."""
+    updated = sweep_overdue()
+    click.echo(f"Marked {updated} invoice(s) as overdue.")
+
+
+@overdue_cli.command("status")
+def status_command():
+    """Show when the overdue sweep last ran."""
+    run = db.session.get(MaintenanceRun, TASK_NAME)
+    if run is None:
+        click.echo("The overdue sweep has not run yet.")
+        return
+    click.echo(
+        f"Last run on {run.last_run_on.isoformat()} "
+        f"(at {run.last_run_at.isoformat(timespec='seconds')} UTC), "
+        f"{run.rows_affected} invoice(s) updated."
+    )
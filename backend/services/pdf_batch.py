@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+
+from flask import Flask, current_app
+
+from backend.services.pdf_cache import PdfCache, payload_key
+from backend.utils.pdf_generator import generate_invoice_pdf, get_renderer
+
+_EXTENSION_KEY = "pdf_batch_pool"
+_pool_lock = threading.Lock()
+
+_UNSAFE_NAME_RE = re.compile(r"[^\w.-]+", re.UNICODE)
+# Bytes copied from a rendered PDF into the archive between yields.
+COPY_CHUNK_BYTES = 256 * 1024
+
+
+def _init_worker():
+    # Fonts and styles are resolved once per worker process, not once per invoice.
+    get_renderer()
+
+
+def render_file(path: str, payload: dict) -> str:
+    """Render ``payload`` into the file at ``path``; runs in a pool worker.
+
+    The file is created before rendering starts, which is how job status reports show a
+    render in progress.
+    """
+    with open(path, "wb") as handle:
+        generate_invoice_pdf(payload, output_path=handle)
+    return path
+
+
+def render_target(cache: PdfCache | None, key: str | None) -> tuple[str, str | None]:
+    """A file to render into, and the cache key to store it under afterwards.
+
+    Without a (writable) cache this is a scratch file and the key is None; the caller
+    deletes it once done with it.
+    """
+    if cache is not None:
+        try:
+            return cache.temporary_path(key), key
+        except OSError:
+            pass
+    fd, path = tempfile.mkstemp(prefix="invoice-", suffix=".pdf")
+    os.close(fd)
+    return path, None
+
+
+def render_pdf(payload: dict, pool: ProcessPoolExecutor, cache: PdfCache | None = None) -> BinaryIO:
+    """The PDF for ``payload`` as an open file, rendered in ``pool`` on a cache miss.
+
+    The caller still waits for it, but the layout runs in a worker process, so other
+    requests are not held up behind the GIL while a long invoice renders.
+    """
+    key = None
+    if cache is not None:
+        key = payload_key(payload)
+        handle = cache.open(key)
+        if handle is not None:
+            return handle
+    path, key = render_target(cache, key)
+    try:
+        pool.submit(render_file, path, payload).result()
+    except BaseException:
+        Path(path).unlink(missing_ok=True)
+        raise
+    if key is not None:
+        return cache.store(key, path)
+    handle = open(path, "rb")
+    os.unlink(path)
+    return handle
+
+
+def archive_name(number: str | None, invoice_id: int) -> str:
+    """File name of an invoice inside the archive, e.g. ``invoice-SF-12.pdf``."""
+    stem = _UNSAFE_NAME_RE.sub("-", number or "").strip("-") or str(invoice_id)
+    return f"invoice-{stem}.pdf"
+
+
+def pool_size(app: Flask | None = None) -> int:
+    """Render processes per app: ``PDF_BATCH_WORKERS``, defaulting to the CPU count."""
+    app = app or current_app
+    return app.config.get("PDF_BATCH_WORKERS") or os.cpu_count() or 1
+
+
+def get_pool(app: Flask | None = None) -> ProcessPoolExecutor:
+    """The app's render pool, started on first use.
+
+    Workers are spawned rather than forked so they never inherit the parent's open
+    database connections or threads.
+    """
+    app = app or current_app._get_current_object()
+    with _pool_lock:
+        pool = app.extensions.get(_EXTENSION_KEY)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=pool_size(app),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            app.extensions[_EXTENSION_KEY] = pool
+            atexit.register(pool.shutdown, wait=False, cancel_futures=True)
+    return pool
+
+
+class _ZipSink:
+    """Write-only, unseekable file object: ZipFile appends, the response drains."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _add_file(archive: zipfile.ZipFile, sink: _ZipSink, name: str, handle: BinaryIO) -> Iterator[bytes]:
+    """Copy the open PDF ``handle`` into the archive as ``name``, yielding as it goes."""
+    # Dated and permissioned the way ZipFile.writestr would have added it.
+    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+    info.external_attr = 0o600 << 16
+    with handle, archive.open(info, mode="w") as entry:
+        while chunk := handle.read(COPY_CHUNK_BYTES):
+            entry.write(chunk)
+            yield sink.drain()
+
+
+def stream_pdf_archive(
+    documents: Iterable[tuple[str, dict]],
+    pool: ProcessPoolExecutor,
+    window: int,
+    cache: PdfCache | None = None,
+) -> Iterator[bytes]:
+    """Render ``(file name, pdf payload)`` pairs in ``pool`` and yield a ZIP archive.
+
+    Each PDF is added and flushed as soon as it finishes, in completion order; at most
+    ``window`` renders are in flight, so neither the payloads nor the archive are held
+    in memory as a whole: workers render to files, which are copied into the archive in
+    chunks. PDFs are already compressed, so entries are stored. With a ``cache``, cached
+    PDFs are added without rendering and new renders are moved into the cache.
+    """
+    sink = _ZipSink()
+    pending: dict[Future, tuple[str, str, str | None]] = {}
+    try:
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+
+            def collect(return_when) -> Iterator[bytes]:
+                done, _ = wait(pending, return_when=return_when)
+                for future in done:
+                    name, path, key = pending.pop(future)
+                    future.result()
+                    if key is not None:
+                        handle = cache.store(key, path)
+                    else:
+                        handle = open(path, "rb")
+                        os.unlink(path)
+                    yield from _add_file(archive, sink, name, handle)
+
+            for name, payload in documents:
+                key = None
+                if cache is not None:
+                    key = payload_key(payload)
+                    handle = cache.open(key)
+                    if handle is not None:
+                        yield from _add_file(archive, sink, name, handle)
+                        continue
+                path, key = render_target(cache, key)
+                pending[pool.submit(render_file, path, payload)] = (name, path, key)
+                if len(pending) >= window:
+                    yield from collect(FIRST_COMPLETED)
+            while pending:
+                yield from collect(FIRST_COMPLETED)
+        # Closing the archive wrote the central directory.
+        yield sink.drain()
+    finally:
+        # A render already running still writes its file; delete it once it is done.
+        for future, (_, path, _) in pending.items():
+            future.cancel()
+            future.add_done_callback(lambda _, path=path: Path(path).unlink(missing_ok=True))
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import BinaryIO
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+
+from backend.utils.pdf_generator import LAYOUT_VERSION, generate_invoice_pdf
+
+logger = logging.getLogger(__name__)
+
+_EXTENSION_KEY = "pdf_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Eviction trims the cache to this share of the cap so it does not run on every store.
+_EVICT_TO = 0.9
+_SUFFIX = ".pdf"
+
+
+def payload_key(payload: dict) -> str:
+    """Content address of a PDF payload: any change to what is rendered changes the key."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(f"{LAYOUT_VERSION}\n{canonical}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PdfCache:
+    """Rendered PDFs on disk, addressed by :func:`payload_key` and evicted least recently used.
+
+    Entries are written to a temporary file and renamed into place, so concurrent workers
+    sharing the directory never see a partial file; at worst two of them render the same
+    invoice and the last rename wins. Reads bump the file's mtime, which is the LRU clock.
+    Hit and miss counters are per process.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max(int(max_bytes), 0)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size: int | None = None
+
+    def entry_path(self, key: str) -> Path:
+        """Where the PDF for ``key`` is stored, whether or not it is cached now."""
+        return self.directory / key[:2] / f"{key}{_SUFFIX}"
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        # Entries sit in directories named after their key's first two characters; other
+        # directories (e.g. the PDF jobs' results) are not part of the cache.
+        for path in self.directory.glob(f"??/*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def open(self, key: str) -> BinaryIO | None:
+        """The cached PDF opened for reading, or None on a miss."""
+        path = self.entry_path(key)
+        try:
+            handle = open(path, "rb")
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another worker after the open; the open file is still good.
+            pass
+        with self._lock:
+            self.hits += 1
+        return handle
+
+    def temporary_path(self, key: str) -> str:
+        """A new empty file next to ``key``'s entry, to render into and then :meth:`store`."""
+        path = self.entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{key}-", suffix=".tmp")
+        os.close(fd)
+        return tmp_name
+
+    def store(self, key: str, rendered: str | os.PathLike) -> BinaryIO:
+        """Move the finished file ``rendered`` into place and return it opened for reading.
+
+        The file is opened before the rename, so an eviction right after cannot take it
+        from the caller. A file larger than the whole cache is handed back but not kept.
+        """
+        handle = open(rendered, "rb")
+        size = os.fstat(handle.fileno()).st_size
+        try:
+            if not self.max_bytes or size > self.max_bytes:
+                os.unlink(rendered)
+                return handle
+            os.replace(rendered, self.entry_path(key))
+        except OSError:
+            # A cache that cannot be written is only a slower cache.
+            logger.warning("Could not store PDF %s in the cache.", key, exc_info=True)
+            Path(rendered).unlink(missing_ok=True)
+            return handle
+        with self._lock:
+            if self._size is None:
+                self._size = sum(entry_size for _, entry_size, _ in self._entries())
+            else:
+                self._size += size
+            if self._size > self.max_bytes:
+                self._evict()
+        return handle
+
+    def _evict(self) -> None:
+        # Rescan rather than trust the running total: other workers share the directory.
+        entries = sorted(self._entries(), key=lambda entry: entry[0])
+        size = sum(entry[1] for entry in entries)
+        target = int(self.max_bytes * _EVICT_TO)
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+            self.evictions += 1
+        self._size = size
+
+    def clear(self) -> int:
+        removed = 0
+        with self._lock:
+            for _, _, path in self._entries():
+                path.unlink(missing_ok=True)
+                removed += 1
+            self._size = 0
+        return removed
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(entries),
+                "size_bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+            }
+
+
+def get_pdf_cache(app: Flask | None = None) -> PdfCache | None:
+    """The app's PDF cache, or None when caching is disabled."""
+    app = app or current_app
+    return app.extensions.get(_EXTENSION_KEY)
+
+
+def open_cached_pdf(payload: dict) -> BinaryIO:
+    """The PDF for ``payload`` as an open file, rendered into the cache only on a miss.
+
+    The renderer writes straight to disk and callers stream from the file, so no whole
+    PDF is held in memory. The caller closes the file; ``send_file`` does so itself.
+    """
+    cache = get_pdf_cache()
+    if cache is not None:
+        key = payload_key(payload)
+        handle = cache.open(key)
+        if handle is not None:
+            return handle
+        try:
+            rendered = cache.temporary_path(key)
+        except OSError:
+            logger.warning("Could not create a file in the PDF cache.", exc_info=True)
+        else:
+            try:
+                generate_invoice_pdf(payload, output_path=rendered)
+            except BaseException:
+                Path(rendered).unlink(missing_ok=True)
+                raise
+            return cache.store(key, rendered)
+    handle = tempfile.TemporaryFile()
+    try:
+        generate_invoice_pdf(payload, output_path=handle)
+    except BaseException:
+        handle.close()
+        raise
+    handle.seek(0)
+    return handle
+
+
+def init_pdf_cache(app: Flask) -> PdfCache | None:
+    """Register the CLI and create the cache; ``PDF_CACHE_MAX_BYTES = 0`` disables it."""
+    app.cli.add_command(pdf_cache_cli)
+    max_bytes = app.config.get("PDF_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+    directory = app.config.get("PDF_CACHE_DIR")
+    if not max_bytes or not directory:
+        return None
+    cache = PdfCache(directory, max_bytes)
+    app.extensions[_EXTENSION_KEY] = cache
+    return cache
+
+
+pdf_cache_cli = AppGroup("pdf-cache", help="Rendered invoice PDF cache.")
+
+
+@pdf_cache_cli.command("stats")
+def stats_command():
+    """Show the size of the PDF cache."""
+    cache = get_pdf_cache()
+    if cache is None:
+        click.echo("The PDF cache is disabled.")
+        return
+    stats = cache.stats()
+    click.echo(
+        f"{stats['entries']} PDF(s), {stats['size_bytes'] / 1024 / 1024:.1f} MiB "
+        f"of {stats['max_bytes'] / 1024 / 1024:.1f} MiB in {cache.directory}."
+    )
+
+
+@pdf_cache_cli.command("clear")
+def clear_command():
+    """Delete every cached PDF."""
+    cache = get_pdf_cache()
+    if cache is None:
+        click.echo("The PDF cache is disabled.")
+        return
+    click.echo(f"Removed {cache.clear()} cached PDF(s).")
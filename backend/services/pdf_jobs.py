@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import logging
+import os
+import secrets
+import shutil
+import tempfile
+import threading
+from concurrent.futures import CancelledError, Future
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+from flask import Flask, current_app
+from sqlalchemy import select
+
+from backend.database import db
+from backend.models import PdfRenderJob
+from backend.services.pdf_batch import get_pool, render_file
+from backend.services.pdf_cache import PdfCache, get_pdf_cache, payload_key
+
+logger = logging.getLogger(__name__)
+
+_EXTENSION_KEY = "pdf_jobs"
+DEFAULT_QUEUE_SIZE = 32
+# Seconds a finished job (and its PDF) is kept for the client to collect. Unfinished
+# jobs this old are given up: the worker that accepted them has gone away.
+DEFAULT_RESULT_TTL = 10 * 60
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (DONE, FAILED, CANCELLED)
+
+
+class PdfJob:
+    """One background render of an invoice PDF, as stored in ``pdf_jobs``."""
+
+    def __init__(self, row, running: bool = False):
+        self.id = row.id
+        self.invoice_id = row.invoice_id
+        self.download_name = row.download_name
+        self.status = row.status
+        self.error = row.error
+        self.created_at = row.created_at
+        self.finished_at = row.finished_at
+        # Only stored statuses are shared; a queued job whose worker has begun is running.
+        self.state = RUNNING if running and self.status == QUEUED else self.status
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "invoice_id": self.invoice_id,
+            "status": self.state,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "result_url": f"/api/pdf-jobs/{self.id}/pdf" if self.status == DONE else None,
+        }
+
+
+class PdfJobQueue:
+    """Bounded queue of PDF render jobs executed in the shared render pool.
+
+    Job status lives in the ``pdf_jobs`` table and finished PDFs are files in
+    ``directory``, so any worker process can report, serve or cancel a job another one
+    accepted. Each process renders at most ``max_pending`` jobs at a time. Finished jobs
+    and their files are removed ``result_ttl`` seconds after they end. Cancelling a job
+    whose render has started discards its result but cannot stop the render itself.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        directory: str | os.PathLike,
+        max_pending: int = DEFAULT_QUEUE_SIZE,
+        result_ttl: float = DEFAULT_RESULT_TTL,
+    ):
+        self.app = app
+        self.directory = Path(directory)
+        self.max_pending = max(int(max_pending), 1)
+        self.result_ttl = result_ttl
+        # Renders this process submitted and has not seen finish, by job id.
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def result_path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.pdf"
+
+    def _partial_path(self, job_id: str) -> Path:
+        # Created by the pool worker when it starts rendering.
+        return self.directory / f"{job_id}.part"
+
+    @contextmanager
+    def _transaction(self) -> Iterator:
+        # A connection of its own: callers run inside requests and on the pool's thread.
+        with self.app.app_context(), db.engine.begin() as connection:
+            yield connection
+
+    def _prune(self, connection) -> None:
+        table = PdfRenderJob.__table__
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=self.result_ttl)
+        with self._lock:
+            own = list(self._futures)
+        connection.execute(
+            table.update()
+            .where(table.c.finished_at.is_(None), table.c.created_at < cutoff, table.c.id.not_in(own))
+            .values(status=FAILED, error="The worker rendering this PDF stopped.", finished_at=now)
+        )
+        expired = connection.scalars(select(table.c.id).where(table.c.finished_at < cutoff)).all()
+        if not expired:
+            return
+        connection.execute(table.delete().where(table.c.id.in_(expired)))
+        for job_id in expired:
+            self.result_path(job_id).unlink(missing_ok=True)
+            self._partial_path(job_id).unlink(missing_ok=True)
+
+    def _finish(self, job_id: str, status: str, error: str | None = None) -> bool:
+        """Record the end of an unfinished job; False when it had already ended."""
+        table = PdfRenderJob.__table__
+        with self._transaction() as connection:
+            result = connection.execute(
+                table.update()
+                .where(table.c.id == job_id, table.c.finished_at.is_(None))
+                .values(status=status, error=error, finished_at=datetime.utcnow())
+            )
+        return result.rowcount == 1
+
+    def submit(self, invoice_id: int, payload: dict, download_name: str) -> PdfJob | None:
+        """Queue a render of ``payload``; returns None when this process's queue is full.
+
+        A PDF already in the cache finishes the job immediately without using a slot.
+        """
+        cache = get_pdf_cache(self.app)
+        key = payload_key(payload) if cache is not None else None
+        job_id = secrets.token_urlsafe(12)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        table = PdfRenderJob.__table__
+        row = {"id": job_id, "invoice_id": invoice_id, "download_name": download_name}
+
+        cached = cache.open(key) if cache is not None else None
+        if cached is not None:
+            with cached:
+                self._write_result(job_id, cached)
+            with self._transaction() as connection:
+                self._prune(connection)
+                connection.execute(table.insert().values(**row, status=DONE, finished_at=datetime.utcnow()))
+            return self.get(job_id)
+
+        with self._lock:
+            if len(self._futures) >= self.max_pending:
+                return None
+            with self._transaction() as connection:
+                connection.execute(table.insert().values(**row, status=QUEUED))
+            future = get_pool(self.app).submit(render_file, str(self._partial_path(job_id)), payload)
+            self._futures[job_id] = future
+        with self._transaction() as connection:
+            self._prune(connection)
+        future.add_done_callback(lambda done: self._completed(job_id, done, cache, key))
+        return self.get(job_id)
+
+    def _write_result(self, job_id: str, source) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=f".{job_id}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                shutil.copyfileobj(source, handle)
+            os.replace(tmp_name, self.result_path(job_id))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _completed(self, job_id: str, future: Future, cache: PdfCache | None, key: str | None) -> None:
+        # Runs on the pool's management thread (or inline if the future was already done).
+        with self._lock:
+            self._futures.pop(job_id, None)
+        partial = self._partial_path(job_id)
+        try:
+            future.result()
+        except CancelledError:
+            partial.unlink(missing_ok=True)
+            self._finish(job_id, CANCELLED)
+            return
+        except Exception as exc:
+            logger.exception("Rendering the PDF of job %s failed.", job_id)
+            partial.unlink(missing_ok=True)
+            self._finish(job_id, FAILED, str(exc) or exc.__class__.__name__)
+            return
+        result = self.result_path(job_id)
+        os.replace(partial, result)
+        if not self._finish(job_id, DONE):
+            # Cancelled (possibly by another worker) while it rendered.
+            result.unlink(missing_ok=True)
+            return
+        if cache is not None:
+            try:
+                with open(result, "rb") as source:
+                    rendered = cache.temporary_path(key)
+                    with open(rendered, "wb") as target:
+                        shutil.copyfileobj(source, target)
+                cache.store(key, rendered).close()
+            except OSError:
+                logger.warning("Could not store the PDF of job %s in the cache.", job_id, exc_info=True)
+
+    def get(self, job_id: str) -> PdfJob | None:
+        """The job, or None when it does not exist or has expired."""
+        table = PdfRenderJob.__table__
+        with self._transaction() as connection:
+            row = connection.execute(select(table).where(table.c.id == job_id)).first()
+        if row is None:
+            return None
+        cutoff = datetime.utcnow() - timedelta(seconds=self.result_ttl)
+        if row.finished_at is not None and row.finished_at < cutoff:
+            return None
+        return PdfJob(row, running=self._partial_path(job_id).exists())
+
+    def cancel(self, job_id: str) -> PdfJob | None:
+        """Cancel an unfinished job; finished jobs are left as they are."""
+        self._finish(job_id, CANCELLED)
+        with self._lock:
+            future = self._futures.get(job_id)
+        # Outside the lock: cancelling runs the done callback, which takes it too.
+        if future is not None:
+            future.cancel()
+        return self.get(job_id)
+
+
+def get_pdf_jobs(app: Flask | None = None) -> PdfJobQueue:
+    app = app or current_app
+    return app.extensions[_EXTENSION_KEY]
+
+
+def init_pdf_jobs(app: Flask) -> PdfJobQueue:
+    """Create the app's job queue.
+
+    ``PDF_JOB_QUEUE_SIZE`` bounds the unfinished jobs per process. Results go to
+    ``PDF_JOB_DIR``, by default the ``jobs`` directory of the PDF cache; workers that
+    share jobs must share it too.
+    """
+    directory = app.config.get("PDF_JOB_DIR")
+    if not directory:
+        cache_dir = app.config.get("PDF_CACHE_DIR")
+        directory = os.path.join(cache_dir, "jobs") if cache_dir else os.path.join(app.instance_path, "pdf_jobs")
+    queue = PdfJobQueue(
+        app,
+        directory,
+        app.config.get("PDF_JOB_QUEUE_SIZE", DEFAULT_QUEUE_SIZE),
+        app.config.get("PDF_JOB_RESULT_TTL", DEFAULT_RESULT_TTL),
+    )
+    app.extensions[_EXTENSION_KEY] = queue
+    return queue
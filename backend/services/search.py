@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+import logging
+import re
+from contextlib import contextmanager
+from typing import NamedTuple
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+from sqlalchemy import and_, bindparam, column, exists, func, literal_column, or_, select, table, text, union
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql import Subquery
+
+from backend.database import db
+from backend.models import Client, Invoice, InvoiceItem
+
+logger = logging.getLogger(__name__)
+
+INVOICES_FTS = "invoices_fts"
+INVOICE_ITEMS_FTS = "invoice_items_fts"
+# While a row exists here the insert triggers skip indexing; see deferred_invoice_indexing.
+INVOICES_FTS_DEFERRED = "invoices_fts_deferred"
+CLIENTS_FTS = "clients_fts"
+CLIENT_SEARCH_COLUMNS = ("company_name", "registration_code", "vat_code", "email", "phone")
+# The trigram tokenizer cannot match terms shorter than three characters.
+TRIGRAM_MIN_LENGTH = 3
+# Searches matching more clients than this are served by the index but not ranked.
+CLIENT_RANK_LIMIT = 1000
+
+# Ids per statement when indexing in bulk (stays under SQLite's bound parameter limit).
+_INDEX_BATCH_SIZE = 500
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# One FTS5 document per invoice (rowid: invoice id) for its own fields, and one per
+# line item (rowid: item id) for descriptions, so writing an item touches only its row.
+_INVOICES_FTS_TABLE = f"""
+CREATE VIRTUAL TABLE {INVOICES_FTS} USING fts5(
+    full_invoice_number, client_name, client_code, notes,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+_INVOICE_ITEMS_FTS_TABLE = f"""
+CREATE VIRTUAL TABLE {INVOICE_ITEMS_FTS} USING fts5(
+    description, invoice_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+_INVOICE_DOCUMENT_INSERT = f"""
+INSERT INTO {INVOICES_FTS}(rowid, full_invoice_number, client_name, client_code, notes)
+SELECT i.id, i.full_invoice_number, c.company_name, c.registration_code, i.notes
+FROM invoices AS i LEFT JOIN clients AS c ON c.id = i.client_id
+"""
+
+_INVOICES_FTS_DEFERRED_TABLE = f"CREATE TABLE {INVOICES_FTS_DEFERRED} (id INTEGER PRIMARY KEY)"
+
+_ITEM_DOCUMENT_INSERT = f"""
+INSERT INTO {INVOICE_ITEMS_FTS}(rowid, description, invoice_id)
+SELECT id, description, invoice_id FROM invoice_items
+"""
+
+_NOT_DEFERRED = f"NOT EXISTS (SELECT 1 FROM {INVOICES_FTS_DEFERRED})"
+
+_INVOICES_FTS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS invoices_fts_ai AFTER INSERT ON invoices WHEN {_NOT_DEFERRED} BEGIN
+        {_INVOICE_DOCUMENT_INSERT} WHERE i.id = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS invoice_items_fts_ai AFTER INSERT ON invoice_items WHEN {_NOT_DEFERRED} BEGIN
+        INSERT INTO {INVOICE_ITEMS_FTS}(rowid, description, invoice_id)
+        VALUES (new.id, new.description, new.invoice_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS invoices_fts_au
+    AFTER UPDATE OF full_invoice_number, client_id, notes ON invoices BEGIN
+        DELETE FROM {INVOICES_FTS} WHERE rowid = old.id;
+        {_INVOICE_DOCUMENT_INSERT} WHERE i.id = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS invoices_fts_ad AFTER DELETE ON invoices BEGIN
+        DELETE FROM {INVOICES_FTS} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS invoice_items_fts_au
+    AFTER UPDATE OF description, invoice_id ON invoice_items BEGIN
+        DELETE FROM {INVOICE_ITEMS_FTS} WHERE rowid = old.id;
+        INSERT INTO {INVOICE_ITEMS_FTS}(rowid, description, invoice_id)
+        VALUES (new.id, new.description, new.invoice_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS invoice_items_fts_ad AFTER DELETE ON invoice_items BEGIN
+        DELETE FROM {INVOICE_ITEMS_FTS} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS clients_invoices_fts_au
+    AFTER UPDATE OF company_name, registration_code ON clients BEGIN
+        UPDATE {INVOICES_FTS} SET client_name = new.company_name, client_code = new.registration_code
+        WHERE rowid IN (SELECT id FROM invoices WHERE client_id = new.id);
+    END
+    """,
+]
+
+_CLIENT_COLUMNS = ", ".join(CLIENT_SEARCH_COLUMNS)
+_CLIENT_NEW_VALUES = ", ".join(f"new.{name}" for name in CLIENT_SEARCH_COLUMNS)
+_CLIENT_OLD_VALUES = ", ".join(f"old.{name}" for name in CLIENT_SEARCH_COLUMNS)
+
+# External-content trigram index over the clients table: substring matches for
+# names, codes, e-mails and phone numbers without scanning every row.
+_CLIENTS_FTS_TABLE = f"""
+CREATE VIRTUAL TABLE {CLIENTS_FTS} USING fts5(
+    {_CLIENT_COLUMNS},
+    content = 'clients', content_rowid = 'id', tokenize = 'trigram'
+)
+"""
+
+_CLIENTS_FTS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS clients_fts_ai AFTER INSERT ON clients BEGIN
+        INSERT INTO {CLIENTS_FTS}(rowid, {_CLIENT_COLUMNS}) VALUES (new.id, {_CLIENT_NEW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS clients_fts_ad AFTER DELETE ON clients BEGIN
+        INSERT INTO {CLIENTS_FTS}({CLIENTS_FTS}, rowid, {_CLIENT_COLUMNS})
+        VALUES ('delete', old.id, {_CLIENT_OLD_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS clients_fts_au AFTER UPDATE OF {_CLIENT_COLUMNS} ON clients BEGIN
+        INSERT INTO {CLIENTS_FTS}({CLIENTS_FTS}, rowid, {_CLIENT_COLUMNS})
+        VALUES ('delete', old.id, {_CLIENT_OLD_VALUES});
+        INSERT INTO {CLIENTS_FTS}(rowid, {_CLIENT_COLUMNS}) VALUES (new.id, {_CLIENT_NEW_VALUES});
+    END
+    """,
+]
+
+_invoices_fts = table(INVOICES_FTS, column("rowid"))
+_invoice_items_fts = table(INVOICE_ITEMS_FTS, column("rowid"), column("invoice_id"))
+_clients_fts = table(CLIENTS_FTS, column("rowid"))
+
+
+def _table_exists(connection, name: str) -> bool:
+    row = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": name}
+    ).first()
+    return row is not None
+
+
+def rebuild_invoice_index(connection) -> int:
+    """Repopulate the invoice FTS index from the invoices table; returns invoices indexed."""
+    connection.execute(text(f"DELETE FROM {INVOICES_FTS}"))
+    connection.execute(text(f"DELETE FROM {INVOICE_ITEMS_FTS}"))
+    connection.execute(text(_INVOICE_DOCUMENT_INSERT))
+    connection.execute(text(_ITEM_DOCUMENT_INSERT))
+    return connection.execute(text(f"SELECT count(*) FROM {INVOICES_FTS}")).scalar_one()
+
+
+def rebuild_client_index(connection) -> int:
+    """Repopulate the client trigram index from the clients table; returns documents indexed."""
+    connection.execute(text(f"INSERT INTO {CLIENTS_FTS}({CLIENTS_FTS}) VALUES ('rebuild')"))
+    return connection.execute(text("SELECT count(*) FROM clients")).scalar_one()
+
+
+# Index name: (its tables, sync triggers, rebuild function).
+_INDEXES = {
+    INVOICES_FTS: (
+        {
+            INVOICES_FTS: _INVOICES_FTS_TABLE,
+            INVOICE_ITEMS_FTS: _INVOICE_ITEMS_FTS_TABLE,
+            INVOICES_FTS_DEFERRED: _INVOICES_FTS_DEFERRED_TABLE,
+        },
+        _INVOICES_FTS_TRIGGERS,
+        rebuild_invoice_index,
+    ),
+    CLIENTS_FTS: ({CLIENTS_FTS: _CLIENTS_FTS_TABLE}, _CLIENTS_FTS_TRIGGERS, rebuild_client_index),
+}
+
+_TRIGGER_NAME_RE = re.compile(r"CREATE TRIGGER IF NOT EXISTS (\w+)")
+
+
+def _install_index(engine, name: str) -> bool:
+    tables, triggers, rebuild = _INDEXES[name]
+    try:
+        with engine.begin() as connection:
+            # An index missing any of its tables is created from scratch; that also
+            # replaces an index and triggers left by an older layout.
+            created = not all(_table_exists(connection, table_name) for table_name in tables)
+            if created:
+                for ddl in triggers:
+                    trigger_name = _TRIGGER_NAME_RE.search(ddl).group(1)
+                    connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger_name}"))
+                for table_name, create_table in tables.items():
+                    connection.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+                    connection.execute(text(create_table))
+            for ddl in triggers:
+                connection.execute(text(ddl))
+            if created:
+                rebuild(connection)
+    except OperationalError:
+        logger.warning("Could not create the %s search index; falling back to LIKE.", name, exc_info=True)
+        return False
+    return True
+
+
+def install_search_indexes(engine) -> dict[str, bool]:
+    """Create the FTS5 tables and sync triggers; backfill indexes created for the first time.
+
+    Returns which indexes are available. Databases other than SQLite (or SQLite builds
+    without FTS5 or the trigram tokenizer) fall back to LIKE matching.
+    """
+    if engine.dialect.name != "sqlite":
+        return {name: False for name in _INDEXES}
+    return {name: _install_index(engine, name) for name in _INDEXES}
+
+
+def init_search(app: Flask) -> dict[str, bool]:
+    """Install the search indexes for the app's database and register the CLI."""
+    app.cli.add_command(search_cli)
+    with app.app_context():
+        available = install_search_indexes(db.engine)
+    app.extensions["search_indexes"] = available
+    return available
+
+
+def _index_available(name: str) -> bool:
+    return current_app.extensions.get("search_indexes", {}).get(name, False)
+
+
+@contextmanager
+def deferred_invoice_indexing(connection):
+    """Index invoices inserted inside the block once, at the end, instead of per row.
+
+    A row in the deferral table makes the insert triggers skip their work for the
+    rest of the transaction; the new invoices and their items are then indexed with
+    one statement per batch. The row is deleted before the transaction ends, so other
+    connections never see it, and no schema changes. Yields a list the caller extends
+    with the new invoice ids.
+    """
+    new_ids: list[int] = []
+    if not _index_available(INVOICES_FTS):
+        yield new_ids
+        return
+    connection.execute(text(f"INSERT INTO {INVOICES_FTS_DEFERRED} DEFAULT VALUES"))
+    try:
+        yield new_ids
+    finally:
+        connection.execute(text(f"DELETE FROM {INVOICES_FTS_DEFERRED}"))
+    ids = bindparam("ids", expanding=True)
+    insert_invoices = text(f"{_INVOICE_DOCUMENT_INSERT} WHERE i.id IN :ids").bindparams(ids)
+    insert_items = text(f"{_ITEM_DOCUMENT_INSERT} WHERE invoice_id IN :ids").bindparams(ids)
+    for start in range(0, len(new_ids), _INDEX_BATCH_SIZE):
+        batch = {"ids": new_ids[start : start + _INDEX_BATCH_SIZE]}
+        connection.execute(insert_invoices, batch)
+        connection.execute(insert_items, batch)
+
+
+def search_terms(value: str | None) -> list[str]:
+    return _TOKEN_RE.findall(value or "")
+
+
+def fts_prefix_query(terms: list[str]) -> str:
+    """All terms must match, each as a prefix (``"acm"*`` matches ``ACME``)."""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def invoice_search_condition(value: str | None):
+    """Filter expression matching invoices against ``value``, or None for an empty search.
+
+    Covers the invoice number, client name and registration code, notes and item
+    descriptions.
+    """
+    terms = search_terms(value)
+    if not terms:
+        return None
+    if _index_available(INVOICES_FTS):
+        # Every term must match the invoice's own fields or one of its items.
+        conditions = []
+        for term in terms:
+            query = fts_prefix_query([term])
+            conditions.append(
+                Invoice.id.in_(
+                    union(
+                        select(_invoices_fts.c.rowid).where(literal_column(INVOICES_FTS).op("MATCH")(query)),
+                        select(_invoice_items_fts.c.invoice_id).where(
+                            literal_column(INVOICE_ITEMS_FTS).op("MATCH")(query)
+                        ),
+                    )
+                )
+            )
+        return conditions[0] if len(conditions) == 1 else and_(*conditions)
+
+    conditions = []
+    for term in terms:
+        pattern = f"%{term}%"
+        conditions.append(
+            or_(
+                Invoice.full_invoice_number.ilike(pattern),
+                Invoice.notes.ilike(pattern),
+                Invoice.client.has(
+                    or_(Client.company_name.ilike(pattern), Client.registration_code.ilike(pattern))
+                ),
+                exists().where(InvoiceItem.invoice_id == Invoice.id, InvoiceItem.description.ilike(pattern)),
+            )
+        )
+    return conditions[0] if len(conditions) == 1 else and_(*conditions)
+
+
+def _client_like_condition(term: str):
+    pattern = f"%{term.lower()}%"
+    return or_(*(func.lower(getattr(Client, name)).like(pattern) for name in CLIENT_SEARCH_COLUMNS))
+
+
+def _trigram_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+class ClientSearch(NamedTuple):
+    """A client search resolved against the trigram index.
+
+    ``matches`` is a subquery of matching ``client_id`` rows to join (None when the
+    index cannot serve the search); when ``ranked`` it also carries a bm25 ``rank``
+    column, lower being more relevant. ``filters`` hold LIKE conditions for terms the
+    index cannot match.
+    """
+
+    matches: Subquery | None
+    ranked: bool
+    filters: list
+
+
+def client_search(value: str | None) -> ClientSearch:
+    """Resolve a client search, preferring the trigram index over LIKE scans.
+
+    Terms shorter than three characters cannot use the trigram index and become LIKE
+    filters (as does every term when the index is unavailable). bm25 costs a lookup
+    per matching row, so broad searches (more than ``CLIENT_RANK_LIMIT`` matches, e.g.
+    "uab") are left unranked; ordering those by ``client_id`` lets SQLite walk the index
+    in rowid order and stop after one page.
+    """
+    terms = (value or "").split()
+    if not terms:
+        return ClientSearch(None, False, [])
+    indexed = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+    if not indexed or not _index_available(CLIENTS_FTS):
+        return ClientSearch(None, False, [_client_like_condition(term) for term in terms])
+
+    fts = literal_column(CLIENTS_FTS)
+    match = fts.op("MATCH")(" AND ".join(_trigram_phrase(term) for term in indexed))
+    filters = [
+        _client_like_condition(term) for term in terms if len(term) < TRIGRAM_MIN_LENGTH
+    ]
+
+    probe = select(_clients_fts.c.rowid).where(match).limit(CLIENT_RANK_LIMIT + 1).subquery()
+    broad = db.session.execute(select(func.count()).select_from(probe)).scalar_one() > CLIENT_RANK_LIMIT
+    if broad:
+        matches = select(_clients_fts.c.rowid.label("client_id")).where(match)
+        return ClientSearch(matches.subquery("client_matches"), False, filters)
+
+    matches = select(_clients_fts.c.rowid.label("client_id"), func.bm25(fts).label("rank")).where(match)
+    return ClientSearch(matches.subquery("client_matches"), True, filters)
+
+
+search_cli = AppGroup("search", help="Full-text search index maintenance.")
+
+
+@search_cli.command("rebuild")
+@click.option(
+    "--index",
+    "names",
+    type=click.Choice(sorted(_INDEXES)),
+    multiple=True,
+    help="Index to rebuild (default: all).",
+)
+def rebuild_command(names):
+    """Rebuild the search indexes from scratch."""
+    for name in names or sorted(_INDEXES):
+        if not _index_available(name):
+            raise click.ClickException(f"The {name} index is not available for this database.")
+        with db.engine.begin() as connection:
+            indexed = _INDEXES[name][2](connection)
+        click.echo(f"{name}: indexed {indexed} row(s).")
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import enum
+import json
+from datetime import date, time
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder produces the same JSON, only slower
+    orjson = None
+
+
+def encode_default(value):
+    """Encode the values API payloads carry as-is: money as numbers, dates as ISO 8601."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return DefaultJSONProvider.default(value)
+
+
+class ApiJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes Decimal, date/datetime and Enum values natively.
+
+    Serializers hand over column values untouched and the encoder converts them, with
+    orjson when it is installed. Output is UTF-8 rather than ASCII escapes, as orjson
+    cannot produce the latter; keys stay sorted like Flask's default provider.
+    """
+
+    default = staticmethod(encode_default)
+    ensure_ascii = False
+    use_orjson = orjson is not None
+
+    def _orjson_options(self, kwargs: dict) -> int | None:
+        # Options orjson can honour; any other json.dumps argument falls back to the stdlib.
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.pop("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.pop("indent", None):
+            option |= orjson.OPT_INDENT_2
+        kwargs.pop("separators", None)
+        return None if kwargs else option
+
+    def dumps_bytes(self, obj, **kwargs) -> bytes:
+        if self.use_orjson:
+            option = self._orjson_options(dict(kwargs))
+            if option is not None:
+                return orjson.dumps(obj, default=self.default, option=option)
+        return self.dumps(obj, **kwargs).encode("utf-8")
+
+    def dumps(self, obj, **kwargs) -> str:
+        if self.use_orjson:
+            option = self._orjson_options(dict(kwargs))
+            if option is not None:
+                return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        dump_args = {"indent": 2} if indent else {"separators": (",", ":")}
+        return self._app.response_class(self.dumps_bytes(obj, **dump_args) + b"\n", mimetype=self.mimetype)
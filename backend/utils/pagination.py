@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import enum
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import and_, or_
+
+# Type tags keep cursor values round-trippable through JSON.
+_TAG_DATE = "d"
+_TAG_DATETIME = "dt"
+_TAG_DECIMAL = "n"
+_TAG_ENUM = "e"
+_TAG_RAW = "r"
+
+
+def _encode_value(value) -> list:
+    if isinstance(value, datetime):
+        return [_TAG_DATETIME, value.isoformat()]
+    if isinstance(value, date):
+        return [_TAG_DATE, value.isoformat()]
+    if isinstance(value, Decimal):
+        return [_TAG_DECIMAL, str(value)]
+    if isinstance(value, enum.Enum):
+        # Enum columns store member names; comparisons bind the name directly.
+        return [_TAG_ENUM, value.name]
+    return [_TAG_RAW, value]
+
+
+def _decode_value(tag: str, raw):
+    if tag == _TAG_DATETIME:
+        return datetime.fromisoformat(raw)
+    if tag == _TAG_DATE:
+        return date.fromisoformat(raw)
+    if tag == _TAG_DECIMAL:
+        return Decimal(raw)
+    if tag in (_TAG_ENUM, _TAG_RAW):
+        return raw
+    raise ValueError(f"Unknown cursor value tag: {tag!r}")
+
+
+def encode_cursor(sort_param: str, value, row_id: int) -> str:
+    """Build an opaque cursor pointing just past the row with (value, row_id)."""
+    payload = json.dumps([sort_param, *_encode_value(value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, sort_param: str) -> tuple:
+    """Return (value, row_id) from a cursor; raise ValueError if it is malformed or
+    was issued for a different sort order."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        cursor_sort, tag, raw, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+    if cursor_sort != sort_param:
+        raise ValueError("Cursor does not match sort_by.")
+    if not isinstance(row_id, int):
+        raise ValueError("Invalid cursor.")
+    return _decode_value(tag, raw), row_id
+
+
+def keyset_order(sort_expr, id_column, *, descending: bool, unique: bool = False) -> tuple:
+    """ORDER BY clauses for keyset paging.
+
+    The id tie-breaker follows the sort direction so a single-column index (which stores
+    rowids ascending) can serve the whole order; ``unique`` sort expressions need none.
+    """
+    if unique:
+        return (sort_expr.desc() if descending else sort_expr.asc(),)
+    if descending:
+        return sort_expr.desc(), id_column.desc()
+    return sort_expr.asc(), id_column.asc()
+
+
+def keyset_condition(sort_expr, value, id_column, row_id: int, *, descending: bool, unique: bool = False):
+    """Rows after (value, row_id) in :func:`keyset_order` order."""
+    if unique:
+        return sort_expr < value if descending else sort_expr > value
+    if descending:
+        return or_(sort_expr < value, and_(sort_expr == value, id_column < row_id))
+    return or_(sort_expr > value, and_(sort_expr == value, id_column > row_id))
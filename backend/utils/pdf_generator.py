@@ -2,16 +2,27 @@ from __future__ import annotations
 
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Iterable, Mapping, Sequence
+from typing import Iterable, Iterator, Mapping, Sequence
 
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import mm
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.platypus import (
+    BaseDocTemplate,
+    Frame,
+    NextPageTemplate,
+    PageTemplate,
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+    Table,
+    TableStyle,
+)
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
@@ -22,6 +33,19 @@ FALLBACK_FONT = "Helvetica"
 HEADER_BG = colors.HexColor("#f5f5f5")
 GRID_COLOR = colors.HexColor("#dcdcdc")
 TEXT_COLOR = colors.HexColor("#222222")
+# Invoices with more lines than this use the chunked large-invoice layout.
+LARGE_INVOICE_ITEMS = 200
+# Rows per items table in the large layout; bounds the cost of each page split.
+ITEMS_CHUNK_ROWS = 50
+# Padding platypus frames put around their content.
+FRAME_PADDING = 6
+ITEMS_HEADER = ("Pavadinimas", "Kiekis", "Matas", "Kaina", "Iš viso")
+# Part of every PDF cache key: bump it whenever the rendered layout changes.
+LAYOUT_VERSION = 2
+
+# Thousands separator to a space and decimal point to a comma, in one pass.
+_LT_SEPARATORS = str.maketrans({",": " ", ".": ","})
+_NUMBER_FORMATS = {places: f",.{places}f" for places in range(4)}
 
 
 def format_date_lt(value: date | datetime | str | None) -> str:
@@ -45,8 +69,7 @@ def format_number_lt(value, places: int = 2) -> str:
         number = Decimal(str(value))
     except (InvalidOperation, ValueError, TypeError):
         return ""
-    formatted = format(number, f",.{places}f")
-    return formatted.replace(",", " ").replace(".", ",")
+    return format(number, _NUMBER_FORMATS.get(places) or f",.{places}f").translate(_LT_SEPARATORS)
 
 
 def format_currency_lt(value) -> str:
@@ -125,44 +148,155 @@ def _party_paragraph(title: str, info: Mapping, body_style: ParagraphStyle, bold
     return Paragraph(html, body_style)
 
 
-def _build_items_table(
-    items: Sequence[Mapping], body_style: ParagraphStyle, width: float
-) -> Table:
+def _register_primary_font() -> tuple[str, str]:
+    """Register Arial if available; return (body_font, bold_font)."""
+    # If already registered, reuse.
     registered = set(pdfmetrics.getRegisteredFontNames())
-    header_font = (
-        body_style.fontName + "-Bold"
-        if body_style.fontName + "-Bold" in registered
-        else (FALLBACK_FONT + "-Bold" if FALLBACK_FONT + "-Bold" in registered else body_style.fontName)
-    )
-    data: list[list] = [
-        [
-            Paragraph("<b>Pavadinimas</b>", body_style),
-            Paragraph("<b>Kiekis</b>", body_style),
-            Paragraph("<b>Matas</b>", body_style),
-            Paragraph("<b>Kaina</b>", body_style),
-            Paragraph("<b>Iš viso</b>", body_style),
-        ]
+    if PRIMARY_FONT in registered:
+        bold_name = PRIMARY_FONT + "-Bold" if PRIMARY_FONT + "-Bold" in registered else FALLBACK_FONT + "-Bold"
+        return PRIMARY_FONT, bold_name
+
+    candidates = [
+        (PRIMARY_FONT, ["Arial.ttf", "/Library/Fonts/Arial.ttf", "/System/Library/Fonts/Supplemental/Arial.ttf", "C:/Windows/Fonts/arial.ttf"]),
+        (PRIMARY_FONT + "-Bold", ["Arial Bold.ttf", "Arial-Bold.ttf", "/Library/Fonts/Arial Bold.ttf", "/System/Library/Fonts/Supplemental/Arial Bold.ttf", "C:/Windows/Fonts/arialbd.ttf"]),
     ]
+    for name, paths in candidates:
+        for p in paths:
+            path_obj = Path(p)
+            if path_obj.exists():
+                try:
+                    pdfmetrics.registerFont(TTFont(name, str(path_obj)))
+                    break
+                except Exception:
+                    continue
 
-    for item in items or []:
-        data.append(
-            [
-                Paragraph(str(item.get("description", "")), body_style),
-                Paragraph(format_number_lt(item.get("quantity"), 3), body_style),
-                Paragraph(str(item.get("unit", "")), body_style),
-                Paragraph(format_currency_lt(item.get("unit_price")), body_style),
-                Paragraph(format_currency_lt(item.get("line_total")), body_style),
-            ]
+    registered = set(pdfmetrics.getRegisteredFontNames())
+    body_font = PRIMARY_FONT if PRIMARY_FONT in registered else FALLBACK_FONT
+    bold_font = (
+        PRIMARY_FONT + "-Bold"
+        if PRIMARY_FONT + "-Bold" in registered
+        else (FALLBACK_FONT + "-Bold" if FALLBACK_FONT + "-Bold" in registered else FALLBACK_FONT)
+    )
+    return body_font, bold_font
+
+
+class _ItemsTable(Table):
+    """Item rows of the large layout; splits keep the class, so every fragment is recognisable."""
+
+
+class _LazyStory(list):
+    """Flowable list that platypus consumes from the front, topped up from an iterator."""
+
+    def __init__(self, flowables: Iterable):
+        super().__init__()
+        self._source: Iterator | None = iter(flowables)
+
+    def _fill(self, size: int) -> None:
+        while self._source is not None and super().__len__() < size:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self) -> int:
+        self._fill(1)
+        return super().__len__()
+
+    def __getitem__(self, index):
+        if isinstance(index, int) and index >= 0:
+            self._fill(index + 1)
+        return super().__getitem__(index)
+
+
+class _LargeInvoiceDocTemplate(BaseDocTemplate):
+    def afterFlowable(self, flowable):
+        # Once item rows are on a page, the next page repeats the column header; the
+        # NextPageTemplate after the last chunk switches back.
+        if isinstance(flowable, _ItemsTable):
+            self.handle_nextPageTemplate("items")
+
+
+class InvoiceRenderer:
+    """Renders invoice PDFs.
+
+    Everything that does not depend on the invoice (fonts, paragraph and table styles,
+    column widths) is resolved once in the constructor; create one per process with
+    :func:`get_renderer` and reuse it. ``render`` only reads that state, so a renderer
+    can be shared between threads.
+    """
+
+    pagesize = A4
+
+    def __init__(self):
+        self.body_font, self.bold_font = _register_primary_font()
+        registered = set(pdfmetrics.getRegisteredFontNames())
+        # Bold variant of the body font for table headers and totals.
+        self.header_font = (
+            self.body_font + "-Bold"
+            if self.body_font + "-Bold" in registered
+            else (FALLBACK_FONT + "-Bold" if FALLBACK_FONT + "-Bold" in registered else self.body_font)
+        )
+
+        styles = getSampleStyleSheet()
+        self.body_style = _ensure_style(
+            styles,
+            "InvoiceBody",
+            fontName=self.body_font,
+            fontSize=10,
+            leading=13,
+            alignment=TA_LEFT,
+            textColor=TEXT_COLOR,
+        )
+        self.right_style = _ensure_style(
+            styles,
+            "InvoiceRight",
+            parent=self.body_style,
+            alignment=TA_RIGHT,
+        )
+        self.center_style = _ensure_style(
+            styles,
+            "InvoiceCenter",
+            parent=self.body_style,
+            alignment=TA_CENTER,
+        )
+        self.title_style = _ensure_style(
+            styles,
+            "InvoiceTitle",
+            parent=self.body_style,
+            fontName=self.bold_font,
+            fontSize=18,
+            leading=22,
+            alignment=TA_CENTER,
+        )
+        self.subtitle_style = _ensure_style(
+            styles,
+            "InvoiceSubtitle",
+            parent=self.body_style,
+            fontName=self.bold_font,
+            fontSize=12,
+            alignment=TA_CENTER,
         )
 
-    col_widths = [width * 0.44, width * 0.12, width * 0.12, width * 0.16, width * 0.16]
+        # Frame width of a SimpleDocTemplate with these margins.
+        width = self.pagesize[0] - 2 * H_MARGIN
+        self.width = width
+        self.party_col_widths = [width / 2 - 5 * mm, width / 2 - 5 * mm]
+        self.items_col_widths = [width * 0.44, width * 0.12, width * 0.12, width * 0.16, width * 0.16]
+        self.totals_col_widths = [width * 0.6, width * 0.4]
+        self.signature_col_widths = [width / 2, width / 2]
 
-    table = Table(data, colWidths=col_widths, hAlign="LEFT")
-    table.setStyle(
-        TableStyle(
+        self.parties_table_style = TableStyle(
             [
-                ("FONTNAME", (0, 0), (-1, 0), header_font),
-                ("FONTNAME", (0, 1), (-1, -1), body_style.fontName),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("LEFTPADDING", (0, 0), (-1, -1), 0),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+                ("TEXTCOLOR", (0, 0), (-1, -1), TEXT_COLOR),
+            ]
+        )
+        self.items_table_style = TableStyle(
+            [
+                ("FONTNAME", (0, 0), (-1, 0), self.header_font),
+                ("FONTNAME", (0, 1), (-1, -1), self.body_font),
                 ("FONTSIZE", (0, 0), (-1, -1), 10),
                 ("TEXTCOLOR", (0, 0), (-1, -1), TEXT_COLOR),
                 ("ALIGN", (1, 1), (-1, -1), "RIGHT"),
@@ -174,62 +308,16 @@ def _build_items_table(
                 ("TOPPADDING", (0, 0), (-1, -1), 6),
             ]
         )
-    )
-    return table
-
-
-def _totals_section(
-    total,
-    total_in_words: str,
-    body_style: ParagraphStyle,
-    right_style: ParagraphStyle,
-    width: float,
-) -> list:
-    registered = set(pdfmetrics.getRegisteredFontNames())
-    bold_font = (
-        body_style.fontName + "-Bold"
-        if body_style.fontName + "-Bold" in registered
-        else (FALLBACK_FONT + "-Bold" if FALLBACK_FONT + "-Bold" in registered else body_style.fontName)
-    )
-    totals_table = Table(
-        [
-            [Paragraph("<b>Bendra suma</b>", body_style), Paragraph(format_currency_lt(total), right_style)],
-        ],
-        colWidths=[width * 0.6, width * 0.4],
-        hAlign="LEFT",
-    )
-    totals_table.setStyle(
-        TableStyle(
+        self.totals_table_style = TableStyle(
             [
-                ("FONTNAME", (0, 0), (-1, -1), bold_font),
+                ("FONTNAME", (0, 0), (-1, -1), self.header_font),
                 ("ALIGN", (1, 0), (1, -1), "RIGHT"),
                 ("LINEABOVE", (0, 0), (-1, 0), 0.6, colors.black),
                 ("TOPPADDING", (0, 0), (-1, -1), 8),
                 ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
             ]
         )
-    )
-
-    amount_words = Paragraph(
-        f"Suma žodžiais: {total_in_words or ''}", body_style
-    )
-    return [totals_table, Spacer(1, 4 * mm), amount_words]
-
-
-def _signature_section(body_style: ParagraphStyle, width: float, issued_by: str, received_by: str) -> Table:
-    line = "_" * 28
-    left_value = issued_by or line
-    right_value = received_by or line
-    table = Table(
-        [
-            [Paragraph("Sąskaitą išrašė:", body_style), Paragraph("Sąskaitą priėmė:", body_style)],
-            [Paragraph(left_value, body_style), Paragraph(right_value, body_style)],
-        ],
-        colWidths=[width / 2, width / 2],
-        hAlign="LEFT",
-    )
-    table.setStyle(
-        TableStyle(
+        self.signature_table_style = TableStyle(
             [
                 ("ALIGN", (0, 0), (-1, 0), "LEFT"),
                 ("ALIGN", (0, 1), (-1, 1), "LEFT"),
@@ -237,40 +325,288 @@ def _signature_section(body_style: ParagraphStyle, width: float, issued_by: str,
                 ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
             ]
         )
-    )
-    return table
 
+        # Large layout: header row drawn at the top of continuation pages, and the
+        # rows of every chunk after the first (no header row of their own).
+        self.items_header_style = TableStyle(
+            [
+                ("FONTNAME", (0, 0), (-1, -1), self.header_font),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("TEXTCOLOR", (0, 0), (-1, -1), TEXT_COLOR),
+                ("BACKGROUND", (0, 0), (-1, -1), HEADER_BG),
+                ("GRID", (0, 0), (-1, -1), 0.4, GRID_COLOR),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+                ("TOPPADDING", (0, 0), (-1, -1), 6),
+            ]
+        )
+        self.items_rows_style = TableStyle(
+            [
+                ("FONTNAME", (0, 0), (-1, -1), self.body_font),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("TEXTCOLOR", (0, 0), (-1, -1), TEXT_COLOR),
+                ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+                ("ALIGN", (0, 0), (0, -1), "LEFT"),
+                ("GRID", (0, 0), (-1, -1), 0.4, GRID_COLOR),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+                ("TOPPADDING", (0, 0), (-1, -1), 6),
+            ]
+        )
+        header = Table([list(ITEMS_HEADER)], colWidths=self.items_col_widths)
+        header.setStyle(self.items_header_style)
+        self.items_header_height = header.wrap(width, self.pagesize[1])[1]
+        # Descriptions wider than this (cell minus its default 6pt paddings) must wrap.
+        self.description_width = self.items_col_widths[0] - 12
+
+        # Markup of the fixed labels is parsed once; each render gets fresh Paragraphs
+        # (they carry layout state) built from the parsed fragments.
+        self._label_frags = {
+            (text, style.name): Paragraph(text, style).frags
+            for text, style in [
+                ("SĄSKAITA FAKTŪRA", self.title_style),
+                ("<b>Pavadinimas</b>", self.body_style),
+                ("<b>Kiekis</b>", self.body_style),
+                ("<b>Matas</b>", self.body_style),
+                ("<b>Kaina</b>", self.body_style),
+                ("<b>Iš viso</b>", self.body_style),
+                ("<b>Bendra suma</b>", self.body_style),
+                ("Sąskaitą išrašė:", self.body_style),
+                ("Sąskaitą priėmė:", self.body_style),
+            ]
+        }
 
-def _register_primary_font() -> tuple[str, str]:
-    """Register Arial if available; return (body_font, bold_font)."""
-    # If already registered, reuse.
-    registered = set(pdfmetrics.getRegisteredFontNames())
-    if PRIMARY_FONT in registered:
-        bold_name = PRIMARY_FONT + "-Bold" if PRIMARY_FONT + "-Bold" in registered else FALLBACK_FONT + "-Bold"
-        return PRIMARY_FONT, bold_name
+    def _label(self, text: str, style: ParagraphStyle) -> Paragraph:
+        return Paragraph(text, style, frags=self._label_frags[text, style.name])
 
-    candidates = [
-        (PRIMARY_FONT, ["Arial.ttf", "/Library/Fonts/Arial.ttf", "/System/Library/Fonts/Supplemental/Arial.ttf", "C:/Windows/Fonts/arial.ttf"]),
-        (PRIMARY_FONT + "-Bold", ["Arial Bold.ttf", "Arial-Bold.ttf", "/Library/Fonts/Arial Bold.ttf", "/System/Library/Fonts/Supplemental/Arial Bold.ttf", "C:/Windows/Fonts/arialbd.ttf"]),
-    ]
-    for name, paths in candidates:
-        for p in paths:
-            path_obj = Path(p)
-            if path_obj.exists():
-                try:
-                    pdfmetrics.registerFont(TTFont(name, str(path_obj)))
-                    break
-                except Exception:
-                    continue
+    def _parties_table(self, seller_info: Mapping, buyer_info: Mapping) -> Table:
+        table = Table(
+            [
+                [
+                    _party_paragraph("Pardavėjas", seller_info, self.body_style, self.bold_font),
+                    _party_paragraph("Pirkėjas", buyer_info, self.body_style, self.bold_font),
+                ]
+            ],
+            colWidths=self.party_col_widths,
+            hAlign="LEFT",
+        )
+        table.setStyle(self.parties_table_style)
+        return table
 
-    registered = set(pdfmetrics.getRegisteredFontNames())
-    body_font = PRIMARY_FONT if PRIMARY_FONT in registered else FALLBACK_FONT
-    bold_font = (
-        PRIMARY_FONT + "-Bold"
-        if PRIMARY_FONT + "-Bold" in registered
-        else (FALLBACK_FONT + "-Bold" if FALLBACK_FONT + "-Bold" in registered else FALLBACK_FONT)
-    )
-    return body_font, bold_font
+    def _items_table(self, items: Sequence[Mapping]) -> Table:
+        body_style = self.body_style
+        data: list[list] = [
+            [
+                self._label("<b>Pavadinimas</b>", body_style),
+                self._label("<b>Kiekis</b>", body_style),
+                self._label("<b>Matas</b>", body_style),
+                self._label("<b>Kaina</b>", body_style),
+                self._label("<b>Iš viso</b>", body_style),
+            ]
+        ]
+
+        for item in items or []:
+            data.append(
+                [
+                    Paragraph(str(item.get("description", "")), body_style),
+                    Paragraph(format_number_lt(item.get("quantity"), 3), body_style),
+                    Paragraph(str(item.get("unit", "")), body_style),
+                    Paragraph(format_currency_lt(item.get("unit_price")), body_style),
+                    Paragraph(format_currency_lt(item.get("line_total")), body_style),
+                ]
+            )
+
+        table = Table(data, colWidths=self.items_col_widths, hAlign="LEFT")
+        table.setStyle(self.items_table_style)
+        return table
+
+    def _totals_section(self, total, total_in_words: str) -> list:
+        totals_table = Table(
+            [
+                [
+                    self._label("<b>Bendra suma</b>", self.body_style),
+                    Paragraph(format_currency_lt(total), self.right_style),
+                ],
+            ],
+            colWidths=self.totals_col_widths,
+            hAlign="LEFT",
+        )
+        totals_table.setStyle(self.totals_table_style)
+
+        amount_words = Paragraph(f"Suma žodžiais: {total_in_words or ''}", self.body_style)
+        return [totals_table, Spacer(1, 4 * mm), amount_words]
+
+    def _signature_section(self, issued_by: str, received_by: str) -> Table:
+        line = "_" * 28
+        left_value = issued_by or line
+        right_value = received_by or line
+        body_style = self.body_style
+        table = Table(
+            [
+                [self._label("Sąskaitą išrašė:", body_style), self._label("Sąskaitą priėmė:", body_style)],
+                [Paragraph(left_value, body_style), Paragraph(right_value, body_style)],
+            ],
+            colWidths=self.signature_col_widths,
+            hAlign="LEFT",
+        )
+        table.setStyle(self.signature_table_style)
+        return table
+
+    def _head_story(self, invoice_data) -> list:
+        story: list = []
+
+        story.append(self._label("SĄSKAITA FAKTŪRA", self.title_style))
+        story.append(Spacer(1, 5 * mm))
+
+        series_code = invoice_data.get("series_code") or ""
+        invoice_number = invoice_data.get("invoice_number") or ""
+        story.append(Paragraph(f"Serija {series_code} Nr. {invoice_number}", self.subtitle_style))
+        story.append(Spacer(1, 6 * mm))
+
+        story.append(
+            Paragraph(f"Sąskaitos data: {format_date_lt(invoice_data.get('invoice_date'))}", self.center_style)
+        )
+        story.append(Paragraph(f"Apmokėti iki: {format_date_lt(invoice_data.get('due_date'))}", self.center_style))
+        story.append(Spacer(1, 8 * mm))
+
+        story.append(self._parties_table(invoice_data.get("seller") or {}, invoice_data.get("buyer") or {}))
+        story.append(Spacer(1, 10 * mm))
+        return story
+
+    def _tail_story(self, invoice_data) -> list:
+        story = self._totals_section(invoice_data.get("total", 0), invoice_data.get("total_in_words", ""))
+        story.append(Spacer(1, 12 * mm))
+
+        issued_by = str(invoice_data.get("issued_by") or "").strip()
+        received_by = str(invoice_data.get("received_by") or "").strip()
+        story.append(self._signature_section(issued_by, received_by))
+        return story
+
+    def render(self, invoice_data, output_path=None):
+        """Render one invoice; see :func:`generate_invoice_pdf` for the arguments."""
+        items = invoice_data.get("items", [])
+        if len(items) > LARGE_INVOICE_ITEMS:
+            return self.render_large(invoice_data, output_path)
+
+        buffer = BytesIO()
+        target = buffer if output_path is None else output_path
+
+        doc = SimpleDocTemplate(
+            target,
+            pagesize=self.pagesize,
+            leftMargin=H_MARGIN,
+            rightMargin=H_MARGIN,
+            topMargin=V_MARGIN,
+            bottomMargin=V_MARGIN,
+        )
+
+        story = self._head_story(invoice_data)
+        story.append(self._items_table(items))
+        story.append(Spacer(1, 8 * mm))
+        story.extend(self._tail_story(invoice_data))
+
+        doc.build(story)
+
+        if output_path is not None:
+            return output_path
+
+        return buffer.getvalue()
+
+    # ----- large invoices -----
+    def _item_cells(self, item: Mapping) -> list:
+        # Plain strings skip the paragraph parser; only descriptions that contain markup
+        # or need wrapping become Paragraphs.
+        description = str(item.get("description", ""))
+        if (
+            "<" in description
+            or "&" in description
+            or "\n" in description
+            or pdfmetrics.stringWidth(description, self.body_font, 10) > self.description_width
+        ):
+            description = Paragraph(description, self.body_style)
+        return [
+            description,
+            format_number_lt(item.get("quantity"), 3),
+            str(item.get("unit", "")),
+            format_currency_lt(item.get("unit_price")),
+            format_currency_lt(item.get("line_total")),
+        ]
+
+    def _item_chunks(self, items: Iterable[Mapping]) -> Iterator[Table]:
+        rows: list[list] = [list(ITEMS_HEADER)]
+        style = self.items_table_style
+        for item in items:
+            rows.append(self._item_cells(item))
+            if len(rows) >= ITEMS_CHUNK_ROWS:
+                yield self._items_chunk(rows, style)
+                rows, style = [], self.items_rows_style
+        if rows:
+            yield self._items_chunk(rows, style)
+
+    def _items_chunk(self, rows: list[list], style: TableStyle) -> Table:
+        table = _ItemsTable(rows, colWidths=self.items_col_widths, hAlign="LEFT")
+        table.setStyle(style)
+        return table
+
+    def _draw_items_header(self, canvas, doc) -> None:
+        header = Table([list(ITEMS_HEADER)], colWidths=self.items_col_widths, hAlign="LEFT")
+        header.setStyle(self.items_header_style)
+        header.wrapOn(canvas, doc.width, doc.height)
+        canvas.saveState()
+        header.drawOn(
+            canvas,
+            doc.leftMargin + FRAME_PADDING,
+            doc.bottomMargin + doc.height - FRAME_PADDING - self.items_header_height,
+        )
+        canvas.restoreState()
+
+    def _large_story(self, invoice_data) -> Iterator:
+        yield from self._head_story(invoice_data)
+        yield from self._item_chunks(invoice_data.get("items", []))
+        # Pages after the last item row no longer repeat the column header.
+        yield NextPageTemplate("plain")
+        yield Spacer(1, 8 * mm)
+        yield from self._tail_story(invoice_data)
+
+    def render_large(self, invoice_data, output_path=None):
+        """Render an invoice with many lines in bounded memory.
+
+        Item rows are laid out as tables of ``ITEMS_CHUNK_ROWS`` rows, built only when
+        the layout reaches them; pages the items run onto repeat the column header.
+        Pass an ``output_path`` to keep the finished PDF out of memory as well.
+        """
+        buffer = BytesIO() if output_path is None else None
+        doc = _LargeInvoiceDocTemplate(
+            buffer if buffer is not None else output_path,
+            pagesize=self.pagesize,
+            leftMargin=H_MARGIN,
+            rightMargin=H_MARGIN,
+            topMargin=V_MARGIN,
+            bottomMargin=V_MARGIN,
+        )
+        doc.addPageTemplates(
+            [
+                PageTemplate(id="plain", frames=[Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height)]),
+                PageTemplate(
+                    id="items",
+                    frames=[
+                        Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height - self.items_header_height)
+                    ],
+                    onPage=self._draw_items_header,
+                ),
+            ]
+        )
+        doc.build(_LazyStory(self._large_story(invoice_data)))
+
+        if buffer is None:
+            return output_path
+        return buffer.getvalue()
+
+
+@lru_cache(maxsize=None)
+def get_renderer() -> InvoiceRenderer:
+    """The process-wide renderer, created on first use (call it early to pre-warm a worker)."""
+    return InvoiceRenderer()
 
 
 def generate_invoice_pdf(invoice_data, output_path=None):
@@ -294,136 +630,11 @@ def generate_invoice_pdf(invoice_data, output_path=None):
                 'issued_by': str,
                 'received_by': str or None
             }
-        output_path: str, optional path to save PDF
+        output_path: str or binary file object, optional target to write the PDF to
 
     Returns:
         bytes: PDF file content if output_path is None
         or
-        str: file path if output_path is provided
+        output_path if output_path is provided
     """
-
-    buffer = BytesIO()
-    target = buffer if output_path is None else output_path
-
-    doc = SimpleDocTemplate(
-        target,
-        pagesize=A4,
-        leftMargin=H_MARGIN,
-        rightMargin=H_MARGIN,
-        topMargin=V_MARGIN,
-        bottomMargin=V_MARGIN,
-    )
-
-    body_font, bold_font = _register_primary_font()
-
-    styles = getSampleStyleSheet()
-    body_style = _ensure_style(
-        styles,
-        "InvoiceBody",
-        fontName=body_font,
-        fontSize=10,
-        leading=13,
-        alignment=TA_LEFT,
-        textColor=TEXT_COLOR,
-    )
-    right_style = _ensure_style(
-        styles,
-        "InvoiceRight",
-        parent=body_style,
-        alignment=TA_RIGHT,
-    )
-    center_style = _ensure_style(
-        styles,
-        "InvoiceCenter",
-        parent=body_style,
-        alignment=TA_CENTER,
-    )
-    title_style = _ensure_style(
-        styles,
-        "InvoiceTitle",
-        parent=body_style,
-        fontName=bold_font,
-        fontSize=18,
-        leading=22,
-        alignment=TA_CENTER,
-    )
-    subtitle_style = _ensure_style(
-        styles,
-        "InvoiceSubtitle",
-        parent=body_style,
-        fontName=bold_font,
-        fontSize=12,
-        alignment=TA_CENTER,
-    )
-
-    story: list = []
-
-    story.append(Paragraph("SĄSKAITA FAKTŪRA", title_style))
-    story.append(Spacer(1, 5 * mm))
-
-    series_code = invoice_data.get("series_code") or ""
-    invoice_number = invoice_data.get("invoice_number") or ""
-    story.append(
-        Paragraph(f"Serija {series_code} Nr. {invoice_number}", subtitle_style)
-    )
-    story.append(Spacer(1, 6 * mm))
-
-    date_lines = [
-        Paragraph(f"Sąskaitos data: {format_date_lt(invoice_data.get('invoice_date'))}", center_style),
-        Paragraph(f"Apmokėti iki: {format_date_lt(invoice_data.get('due_date'))}", center_style),
-    ]
-    story.extend(date_lines)
-    story.append(Spacer(1, 8 * mm))
-
-    seller_info = invoice_data.get("seller") or {}
-    buyer_info = invoice_data.get("buyer") or {}
-    parties_table = Table(
-        [
-            [
-                _party_paragraph("Pardavėjas", seller_info, body_style, bold_font),
-                _party_paragraph("Pirkėjas", buyer_info, body_style, bold_font),
-            ]
-        ],
-        colWidths=[doc.width / 2 - 5 * mm, doc.width / 2 - 5 * mm],
-        hAlign="LEFT",
-    )
-    parties_table.setStyle(
-        TableStyle(
-            [
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-                ("TEXTCOLOR", (0, 0), (-1, -1), TEXT_COLOR),
-            ]
-        )
-    )
-    story.append(parties_table)
-    story.append(Spacer(1, 10 * mm))
-
-    story.append(_build_items_table(invoice_data.get("items", []), body_style, doc.width))
-    story.append(Spacer(1, 8 * mm))
-
-    totals = _totals_section(
-        invoice_data.get("total", 0),
-        invoice_data.get("total_in_words", ""),
-        body_style,
-        right_style,
-        doc.width,
-    )
-    story.extend(totals)
-    story.append(Spacer(1, 12 * mm))
-
-    issued_by = str(invoice_data.get("issued_by") or "").strip()
-    received_by = str(invoice_data.get("received_by") or "").strip()
-    signature_table = _signature_section(body_style, doc.width, issued_by, received_by)
-    story.append(signature_table)
-
-    doc.build(story)
-
-    if output_path is not None:
-        return output_path
-
-    buffer.seek(0)
-    return buffer.getvalue()
-
-
+    return get_renderer().render(invoice_data, output_path)
@@ -400,6 +400,10 @@ class InvoiceAPI {
         return this.post("/invoices/", data);
     }
 
+    async createInvoicesBulk(invoices) {
+        return this.post("/invoices/bulk", { invoices });
+    }
+
     async updateInvoice(id, data) {
         return this.put(`/invoices/${id}`, data);
     }
@@ -413,7 +417,59 @@ class InvoiceAPI {
     }
 
     async getInvoicePDF(id) {
-        return this.request(`/invoices/${id}/pdf`, { parseAs: "blob" });
+        // Large invoices are rendered in the background; the server then answers with a job.
+        const result = await this.request(`/invoices/${id}/pdf`);
+        if (result instanceof Blob) return result;
+        return this.waitForPdfJob(result);
+    }
+
+    async createInvoicePdfJob(id) {
+        return this.post(`/invoices/${id}/pdf/jobs`);
+    }
+
+    async getPdfJob(jobId) {
+        return this.get(`/pdf-jobs/${jobId}`);
+    }
+
+    async cancelPdfJob(jobId) {
+        return this.delete(`/pdf-jobs/${jobId}`);
+    }
+
+    async waitForPdfJob(job, { interval = 500, timeout = 5 * 60 * 1000 } = {}) {
+        const deadline = Date.now() + timeout;
+        let current = job;
+        while (current.status === "queued" || current.status === "running") {
+            if (Date.now() > deadline) {
+                await this.cancelPdfJob(current.id).catch(() => {});
+                throw new ApiError("PDF generavimas užtruko per ilgai.", { status: 408 });
+            }
+            await this._delay(interval);
+            current = await this.getPdfJob(current.id);
+        }
+        if (current.status !== "done") {
+            throw new ApiError(current.error || "Nepavyko sugeneruoti PDF.", { status: 500, data: current });
+        }
+        return this.request(`/pdf-jobs/${current.id}/pdf`, { parseAs: "blob" });
+    }
+
+    async exportInvoices(params = {}) {
+        return this.request("/invoices/export", {
+            params,
+            parseAs: "blob",
+            retry: 0,
+            timeout: 10 * 60 * 1000,
+        });
+    }
+
+    async getInvoicePDFBatch(filters) {
+        // Large archives take a while to render; don't time out or replay the request.
+        return this.request("/invoices/pdf/batch", {
+            method: "POST",
+            body: filters,
+            parseAs: "blob",
+            retry: 0,
+            timeout: 10 * 60 * 1000,
+        });
     }
 
     async duplicateInvoice(id) {
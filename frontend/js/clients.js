@@ -734,9 +734,13 @@
 
   async function loadClientInvoices(clientId, filters = {}) {
     try {
-      const res = await api.getClientInvoices(clientId, filters);
+      const res = await api.getClientInvoices(clientId, { with_total: false, ...filters });
       const detail = state.cache.get(clientId) || {};
-      state.cache.set(clientId, { ...detail, invoices: res?.invoices || [] });
+      state.cache.set(clientId, {
+        ...detail,
+        invoices: res?.invoices || [],
+        invoices_next_cursor: res?.next_cursor || null,
+      });
       if (state.expanded.has(clientId)) renderClientsList();
       if (state.selectedId === clientId) renderDetailView();
     } catch (error) {
@@ -745,6 +749,27 @@
     }
   }
 
+  async function loadMoreClientInvoices(clientId) {
+    const detail = state.cache.get(clientId);
+    if (!detail?.invoices_next_cursor) return;
+    try {
+      const res = await api.getClientInvoices(clientId, {
+        cursor: detail.invoices_next_cursor,
+        limit: 50,
+        with_total: false,
+      });
+      state.cache.set(clientId, {
+        ...detail,
+        invoices: [...(detail.invoices || []), ...(res?.invoices || [])],
+        invoices_next_cursor: res?.next_cursor || null,
+      });
+      if (state.selectedId === clientId) renderDetailView();
+    } catch (error) {
+      console.error("Nepavyko gauti sąskaitų", error);
+      showToast("error", error?.message || "Nepavyko gauti kliento sąskaitų.");
+    }
+  }
+
   async function loadClientStatistics(clientId) {
     try {
       const stats = await api.getClientStatistics(clientId);
@@ -873,6 +898,9 @@
       if (action === "inline-save") {
         saveInlineEdits(id, actionBtn.closest("[data-inline-form]"));
       }
+      if (action === "invoices-more") {
+        loadMoreClientInvoices(id);
+      }
       if (action === "refresh-stats") {
         loadClientStatistics(id);
       }
@@ -1010,6 +1038,11 @@
                   .join("")
               : `<p class="text-sm text-graphite-steel/70">Sąskaitų nerasta.</p>`
           }
+          ${
+            detail.invoices_next_cursor
+              ? `<button class="btn-secondary h-9 w-full" data-action="invoices-more" data-id="${client.id}">Rodyti daugiau</button>`
+              : ""
+          }
         </div>
       `;
     }
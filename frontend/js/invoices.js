@@ -245,6 +245,9 @@
           <button id="invoice-export" class="btn-secondary">
             ${icon("download")} Eksportuoti
           </button>
+          <button id="invoice-export-pdf" class="btn-secondary">
+            ${icon("download")} PDF archyvas
+          </button>
         </div>
         <div class="flex items-center gap-2 flex-wrap">
           <button id="invoice-create" class="btn-primary whitespace-nowrap">
@@ -302,6 +305,7 @@
     });
 
     root.querySelector("#invoice-export").addEventListener("click", exportInvoices);
+    root.querySelector("#invoice-export-pdf").addEventListener("click", exportInvoicePDFs);
     root.querySelector("#invoice-create").addEventListener("click", () => openModal("create"));
     root.addEventListener("click", handleListClick);
   }
@@ -334,6 +338,16 @@
     }
   }
 
+  function filterParams() {
+    const params = {};
+    if (state.filters.status && state.filters.status !== "all") params.status = state.filters.status;
+    if (state.filters.seriesId) params.series_id = state.filters.seriesId;
+    if (state.filters.dateFrom) params.date_from = state.filters.dateFrom;
+    if (state.filters.dateTo) params.date_to = state.filters.dateTo;
+    if (state.filters.search) params.search = state.filters.search;
+    return params;
+  }
+
   async function loadInvoices(filters = {}) {
     state.listLoading = true;
     renderSkeleton();
@@ -344,22 +358,10 @@
         sort_by: state.filters.sortBy,
         ...filters,
       };
-      if (state.filters.status && state.filters.status !== "all") params.status = state.filters.status;
-      if (state.filters.seriesId) params.series_id = state.filters.seriesId;
-      if (state.filters.dateFrom) params.date_from = state.filters.dateFrom;
-      if (state.filters.dateTo) params.date_to = state.filters.dateTo;
+      Object.assign(params, filterParams());
 
       const res = await api.getInvoices(params);
-      let list = res?.invoices || [];
-      if (state.filters.search) {
-        const term = state.filters.search.toLowerCase();
-        list = list.filter(
-          (i) =>
-            i.number?.toLowerCase().includes(term) ||
-            i.client_name?.toLowerCase().includes(term) ||
-            i.series_code?.toLowerCase().includes(term)
-        );
-      }
+      const list = res?.invoices || [];
 
       state.summary = res?.summary || state.summary;
       state.pagination.total = res?.total || list.length || 0;
@@ -802,6 +804,30 @@
           c.vat_code?.toLowerCase().includes(trimmed)
       )
       .slice(0, 5);
+    renderSuggestionButtons(container, matches);
+  }
+
+  // Only the first 100 clients are preloaded, so look further matches up on the server.
+  let clientLookupTimer;
+  function lookupClients(term) {
+    clearTimeout(clientLookupTimer);
+    const trimmed = term.trim();
+    if (!trimmed) return;
+    clientLookupTimer = setTimeout(async () => {
+      try {
+        const res = await api.getClients({ search: trimmed, limit: 5, with_total: false });
+        const known = new Set(state.clients.map((c) => String(c.id)));
+        (res?.clients || []).forEach((c) => {
+          if (!known.has(String(c.id))) state.clients.push(c);
+        });
+        if ((state.form.clientSearch || "").trim() === trimmed) renderClientSuggestions(trimmed);
+      } catch (error) {
+        console.warn("Nepavyko ieškoti klientų", error);
+      }
+    }, 150);
+  }
+
+  function renderSuggestionButtons(container, matches) {
     container.innerHTML = matches
       .map(
         (c) => `
@@ -1191,11 +1217,16 @@
     m.clientSearch.addEventListener("input", (e) => {
       state.form.clientSearch = e.target.value;
       renderClientSuggestions(e.target.value);
+      lookupClients(e.target.value);
     });
     m.clientSuggestions.addEventListener("click", (e) => {
       const btn = e.target.closest("[data-select-client]");
       if (!btn) return;
       state.form.client_id = btn.dataset.selectClient;
+      if (!m.clientSelect.querySelector(`option[value="${state.form.client_id}"]`)) {
+        const client = state.clients.find((c) => String(c.id) === String(state.form.client_id));
+        m.clientSelect.add(new Option(client?.company_name || state.form.client_id, state.form.client_id));
+      }
       m.clientSelect.value = state.form.client_id;
       renderClientDetails();
       renderClientSuggestions("");
@@ -1546,28 +1577,39 @@
     hydrateFormFields();
   }
 
-  function exportInvoices() {
-    if (!state.invoices.length) {
-      showToast("info", "Nėra duomenų eksportui.");
+  async function exportInvoices() {
+    try {
+      const blob = await api.exportInvoices({ ...filterParams(), format: "csv" });
+      const url = URL.createObjectURL(blob);
+      const a = document.createElement("a");
+      a.href = url;
+      a.download = "invoices.csv";
+      a.click();
+      URL.revokeObjectURL(url);
+    } catch (error) {
+      console.error("Nepavyko eksportuoti", error);
+      showToast("error", error?.message || "Nepavyko eksportuoti sąskaitų.");
+    }
+  }
+
+  async function exportInvoicePDFs() {
+    const filters = filterParams();
+    if (!Object.keys(filters).length) {
+      showToast("info", "Pasirinkite bent vieną filtrą PDF archyvui.");
       return;
     }
-    const header = ["Data", "Numeris", "Serija", "Klientas", "Statusas", "Suma"];
-    const rows = state.invoices.map((i) => [
-      fmtDate(i.invoice_date),
-      i.invoice_number ?? i.number,
-      i.series_code || "",
-      i.client_name || "",
-      STATUS_META[i.status]?.label || i.status || "",
-      Number(i.total || 0).toFixed(2),
-    ]);
-    const csv = [header, ...rows].map((r) => r.map((v) => `"${String(v).replace(/"/g, '""')}"`).join(",")).join("\n");
-    const blob = new Blob([csv], { type: "text/csv;charset=utf-8;" });
-    const url = URL.createObjectURL(blob);
-    const a = document.createElement("a");
-    a.href = url;
-    a.download = "invoices.csv";
-    a.click();
-    URL.revokeObjectURL(url);
+    try {
+      const blob = await api.getInvoicePDFBatch(filters);
+      const url = URL.createObjectURL(blob);
+      const a = document.createElement("a");
+      a.href = url;
+      a.download = "invoices.zip";
+      a.click();
+      URL.revokeObjectURL(url);
+    } catch (error) {
+      console.error("Nepavyko parsisiųsti PDF archyvo", error);
+      showToast("error", error?.message || "Nepavyko parsisiųsti PDF archyvo.");
+    }
   }
 
   function init() {
@@ -26,7 +26,7 @@
 
   const state = {
     activeTab: "company",
-    company: { company_name: "", tax_id: "", address: "", phone: "", email: "" },
+    company: { company_name: "", registration_code: "", tax_id: "", address: "", phone: "", email: "" },
     companyErrors: {},
     bankAccounts: [],
     bankForm: createBankForm(),
@@ -194,6 +194,13 @@
               )}" value="${escapeHtml(state.company.company_name)}" placeholder="UAB Pavyzdys">
               ${errorText("company_name")}
             </label>
+            <label class="text-sm space-y-1">
+              <span>Įmonės kodas</span>
+              <input data-section="company" data-field="registration_code" class="${fieldClass(
+                "registration_code"
+              )}" value="${escapeHtml(state.company.registration_code)}" placeholder="300000000">
+              ${errorText("registration_code")}
+            </label>
             <label class="text-sm space-y-1">
               <span>IV pažymos nr. *</span>
               <input data-section="company" data-field="tax_id" class="${fieldClass(
@@ -551,7 +558,8 @@
       const res = await api.getCompanyInfo();
       state.company = {
         company_name: res?.company_name || res?.name || "",
-        tax_id: res?.tax_id || res?.registration_code || "",
+        registration_code: res?.registration_code || "",
+        tax_id: res?.tax_id || "",
         address: res?.address || "",
         phone: res?.phone || "",
         email: res?.email || "",
@@ -578,6 +586,7 @@
     try {
       await api.updateCompanyInfo({
         company_name: state.company.company_name.trim(),
+        registration_code: state.company.registration_code.trim(),
         tax_id: state.company.tax_id.trim(),
         address: state.company.address.trim(),
         phone: state.company.phone.trim(),
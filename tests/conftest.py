@@ -0,0 +1,113 @@
+import os
+import tempfile
+
+# backend.app builds a module-level app on import; keep it off the real database and
+# without its background sweeper.
+_IMPORT_DIR = tempfile.mkdtemp(prefix="invoices-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_IMPORT_DIR}/import.db"
+os.environ["FLASK_PDF_CACHE_DIR"] = os.path.join(_IMPORT_DIR, "pdf_cache")
+os.environ["FLASK_OVERDUE_SWEEPER_ENABLED"] = "false"
+
+import pytest  # noqa: E402
+
+from backend.app import create_app  # noqa: E402
+from backend.bench.routes import DEFAULT_TOLERANCE  # noqa: E402
+from backend.database import db  # noqa: E402
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("bench", "route benchmarks (-m bench)")
+    group.addoption(
+        "--bench-save", action="store_true", help="Record the measured routes in backend/bench/baselines/routes.json."
+    )
+    group.addoption(
+        "--bench-tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed p95 slowdown over the baseline (default %(default)s).",
+    )
+
+
+@pytest.fixture
+def app_config(tmp_path):
+    """Configuration of a test app; apps created from it share one database file."""
+    return {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "PDF_CACHE_DIR": str(tmp_path / "pdf_cache"),
+        "ASSETS_BUILD_DIR": str(tmp_path / "build"),
+        "OVERDUE_SWEEPER_ENABLED": False,
+        "TESTING": True,
+    }
+
+
+@pytest.fixture
+def app(app_config):
+    app = create_app(app_config)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def series(client):
+    client.put(
+        "/api/settings/company",
+        json={
+            "company_name": "UAB Testas",
+            "registration_code": "100000001",
+            "tax_id": "LT100000001",
+            "address": "Vilnius",
+            "email": "a@b.lt",
+        },
+    )
+    client.post(
+        "/api/settings/bank-accounts",
+        json={"bank_name": "SEB", "account_number": "LT127044060000000001", "is_default": True},
+    )
+    response = client.post("/api/settings/series", json={"series_code": "SF"})
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()
+
+
+@pytest.fixture
+def make_client(client):
+    created = []
+
+    def make(**fields):
+        body = {
+            "company_name": f"UAB Klientas {len(created) + 1}",
+            "registration_code": f"30000000{len(created) + 1}",
+            "address": "Kaunas",
+            **fields,
+        }
+        response = client.post("/api/clients/", json=body)
+        assert response.status_code == 201, response.get_json()
+        created.append(response.get_json())
+        return created[-1]
+
+    return make
+
+
+@pytest.fixture
+def make_invoice(client, series):
+    def make(client_id: int, **fields):
+        body = {
+            "client_id": client_id,
+            "series_id": series["id"],
+            "invoice_date": "2025-03-10",
+            "due_date": "2025-03-24",
+            "items": [{"description": "Konsultacijos", "quantity": 2, "unit_price": 50}],
+            **fields,
+        }
+        response = client.post("/api/invoices/", json=body)
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()
+
+    return make
@@ -0,0 +1,36 @@
+import gzip
+import re
+from pathlib import Path
+
+from backend.app import create_app
+from backend.services.assets import IMMUTABLE, build_assets, load_manifest
+
+FRONTEND = Path(__file__).resolve().parent.parent / "frontend"
+
+
+def test_the_built_frontend_is_served_fingerprinted_and_precompressed(app_config):
+    build_assets(FRONTEND, app_config["ASSETS_BUILD_DIR"])
+    client = create_app(app_config).test_client()
+
+    page = client.get("/")
+    stylesheet = re.search(r'href="(css/styles\.[0-9a-f]{10}\.css)"', page.get_data(as_text=True)).group(1)
+    assert page.headers["Cache-Control"] == "no-cache"
+
+    response = client.get(f"/{stylesheet}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Cache-Control"] == IMMUTABLE
+    assert gzip.decompress(response.get_data()) == (FRONTEND / "css" / "styles.css").read_bytes()
+    assert client.get(f"/{stylesheet}").headers.get("Content-Encoding") is None
+
+
+def test_a_stale_build_is_not_served(tmp_path):
+    source, output = tmp_path / "frontend", tmp_path / "build"
+    (source / "js").mkdir(parents=True)
+    (source / "index.html").write_text('<script src="js/app.js"></script>', encoding="utf-8")
+    (source / "js" / "app.js").write_text("console.log(1);", encoding="utf-8")
+    build_assets(source, output)
+    assert load_manifest(source, output) is not None
+
+    (source / "js" / "app.js").write_text("console.log(2);", encoding="utf-8")
+
+    assert load_manifest(source, output) is None
@@ -0,0 +1,60 @@
+from datetime import date
+
+from sqlalchemy import select
+
+from backend.app import create_app
+from backend.bench.routes import cases, compare
+from backend.bench.seed import seed_dataset
+from backend.database import db
+from backend.models import Invoice, InvoiceItem
+from backend.services.ledger import verify_client_stats, verify_monthly_revenue
+
+
+def _seeded(app_config, path, seed: int) -> tuple[list, list]:
+    app = create_app({**app_config, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+    seed_dataset(app, clients=10, invoices=200, seed=seed, end=date(2025, 12, 31))
+    with app.app_context():
+        invoices = db.session.execute(
+            select(
+                Invoice.full_invoice_number, Invoice.client_id, Invoice.invoice_date, Invoice.status, Invoice.total
+            ).order_by(Invoice.id)
+        ).all()
+        items = db.session.execute(
+            select(InvoiceItem.invoice_id, InvoiceItem.description, InvoiceItem.line_total).order_by(InvoiceItem.id)
+        ).all()
+        with db.engine.connect() as connection:
+            assert verify_monthly_revenue(connection) == []
+            assert verify_client_stats(connection) == []
+        db.session.remove()
+        db.engine.dispose()
+    return invoices, items
+
+
+def test_the_same_seed_produces_the_same_dataset(app_config, tmp_path):
+    first = _seeded(app_config, tmp_path / "first.db", seed=1)
+
+    assert len(first[0]) == 200
+    assert _seeded(app_config, tmp_path / "second.db", seed=1) == first
+    assert _seeded(app_config, tmp_path / "other.db", seed=2) != first
+
+
+def test_compare_flags_more_queries_and_slower_p95():
+    baseline = {
+        "a": {"p95": 10.0, "queries": 2},
+        "b": {"p95": 10.0, "queries": 2},
+        "fast": {"p95": 0.5, "queries": 1},
+    }
+    results = {
+        "a": {"p95": 12.0, "queries": 2},
+        "b": {"p95": 13.0, "queries": 3},
+        "fast": {"p95": 0.9, "queries": 1},  # 80% slower, but by less than a millisecond
+        "new": {"p95": 99.0, "queries": 9},
+    }
+
+    assert compare(results, baseline, tolerance=0.25) == ["b: 2 -> 3 queries", "b: p95 10.00 -> 13.00 ms"]
+
+
+def test_every_route_has_a_benchmark_case(app):
+    covered = {case.endpoint for case in cases({"client": 0, "invoice": 0, "invoices": [], "series": 0}).values()}
+
+    assert {rule.endpoint for rule in app.url_map.iter_rules()} - covered == set()
@@ -0,0 +1,60 @@
+from backend.services import search
+
+
+def _client_ids(client, **params) -> set[int]:
+    response = client.get("/api/clients/", query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return {row["id"] for row in response.get_json()["clients"]}
+
+
+def test_client_search_matches_inside_any_searched_column(client, make_client):
+    builder = make_client(company_name="UAB Statybų Meistrai", email="info@meistrai.lt")
+    shop = make_client(company_name="MB Gėlių Namai", phone="+37060012345")
+
+    assert _client_ids(client, search="tatyb") == {builder["id"]}  # a substring, not only a prefix
+    assert _client_ids(client, search="meistrai.lt") == {builder["id"]}
+    assert _client_ids(client, search="600123") == {shop["id"]}
+    assert _client_ids(client, search="MB") == {shop["id"]}  # shorter than a trigram
+    assert _client_ids(client, search="nėra") == set()
+
+
+def test_client_cursor_pages_visit_every_client_once(client, make_client):
+    created = {make_client(company_name=f"UAB Klientas {n % 3}")["id"] for n in range(7)}
+
+    seen, cursor = [], None
+    while True:
+        body = client.get("/api/clients/", query_string={"limit": 3, **({"cursor": cursor} if cursor else {})})
+        body = body.get_json()
+        seen += [row["id"] for row in body["clients"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(created)
+
+
+def test_relevance_cursor_is_rejected_once_the_search_stops_ranking(client, make_client, monkeypatch):
+    for n in range(3):
+        make_client(company_name=f"UAB Klientas {n}")
+    query = {"search": "Klientas", "limit": 1}
+    cursor = client.get("/api/clients/", query_string=query).get_json()["next_cursor"]
+
+    monkeypatch.setattr(search, "CLIENT_RANK_LIMIT", 2)
+
+    assert client.get("/api/clients/", query_string={**query, "cursor": cursor}).status_code == 400
+    assert client.get("/api/clients/", query_string=query).get_json()["next_cursor"] is not None
+
+
+def test_client_detail_embeds_one_page_of_history(client, make_client, make_invoice):
+    customer = make_client()
+    created = [make_invoice(customer["id"], invoice_date=f"2025-03-{n + 1:02d}")["id"] for n in range(5)]
+
+    detail = client.get(f"/api/clients/{customer['id']}?invoice_limit=2").get_json()
+    assert [row["id"] for row in detail["invoices"]] == created[:-3:-1]  # newest first
+    assert detail["financial_summary"]["invoice_count"] == 5
+
+    rest = client.get(
+        f"/api/clients/{customer['id']}/invoices", query_string={"limit": 10, "cursor": detail["invoices_next_cursor"]}
+    ).get_json()
+    assert [row["id"] for row in rest["invoices"]] == created[-3::-1]
+    assert rest["next_cursor"] is None
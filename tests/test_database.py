@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from backend.database import READ_BIND, db, engine_options
+
+
+def _pragmas(connection, *names: str) -> list:
+    return [connection.execute(text(f"PRAGMA {name}")).scalar() for name in names]
+
+
+def test_sqlite_connections_get_the_pragma_profile(app):
+    with app.app_context(), db.engine.connect() as connection:
+        # synchronous=1 is NORMAL.
+        assert _pragmas(connection, "journal_mode", "foreign_keys", "synchronous", "busy_timeout") == [
+            "wal", 1, 1, 5000
+        ]
+
+
+def test_pragma_overrides_and_skips(app_config):
+    from backend.app import create_app
+
+    app = create_app({**app_config, "SQLITE_PRAGMAS": {"synchronous": "FULL", "cache_size": None}})
+    with app.app_context(), db.engine.connect() as connection:
+        assert _pragmas(connection, "synchronous", "cache_size") == [2, -2000]  # FULL, SQLite's default
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_engine_options_for_a_database_server():
+    config = {
+        "DATABASE_POOL_SIZE": "10",
+        "DATABASE_MAX_OVERFLOW": 20,
+        "DATABASE_STATEMENT_TIMEOUT": 30000,
+        "SQLALCHEMY_ENGINE_OPTIONS": {"pool_recycle": 300},
+    }
+
+    options = engine_options(config, "postgresql+psycopg://invoices@localhost/invoices")
+
+    assert options == {
+        "pool_recycle": 300,
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_pre_ping": True,
+        "connect_args": {"options": "-c statement_timeout=30000"},
+    }
+    assert engine_options({}, "sqlite:///:memory:") == {"pool_pre_ping": False}
+
+
+def test_read_only_views_query_the_read_bind(app, client, make_client):
+    make_client()
+    with app.app_context():
+        primary, replica = db.engine, db.engines[READ_BIND]
+    used = []
+    listeners = {engine: (lambda *args, engine=engine: used.append(engine)) for engine in (primary, replica)}
+    for engine, listener in listeners.items():
+        event.listen(engine, "before_cursor_execute", listener)
+    try:
+        client.get("/api/clients/")
+        assert set(used) == {replica}
+        used.clear()
+        make_client()
+        assert used and replica not in used
+    finally:
+        for engine, listener in listeners.items():
+            event.remove(engine, "before_cursor_execute", listener)
+
+    with replica.connect() as connection, pytest.raises(OperationalError, match="readonly"):
+        connection.execute(text("DELETE FROM clients"))
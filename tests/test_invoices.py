@@ -0,0 +1,157 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from backend.services.overdue import sweep_overdue
+
+
+def _page_through(client, path: str, key: str, **params) -> list[dict]:
+    rows, cursor = [], None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, query_string=query)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        rows += body[key]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return rows
+
+
+@pytest.mark.parametrize("sort_by", ["-date", "date", "-total", "number", "status"])
+def test_invoice_cursor_pages_visit_every_invoice_once(client, make_client, make_invoice, sort_by):
+    customer = make_client()
+    created = [
+        make_invoice(
+            customer["id"],
+            invoice_date=f"2025-03-{1 + n // 2:02d}",  # pairs share a date: ties break on id
+            items=[{"description": "Darbai", "quantity": 1, "unit_price": 10 + n % 3}],
+        )["id"]
+        for n in range(7)
+    ]
+
+    rows = _page_through(client, "/api/invoices/", "invoices", limit=2, sort_by=sort_by, with_total="false")
+
+    assert sorted(row["id"] for row in rows) == sorted(created)
+
+
+def test_invoice_cursor_must_match_the_sort_order(client, make_client, make_invoice):
+    customer = make_client()
+    for _ in range(3):
+        make_invoice(customer["id"])
+    cursor = client.get("/api/invoices/?limit=1&sort_by=-date").get_json()["next_cursor"]
+
+    assert client.get(f"/api/invoices/?limit=1&sort_by=total&cursor={cursor}").status_code == 400
+    assert client.get("/api/invoices/?cursor=not-a-cursor").status_code == 400
+
+
+def test_bulk_create_numbers_invoices_in_one_block(client, series, make_client):
+    customer = make_client()
+    entries = [
+        {"client_id": customer["id"], "series_id": series["id"], "items": [{"description": "A", "quantity": 1}]}
+        for _ in range(3)
+    ]
+
+    response = client.post("/api/invoices/bulk", json={"invoices": entries})
+
+    assert response.status_code == 201
+    numbers = [invoice["invoice_number"] for invoice in response.get_json()["invoices"]]
+    assert numbers == [numbers[0], numbers[0] + 1, numbers[0] + 2]
+    next_number = client.get(f"/api/invoices/next-number/{series['id']}").get_json()["next_number"]
+    assert next_number == numbers[-1] + 1
+
+
+def test_bulk_create_reports_every_invalid_entry_and_writes_nothing(client, series, make_client):
+    customer = make_client()
+    valid = {"client_id": customer["id"], "series_id": series["id"], "items": [{"description": "A", "quantity": 1}]}
+    entries = [valid, {**valid, "client_id": 999999}, {**valid, "series_id": None}]
+
+    response = client.post("/api/invoices/bulk", json={"invoices": entries})
+
+    assert response.status_code == 400
+    assert [error["index"] for error in response.get_json()["errors"]] == [1, 2]
+    assert client.get("/api/invoices/").get_json()["total"] == 0
+
+
+def test_numbers_of_deleted_drafts_are_reused_first(client, series, make_client, make_invoice):
+    customer = make_client()
+    _, second, third = (make_invoice(customer["id"]) for _ in range(3))
+
+    assert client.delete(f"/api/invoices/{second['id']}").status_code == 200
+    reused = make_invoice(customer["id"])
+    fresh = make_invoice(customer["id"])
+
+    assert reused["invoice_number"] == second["invoice_number"]
+    assert fresh["invoice_number"] == third["invoice_number"] + 1
+
+
+def test_exports_stream_csv_and_ndjson(client, make_client, make_invoice):
+    customer = make_client()
+    invoice = make_invoice(
+        customer["id"],
+        items=[
+            {"description": "Pirmas", "quantity": 1, "unit_price": 10},
+            {"description": "Antras", "quantity": 3, "unit_price": 5},
+        ],
+    )
+
+    csv_response = client.get("/api/invoices/export?format=csv&include_items=true")
+    assert csv_response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(csv_response.get_data(as_text=True))))
+    assert [row["item_description"] for row in rows] == ["Pirmas", "Antras"]
+    assert {row["number"] for row in rows} == {invoice["full_invoice_number"]}
+
+    ndjson_response = client.get("/api/invoices/export?format=ndjson&include_items=true")
+    assert ndjson_response.mimetype == "application/x-ndjson"
+    records = [json.loads(line) for line in ndjson_response.get_data(as_text=True).splitlines()]
+    assert len(records) == 1
+    assert [item["description"] for item in records[0]["items"]] == ["Pirmas", "Antras"]
+    assert client.get("/api/invoices/export?format=xlsx").status_code == 400
+
+
+def test_responses_encode_decimals_dates_and_enums(client, make_client, make_invoice):
+    invoice = make_invoice(make_client()["id"], items=[{"description": "A", "quantity": 2, "unit_price": "12.50"}])
+
+    body = client.get(f"/api/invoices/{invoice['id']}").get_json()
+
+    assert body["subtotal"] == 25
+    assert body["invoice_date"] == "2025-03-10"
+    assert body["status"] == "draft"
+    assert body["items"][0]["unit_price"] == 12.5
+
+
+def test_detail_and_list_answer_304_until_something_changes(client, make_client, make_invoice):
+    invoice = make_invoice(make_client()["id"])
+    detail_url = f"/api/invoices/{invoice['id']}"
+
+    detail = client.get(detail_url)
+    listing = client.get("/api/invoices/")
+    assert detail.headers["ETag"] and listing.headers["ETag"].startswith("W/")
+    assert client.get(detail_url, headers={"If-None-Match": detail.headers["ETag"]}).status_code == 304
+    assert client.get("/api/invoices/", headers={"If-None-Match": listing.headers["ETag"]}).status_code == 304
+
+    client.patch(f"{detail_url}/status", json={"status": "sent"})
+
+    assert client.get(detail_url, headers={"If-None-Match": detail.headers["ETag"]}).status_code == 200
+    assert client.get("/api/invoices/", headers={"If-None-Match": listing.headers["ETag"]}).status_code == 200
+
+
+def test_overdue_status_is_persisted_by_the_sweep_not_by_reads(app, client, make_client, make_invoice):
+    yesterday = date.today() - timedelta(days=1)
+    invoice = make_invoice(
+        make_client()["id"],
+        invoice_date=(yesterday - timedelta(days=14)).isoformat(),
+        due_date=yesterday.isoformat(),
+    )
+    client.patch(f"/api/invoices/{invoice['id']}/status", json={"status": "sent"})
+
+    listed = client.get("/api/invoices/").get_json()["invoices"][0]
+    assert (listed["status"], listed["is_overdue"]) == ("sent", True)
+
+    with app.app_context():
+        assert sweep_overdue() == 1
+
+    assert client.get(f"/api/invoices/{invoice['id']}").get_json()["status"] == "overdue"
@@ -0,0 +1,67 @@
+import xml.etree.ElementTree as ET
+
+from sqlalchemy import text
+
+from backend.app import create_app
+from backend.database import db
+from backend.services.isaf import ISAF_NAMESPACE
+
+NS = {"isaf": ISAF_NAMESPACE}
+
+
+def _register(client) -> ET.Element:
+    response = client.get("/api/reports/isaf?from=2025-03-01&to=2025-03-31")
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return ET.fromstring(response.get_data())
+
+
+def test_register_identifies_the_seller_by_registration_code(client, make_client, make_invoice):
+    buyer = make_client(registration_code="300000009", vat_code="LT300000009")
+    issued = make_invoice(buyer["id"], vat_rate="0.21")
+    client.patch(f"/api/invoices/{issued['id']}/status", json={"status": "sent"})
+    make_invoice(buyer["id"])  # drafts are left out, zero-rated or not
+
+    root = _register(client)
+
+    assert root.findtext("isaf:Header/isaf:FileDescription/isaf:RegistrationNumber", namespaces=NS) == "100000001"
+    assert "LT100000001" not in ET.tostring(root, encoding="unicode")
+    invoices = root.findall(".//isaf:SalesInvoices/isaf:Invoice", NS)
+    assert [invoice.findtext("isaf:InvoiceNo", namespaces=NS) for invoice in invoices] == [
+        issued["full_invoice_number"]
+    ]
+    customer = invoices[0].find("isaf:CustomerInfo", NS)
+    assert customer.findtext("isaf:VATRegistrationNumber", namespaces=NS) == "LT300000009"
+    assert customer.findtext("isaf:RegistrationNumber", namespaces=NS) == "300000009"
+    assert invoices[0].findtext(".//isaf:TaxCode", namespaces=NS) == "PVM1"
+
+
+def test_zero_rated_invoices_need_the_zero_rate_tax_code(client, make_client, make_invoice):
+    issued = make_invoice(make_client()["id"], vat_rate="0")
+    client.patch(f"/api/invoices/{issued['id']}/status", json={"status": "sent"})
+
+    assert client.get("/api/reports/isaf?from=2025-03-01&to=2025-03-31").status_code == 409
+
+    client.put("/api/settings/general", json={"isaf_zero_rate_tax_code": "PVM12"})
+    total = _register(client).find(".//isaf:DocumentTotal", NS)
+
+    assert total.findtext("isaf:TaxCode", namespaces=NS) == "PVM12"
+    assert total.findtext("isaf:TaxPercentage", namespaces=NS) == "0"
+
+
+def test_register_requires_the_registration_code(client, series):
+    company = client.get("/api/settings/company").get_json()
+    fields = ("company_name", "tax_id", "address", "email")
+    client.put("/api/settings/company", json={field: company[field] for field in fields})
+
+    response = client.get("/api/reports/isaf?from=2025-03-01&to=2025-03-31")
+
+    assert response.status_code == 409
+
+
+def test_registration_code_column_is_added_to_an_existing_database(app, app_config, series):
+    with app.app_context(), db.engine.begin() as connection:
+        connection.execute(text("ALTER TABLE company_info DROP COLUMN registration_code"))
+
+    upgraded = create_app(app_config).test_client()
+
+    assert upgraded.get("/api/settings/company").get_json()["registration_code"] is None
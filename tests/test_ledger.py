@@ -0,0 +1,60 @@
+from backend.app import create_app
+from backend.database import db
+from backend.models import ClientStats
+from backend.services.ledger import verify_client_stats, verify_monthly_revenue
+
+
+def _verify(app):
+    with app.app_context(), db.engine.connect() as connection:
+        return verify_monthly_revenue(connection), verify_client_stats(connection)
+
+
+def test_aggregates_follow_invoice_changes(app, client, make_client, make_invoice):
+    customer = make_client()
+    first = make_invoice(customer["id"])
+    make_invoice(customer["id"], invoice_date="2025-04-02", due_date="2025-04-16")
+    for status in ("sent", "paid"):
+        response = client.patch(f"/api/invoices/{first['id']}/status", json={"status": status})
+        assert response.status_code == 200, response.get_json()
+
+    stats = client.get(f"/api/clients/{customer['id']}/statistics").get_json()
+    assert stats["invoice_count"] == 2
+    assert stats["paid_invoice_count"] == 1
+    march = client.get("/api/dashboard/statistics?year=2025&month=3").get_json()
+    assert (march["invoice_count"], march["paid_count"], march["total_received"]) == (1, 1, first["total"])
+    year = client.get("/api/dashboard/statistics?year=2025").get_json()
+    assert year["invoice_count"] == 2
+    assert _verify(app) == ([], [])
+
+
+def test_hard_deleting_a_client_with_invoices(app, client, make_client, make_invoice):
+    kept, deleted = make_client(), make_client()
+    make_invoice(kept["id"])
+    make_invoice(deleted["id"])
+    make_invoice(deleted["id"], invoice_date="2025-05-01", due_date="2025-05-15")
+
+    response = client.delete(f"/api/clients/{deleted['id']}?hard=true")
+
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()["deleted"] is True
+    assert client.get(f"/api/clients/{deleted['id']}").status_code == 404
+    # The monthly revenue loses the deleted client's invoices; the other client is untouched.
+    assert _verify(app) == ([], [])
+    assert client.get(f"/api/clients/{kept['id']}/statistics").get_json()["invoice_count"] == 1
+
+
+def test_clients_missing_stats_are_listed_and_backfilled(app, app_config, client, make_client, make_invoice):
+    customers = [make_client() for _ in range(3)]
+    make_invoice(customers[0]["id"])
+    with app.app_context():
+        db.session.execute(db.delete(ClientStats).where(ClientStats.client_id == customers[0]["id"]))
+        db.session.commit()
+
+    listing = client.get("/api/clients/?sort_by=-invoice_count").get_json()
+    assert listing["total"] == len(listing["clients"]) == 3
+    assert _verify(app)[1] == [(customers[0]["id"],)]
+
+    create_app(app_config)
+
+    assert _verify(app) == ([], [])
+    assert client.get(f"/api/clients/{customers[0]['id']}/statistics").get_json()["invoice_count"] == 1
@@ -0,0 +1,57 @@
+import threading
+from datetime import date, timedelta
+
+from backend.database import db
+from backend.services.ledger import verify_client_stats, verify_monthly_revenue
+from backend.services.overdue import run_pending
+
+
+def _past_due(make_invoice, client_id: int) -> dict:
+    due = date.today() - timedelta(days=1)
+    return make_invoice(client_id, invoice_date=(due - timedelta(days=14)).isoformat(), due_date=due.isoformat())
+
+
+def test_one_of_several_workers_sweeps(app, client, make_client, make_invoice):
+    customer = make_client()
+    for _ in range(3):
+        invoice = _past_due(make_invoice, customer["id"])
+        client.patch(f"/api/invoices/{invoice['id']}/status", json={"status": "sent"})
+    results = []
+    start = threading.Barrier(4)
+
+    def worker():
+        with app.app_context():
+            start.wait()
+            results.append(run_pending())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results, key=lambda result: result is None) == [3, None, None, None]
+    with app.app_context():
+        assert run_pending() is None  # already swept today
+        assert run_pending(interval=0) == 0
+        with db.engine.connect() as connection:
+            assert verify_monthly_revenue(connection) == []
+            assert verify_client_stats(connection) == []
+    stats = client.get(f"/api/clients/{customer['id']}/statistics").get_json()
+    assert stats["overdue_count"] == 3
+
+
+def test_past_due_drafts_stay_drafts_and_release_their_number(app, client, series, make_client, make_invoice):
+    customer = make_client()
+    draft = _past_due(make_invoice, customer["id"])
+    later = make_invoice(customer["id"])
+
+    with app.app_context():
+        assert run_pending() == 0
+    body = client.get(f"/api/invoices/{draft['id']}").get_json()
+    assert (body["status"], body["is_overdue"]) == ("draft", False)
+    assert client.patch(f"/api/invoices/{draft['id']}/status", json={"status": "overdue"}).status_code == 409
+
+    assert client.delete(f"/api/invoices/{draft['id']}").status_code == 200
+    assert make_invoice(customer["id"])["invoice_number"] == draft["invoice_number"]
+    assert make_invoice(customer["id"])["invoice_number"] == later["invoice_number"] + 1
@@ -0,0 +1,130 @@
+import io
+import time
+import zipfile
+
+import pytest
+
+from backend.database import db
+from backend.models import Invoice, PdfRenderJob
+from backend.routes.invoices import _invoice_to_pdf_payload
+from backend.app import create_app
+from backend.services.pdf_cache import get_pdf_cache, open_cached_pdf
+from backend.services.pdf_jobs import get_pdf_jobs
+
+
+@pytest.fixture
+def app(app):
+    app.config["PDF_BATCH_WORKERS"] = 1
+    return app
+
+
+def _items(count: int) -> list[dict]:
+    return [{"description": f"Eilutė {number}", "quantity": 1, "unit_price": 5} for number in range(count)]
+
+
+def test_invoice_pdf_is_rendered_once_and_served_from_the_cache(app, client, make_client, make_invoice):
+    invoice = make_invoice(make_client()["id"])
+
+    first = client.get(f"/api/invoices/{invoice['id']}/pdf")
+    second = client.get(f"/api/invoices/{invoice['id']}/pdf")
+
+    assert first.status_code == second.status_code == 200
+    assert first.data.startswith(b"%PDF-") and first.data == second.data
+    stats = get_pdf_cache(app).stats()
+    assert (stats["misses"], stats["hits"], stats["entries"]) == (1, 1, 1)
+    revalidated = client.get(f"/api/invoices/{invoice['id']}/pdf", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_large_invoice_is_rendered_into_a_file(app, make_client, make_invoice):
+    invoice = make_invoice(make_client()["id"], items=_items(300))
+
+    with app.test_request_context():
+        payload = _invoice_to_pdf_payload(db.session.get(Invoice, invoice["id"]))
+        handle = open_cached_pdf(payload)
+    with handle:
+        assert not isinstance(handle, io.BytesIO)
+        assert handle.read(5) == b"%PDF-"
+    assert get_pdf_cache(app).stats()["entries"] == 1
+
+
+def _wait_for(client, job_url: str) -> dict:
+    deadline = time.monotonic() + 60
+    while (job := client.get(job_url).get_json())["status"] not in ("done", "failed", "cancelled"):
+        assert time.monotonic() < deadline, job
+        time.sleep(0.1)
+    return job
+
+
+@pytest.fixture
+def other_worker(app_config):
+    """A second app on the same database and PDF directory, like another server process."""
+    other = create_app({**app_config, "PDF_BATCH_WORKERS": 1})
+    yield other.test_client()
+    with other.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def test_large_invoice_pdf_is_rendered_in_the_pool_without_a_job(app, client, make_client, make_invoice):
+    invoice = make_invoice(make_client()["id"], items=_items(150))
+
+    response = client.get(f"/api/invoices/{invoice['id']}/pdf")
+
+    assert response.status_code == 200 and response.data.startswith(b"%PDF-")
+    with app.app_context():
+        assert db.session.query(PdfRenderJob).count() == 0
+    assert get_pdf_cache(app).stats()["entries"] == 1
+
+
+def test_any_worker_reports_and_serves_a_job(app, client, other_worker, make_client, make_invoice):
+    invoice = make_invoice(make_client()["id"], items=_items(150))
+
+    response = client.post(f"/api/invoices/{invoice['id']}/pdf/jobs")
+    assert response.status_code == 202
+    job = _wait_for(other_worker, response.headers["Location"])
+
+    assert job["status"] == "done", job
+    pdf = other_worker.get(job["result_url"])
+    assert pdf.status_code == 200 and pdf.data.startswith(b"%PDF-")
+    # The finished PDF is a file, also moved into the cache for later downloads.
+    assert get_pdf_cache(app).stats()["entries"] == 1
+    again = client.post(f"/api/invoices/{invoice['id']}/pdf/jobs").get_json()
+    assert again["status"] == "done"
+
+
+def test_a_job_cancelled_elsewhere_discards_its_result(app, client, other_worker, make_client, make_invoice):
+    invoice = make_invoice(make_client()["id"], items=_items(150))
+    job_id = client.post(f"/api/invoices/{invoice['id']}/pdf/jobs").get_json()["id"]
+
+    cancelled = other_worker.delete(f"/api/pdf-jobs/{job_id}").get_json()
+
+    assert cancelled["status"] == "cancelled"
+    jobs = get_pdf_jobs(app)
+    deadline = time.monotonic() + 60
+    while jobs._futures:
+        assert time.monotonic() < deadline
+        time.sleep(0.1)
+    assert client.get(f"/api/pdf-jobs/{job_id}").get_json()["status"] == "cancelled"
+    assert not jobs.result_path(job_id).exists()
+    assert client.get(f"/api/pdf-jobs/{job_id}/pdf").status_code == 409
+
+
+def test_batch_pdf_streams_a_zip(app, client, make_client, make_invoice):
+    customer = make_client()
+    ids = [make_invoice(customer["id"])["id"] for _ in range(3)]
+    client.get(f"/api/invoices/{ids[0]}/pdf")  # one comes from the cache, two are rendered
+
+    response = client.post("/api/invoices/pdf/batch", json={"ids": ids})
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+        assert archive.testzip() is None
+        names = archive.namelist()
+        assert len(names) == 3
+        assert all(archive.read(name).startswith(b"%PDF-") for name in names)
+    response.close()
+    # The database connection the archive read through went back to the pool.
+    with app.app_context():
+        assert db.engine.pool.checkedout() == 0
@@ -0,0 +1,128 @@
+import itertools
+import json
+
+import pytest
+from sqlalchemy import event
+
+import backend.app
+from backend.app import create_app
+from backend.bench.routes import (
+    BASELINE_PATH,
+    CLIENTS,
+    INVOICES,
+    ROUNDS,
+    SEED,
+    SEED_END,
+    WARMUP_ROUNDS,
+    cases,
+    compare,
+    fixture_ids,
+    summarize,
+)
+from backend.bench.seed import seed_dataset
+from backend.database import db
+
+pytest.importorskip("pytest_benchmark")
+pytestmark = pytest.mark.bench
+
+# Cases build their requests only when they run, so placeholder ids are enough to list them.
+CASES = cases({"client": 0, "invoice": 0, "invoices": [], "series": 0})
+
+
+def _route_params() -> list:
+    # Every view of the app, so a new route without a case fails instead of going unmeasured.
+    params = []
+    for endpoint in sorted({rule.endpoint for rule in backend.app.app.url_map.iter_rules()}):
+        names = [name for name, case in CASES.items() if case.endpoint == endpoint]
+        params += [pytest.param(endpoint, name, id=name) for name in names] or [
+            pytest.param(endpoint, None, id=endpoint)
+        ]
+    return params
+
+
+@pytest.fixture(scope="module")
+def bench_app(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("bench")
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{directory / 'bench.db'}",
+            "PDF_CACHE_DIR": str(directory / "pdf_cache"),
+            "ASSETS_BUILD_DIR": str(directory / "build"),
+            "OVERDUE_SWEEPER_ENABLED": False,
+            "TESTING": True,
+        }
+    )
+    seed_dataset(app, clients=CLIENTS, invoices=INVOICES, seed=SEED, end=SEED_END)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def bench_cases(bench_app):
+    return cases(fixture_ids(bench_app))
+
+
+@pytest.fixture(scope="module")
+def query_count(bench_app):
+    counter = {"count": 0}
+
+    def count_query(*_args):
+        counter["count"] += 1
+
+    with bench_app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", count_query)
+    yield counter
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", count_query)
+
+
+@pytest.fixture(scope="session")
+def baseline() -> dict:
+    return json.loads(BASELINE_PATH.read_text(encoding="utf-8")) if BASELINE_PATH.exists() else {}
+
+
+@pytest.fixture(scope="session")
+def bench_results(request, baseline):
+    results: dict[str, dict] = {}
+    yield results
+    if request.config.getoption("bench_save") and results:
+        # Routes left out of this run keep their recorded figures.
+        merged = {**baseline, **results}
+        BASELINE_PATH.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+@pytest.mark.parametrize(("endpoint", "name"), _route_params())
+def test_route(benchmark, request, bench_app, bench_cases, query_count, baseline, bench_results, endpoint, name):
+    if name is None:
+        pytest.fail(f"No benchmark case covers {endpoint}; add one to backend.bench.routes.cases().")
+    client = bench_app.test_client()
+    prepare = bench_cases[name].prepare
+    calls = itertools.count()
+    most_queries = 0
+
+    def send(method: str, path: str, body) -> None:
+        nonlocal most_queries
+        query_count["count"] = 0
+        response = client.open(path, method=method, json=body)
+        response.get_data()  # drain streamed bodies so their queries run inside the timing
+        response.close()  # as the server does; streamed views release their connection here
+        assert response.status_code < 400, f"{method} {path} answered {response.status_code}"
+        if next(calls) >= WARMUP_ROUNDS:
+            most_queries = max(most_queries, query_count["count"])
+
+    benchmark.pedantic(send, setup=lambda: (prepare(client), {}), rounds=ROUNDS, warmup_rounds=WARMUP_ROUNDS)
+    if benchmark.disabled:
+        return
+
+    result = summarize(benchmark.stats.stats.data, most_queries)
+    benchmark.extra_info.update(result)
+    bench_results[name] = result
+    if request.config.getoption("bench_save"):
+        return
+    assert name in baseline, f"{name} has no baseline yet; record one with --bench-save."
+    assert compare({name: result}, baseline, request.config.getoption("bench_tolerance")) == []
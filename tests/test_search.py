@@ -0,0 +1,95 @@
+from sqlalchemy import text
+
+from backend.app import create_app
+from backend.database import db
+
+
+def _search(client, value: str) -> set[int]:
+    response = client.get("/api/invoices/", query_string={"search": value, "limit": 100})
+    assert response.status_code == 200, response.get_json()
+    return {invoice["id"] for invoice in response.get_json()["invoices"]}
+
+
+def test_invoice_search_covers_fields_and_items(client, make_client, make_invoice):
+    acme = make_client(company_name="UAB Akmenė")
+    other = make_client(company_name="MB Kitas")
+    first = make_invoice(
+        acme["id"],
+        notes="Sutartis 17",
+        items=[
+            {"description": "Svetainės priežiūra", "quantity": 1, "unit_price": 10},
+            {"description": "Serverio nuoma", "quantity": 1, "unit_price": 20},
+        ],
+    )
+    second = make_invoice(other["id"], items=[{"description": "Mokymai", "quantity": 1, "unit_price": 5}])
+
+    assert _search(client, "akmene") == {first["id"]}  # diacritics are folded
+    assert _search(client, "serv") == {first["id"]}  # prefixes match item descriptions
+    assert _search(client, "akmen nuoma") == {first["id"]}  # terms may match different documents
+    assert _search(client, "kitas nuoma") == set()
+    assert _search(client, "sutartis") == {first["id"]}
+    assert _search(client, second["full_invoice_number"]) >= {second["id"]}
+
+
+def test_invoice_search_follows_item_and_client_changes(client, make_client, make_invoice):
+    customer = make_client(company_name="UAB Pirmas")
+    invoice = make_invoice(customer["id"], items=[{"description": "Konsultacijos", "quantity": 1, "unit_price": 10}])
+
+    body = {
+        "client_id": customer["id"],
+        "items": [{"description": "Programavimas", "quantity": 1, "unit_price": 10}],
+    }
+    assert client.put(f"/api/invoices/{invoice['id']}", json=body).status_code == 200
+    assert _search(client, "konsultacijos") == set()
+    assert _search(client, "programavimas") == {invoice["id"]}
+
+    client.put(f"/api/clients/{customer['id']}", json={"company_name": "UAB Antras"})
+    assert _search(client, "antras") == {invoice["id"]}
+    assert _search(client, "pirmas") == set()
+
+    client.delete(f"/api/invoices/{invoice['id']}")
+    assert _search(client, "programavimas") == set()
+
+
+def test_an_index_of_the_old_layout_is_rebuilt(app, app_config, make_client, make_invoice):
+    invoice = make_invoice(make_client()["id"], items=[{"description": "Remontas", "quantity": 1, "unit_price": 9}])
+    with app.app_context(), db.engine.begin() as connection:
+        # One document per invoice with every item description in an "items" column.
+        connection.execute(text("DROP TABLE invoice_items_fts"))
+        connection.execute(text("DROP TABLE invoices_fts"))
+        connection.execute(
+            text(
+                "CREATE VIRTUAL TABLE invoices_fts USING fts5("
+                "full_invoice_number, client_name, client_code, notes, items)"
+            )
+        )
+
+    upgraded = create_app(app_config)
+
+    assert _search(upgraded.test_client(), "remontas") == {invoice["id"]}
+
+
+def test_bulk_created_invoices_are_indexed_once_the_import_ends(app, client, series, make_client):
+    customer = make_client(company_name="UAB Masinis")
+    entries = [
+        {
+            "client_id": customer["id"],
+            "series_id": series["id"],
+            "items": [{"description": f"Paslauga{n}", "quantity": 1, "unit_price": 10}],
+        }
+        for n in range(3)
+    ]
+    response = client.post("/api/invoices/bulk", json={"invoices": entries})
+    assert response.status_code == 201, response.get_json()
+    ids = [invoice["id"] for invoice in response.get_json()["invoices"]]
+
+    assert _search(client, "masinis") == set(ids)
+    assert _search(client, "paslauga1") == {ids[1]}
+    with app.app_context():
+        assert db.session.execute(text("SELECT count(*) FROM invoices_fts_deferred")).scalar() == 0
+
+    # The triggers index invoices created one at a time again.
+    single_item = {"description": "Pavienis", "quantity": 1, "unit_price": 1}
+    single = client.post("/api/invoices/", json={**entries[0], "items": [single_item]})
+    assert single.status_code == 201
+    assert _search(client, "pavienis") == {single.get_json()["id"]}